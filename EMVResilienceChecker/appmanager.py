@@ -6,6 +6,7 @@ import subprocess
 
 from androguard.core.apk import APK
 from device import Device
+from util import adb
 from util import run_cmd
 from util import wait_until
 from loguru import logger
@@ -220,7 +221,7 @@ class AppManager:
 
     def is_app_in_foreground(self):
         result = subprocess.run(
-            ["adb", "shell", "dumpsys", "window", "windows"],
+            adb(["adb", "shell", "dumpsys", "window", "windows"]),
             stdout=subprocess.PIPE,
             text=True
         )
@@ -6,7 +6,6 @@ import time
 import frida
 import pickle
 import config
-import shutil
 import random
 import asyncio
 import javalang
@@ -26,7 +25,9 @@ from mitmdump import intercept
 from mitmdump import MitmCertManager
 from pprint import pprint as pp
 from util import adb_action
+from util import device_serial
 from fridarunner import FridaRunner
+from prefetch import REPACKAGED, MITM_PATCHED, build_repackaged, build_mitm_patched, can_patch_with_apkmitm
 from results import Results, Result
 # from nltk.corpus import words as nltk_words
 from nltk.corpus import brown
@@ -41,7 +42,6 @@ if config.HAS_CODE_OBFUSCATION:
 
 from constants import (
     APK_PATH,
-    APK_MITM_TAG,
     DEBUGGABLE_ATTRIB,
     DEPENDENCIES_PATH,
     FRIDA_SERVER,
@@ -56,13 +56,9 @@ from constants import (
     RESULTS_DIR_PATH,
     HOOK_SUCCESS_TAG,
     HOOK_TIMEOUT,
-    INPUT_PATH,
     IDENTIFIERS_OUTPUT_PATH,
     JADX_DECOMPILE_OUTPUT_PATH,
     KEEPS_STOPPING,
-    KS_ALIAS,
-    KS_FILE,
-    KS_PASSWORD,
     LABEL,
     MITMDUMP_COLLECTION_DURATION,
     OUTPUT_PATH,
@@ -71,7 +67,6 @@ from constants import (
     ROOT_CHECKING_TASK,
     RUNS_NORMALLY_TASK,
     RUNS_NORMALLY,
-    SIGNER_PATH,
     SHORT_WORDS_THRESHOLD,
     OBF_ABBREV,
     OBF_KEYWORDS,
@@ -103,14 +98,18 @@ class Checker:
     TODO: remove shell usage from subprocesses 
     """
 
-    def __init__(self, apk, tag, classifier = None):
-        self.app_manager = AppManager(apk, tag)
+    def __init__(self, apk, tag, classifier = None, prefetched = None):
+        """
+        :param prefetched: prefetch.Prefetched of this APK, whose AppManager and host-side builds are used if given
+        """
+        self.prefetched = prefetched
+        self.app_manager = prefetched.app_manager if prefetched else AppManager(apk, tag)
         self.counter = 1
         self.classifier = classifier
         self.tag = tag
         self.results = Results(self.app_manager, self.tag)
         self.app_runs_normally = True
-        self.app_installed = self.app_manager.is_installed()
+        self.app_installed = self.app_manager.is_installed() if self.need_to_run_app() else False # static checks need no device
 
         if self.need_to_run_app():
             if config.UNINSTALL_EXISTING_APP:
@@ -242,18 +241,21 @@ class Checker:
             logger.warning(f"Failure: {result}")
         return result
 
+    def _build(self, name, build):
+        """Result of a host-side build (see prefetch.py), waiting for the prefetched one if it was scheduled"""
+        future = self.prefetched.builds.get(name) if self.prefetched else None
+        if future:
+            if not future.done():
+                logger.info(f"Waiting for the prefetched {name}...")
+            return future.result()
+        return build(self.app_manager)
+
     def _has_adb_root(self):
         if not self.adb_root:
             logger.warning("Cannot get adb root privilege, skipping _has_network_integrity_checking and _has_anti_hooking")
             return False
         return True
 
-    def _copy_split_apks(self):
-        for split_apk in self.app_manager.split_apks:
-            if not os.path.exists(os.path.join(self.app_manager.output_apk_path, os.path.basename(split_apk))) or config.FORCE_REPACK:
-                if split_apk.endswith(".apk"):
-                    shutil.copy(split_apk, self.app_manager.output_apk_path)
-
     def _search(self, keyword, path):
             cmd = f"grep -rl '{keyword}' {path}"
 
@@ -615,7 +617,8 @@ class Checker:
             runner.kill_others()
             runner.start()
 
-            device = frida.get_usb_device()  # or use frida.get_local_device() for local device
+            serial = device_serial()
+            device = frida.get_device(serial) if serial else frida.get_usb_device()  # or use frida.get_local_device() for local device
             pid = device.spawn([self.app_manager.package_name])
             process = device.attach(pid)
             script = process.create_script(self.frida_script_code)
@@ -670,98 +673,10 @@ class Checker:
         if not config.FORCE_REPACK:
             logger.warning("config.FORCE_REPACK = 0: will skip certain steps if existing files/dirs exist, set config.FORCE_REPACK=1 if errors occur")
 
-        disassembly_output = os.path.join(self.app_manager.output_apk_path, "apktool_disassembly") # -f: Forces the decompilation, overwriting any existing files in the output directory.
-
-        if not os.path.exists(disassembly_output) or config.FORCE_REPACK:
-
-            logger.info("Disassembling with apktool")
-
-            disassembly = subprocess.run([
-                                            "apktool", "d",
-                                            self.app_manager.apk_path,
-                                            "-o", disassembly_output,
-                                            "-f"
-                                        ],
-                                        capture_output=True,
-                                        text=True,
-                                        timeout=timeout*60
-                                        )
-
-            def actual_error_in_disassembly(stderr):
-                if not stderr:
-                    return False
-                return "Exception" in stderr or any(line.startswith("E:") for line in stderr.split("\n"))
-
-            if actual_error_in_disassembly(disassembly.stderr):
-                logger.error(f"\n{disassembly.stderr}")
-                logger.warning("APK CANNOT be disassembled, so it CANNOT be repackaged, which is a good thing, but...")
-                logger.warning("this was likely due to a failure in and does NOT indicate that the app has anti-repackaging abilities itself")
-                self.results.dict[HAS_ANTI_REPACKAGING] = Result("-", f"Diassembly error: {disassembly.stderr}")
-                return
-
-            nugget = os.path.join(INPUT_PATH, "repackingtest")
-            logger.info(f"Inserting a nugget to guarantee a modified APK: {nugget}")
-            shutil.copy(nugget, disassembly_output)
-
-        repacked_path = self.app_manager.repacked_and_signed_apk_path.replace("-repacked-aligned-signed", "-repacked")
-        if not os.path.isfile(repacked_path) or config.FORCE_REPACK:
-
-            logger.info("Repackaging with apktool")
-
-            build = subprocess.run([
-                                        "apktool", "b",
-                                        disassembly_output,
-                                        "-o", repacked_path
-                                    ],
-                                    capture_output=True,
-                                    text=True,
-                                    timeout=timeout*60
-                                    )
-
-            def actual_error_in_building(stderr):
-                if not stderr:
-                    return False
-                return "error:" in stderr
-
-            if actual_error_in_building(build.stderr):
-                logger.error(f"\n{build.stderr}")
-                logger.warning("APK CANNOT be built (i.e. repackaged), which is a good thing, but...")
-                logger.warning("this was likely due to a failure in apktool or problem in the APK and does NOT indicate that the app has anti-repackaging abilities itself")
-                self.results.dict[HAS_ANTI_REPACKAGING] = Result("-", f"Build error: {build.stderr}")
-                return
-
-        if self.app_manager.split_apks:
-            self._copy_split_apks()
-        
-        apks_already_signed = [os.path.join(self.app_manager.output_apk_path, f).replace("-aligned-signed.apk.idsig", ".apk") for f in os.listdir(self.app_manager.output_apk_path) if f.endswith(".idsig")]
-        apks_to_sign = [os.path.join(self.app_manager.output_apk_path, f) for f in os.listdir(self.app_manager.output_apk_path) if f.endswith(".apk") and "-aligned-signed" not in f]
-        apks_to_sign = set(apks_to_sign) - set(apks_already_signed)
-
-        for apk_to_sign in apks_to_sign:
-            if not os.path.exists(apk_to_sign.replace(".apk", "-aligned-signed.apk")) or config.FORCE_REPACK:
-                logger.info(f"Signing {apk_to_sign} with {SIGNER_PATH}")
-
-                signed_apk = subprocess.run([
-                                                "java", "-jar", SIGNER_PATH,
-                                                "--apks", apk_to_sign,
-                                                "--ks", KS_FILE,
-                                                "--ksPass", KS_PASSWORD,
-                                                "--ksKeyPass", KS_PASSWORD,
-                                                "--ksAlias", KS_ALIAS,
-                                                "--allowResign"
-                                            ],
-                                            capture_output=True,
-                                            text=True,
-                                            timeout=timeout*60
-                                            )
-
-                if signed_apk.stderr:
-                    logger.error(signed_apk.stderr)
-                    logger.warning(apk_to_sign)
-                    logger.warning("APK CANNOT be signed and thus CANNOT be repackaged, which is a good thing, but...")
-                    logger.warning("this was due to a failure in signing the APK and does NOT indicate that the app has anti-repackaging abilities itself")
-                    self.results.dict[HAS_ANTI_REPACKAGING] = Result("-", "APK cannot be signed")
-                    return
+        error = self._build(REPACKAGED, lambda app_manager: build_repackaged(app_manager, timeout))
+        if error:
+            self.results.dict[HAS_ANTI_REPACKAGING] = Result("-", error)
+            return
 
         if not config.REPACK_ONLY:
 
@@ -869,59 +784,16 @@ class Checker:
 
         if num_untrusted_certs > 0:
 
-            def _patch_split_or_single_apkmitm():
-
-                logger.info(f"Patching single APK with apk-mitm, this may take several minutes...")
-                
-                result = subprocess.run(["apk-mitm", self.app_manager.apk_path],
-                                        capture_output=True,
-                                        text=True,
-                                        timeout=60*60)
-
-                if result.stderr:
-                    m = "Error while patching APK with apk-mitm"
-                    logger.warning(m)
-                    logger.warning(result.stderr)
-                    self.results.dict[HAS_NETWORK_INTEGRITY_CHECKING] = Result(True, f"{num_trusted_certs} trusted certs and {num_untrusted_certs} untrusted certs.\n\n{m}: {result.stderr}")
-                    return False
-                return True
-
-            def _patch_merged_apkmitm():
-
-                logger.info(f"Patching merged APK with apk-mitm, this may take several minutes...")
-
-                result = subprocess.run(["apk-mitm", self.app_manager.merged_apk],
-                                    capture_output=True,
-                                    text=True,
-                                    timeout=60*60)
-
-                if result.stderr:
-                    m = "Error while patching merged APK with apk-mitm"
-                    logger.warning(m)
-                    logger.warning(result.stderr)
-                    self.results.dict[HAS_NETWORK_INTEGRITY_CHECKING] = Result(True, f"{num_trusted_certs} trusted certs and {num_untrusted_certs} untrusted certs.\n\n{m}: {result.stderr}")
-                    return False
-                return True
-
-            if self.app_manager.merged_apk: # apk-mitm fails for split APKs, so go straight to merged APK if there is one, if not then ignore the split APK
-                apk_to_install = self.app_manager.merged_apk.replace(".apk", APK_MITM_TAG)
-                if not os.path.exists(apk_to_install):
-                    if not _patch_merged_apkmitm():
-                        return
-                else: 
-                    logger.info("Merged APK already patched with apk-mitm")
-            elif not self.app_manager.split_apks: # single APK
-                apk_to_install = self.app_manager.apk_mitm_patched_path
-                if not os.path.exists(self.app_manager.apk_mitm_patched_path):
-                    if not _patch_split_or_single_apkmitm():
-                        return
-                else: 
-                    logger.info("Single APK already patched with apk-mitm")
-            else: # split apk and no merged apk
+            if not can_patch_with_apkmitm(self.app_manager): # split apk and no merged apk
                 m = "This split APK does not have a merged APK. Apk-mitm does not work with split APKs based on our observation."
                 logger.warning(m)
                 self.results.dict[HAS_NETWORK_INTEGRITY_CHECKING] = Result("-", f"{num_trusted_certs} trusted certs and {num_untrusted_certs} untrusted certs.\n\n{m}")
                 return
+
+            apk_to_install, error = self._build(MITM_PATCHED, build_mitm_patched)
+            if error:
+                self.results.dict[HAS_NETWORK_INTEGRITY_CHECKING] = Result(True, f"{num_trusted_certs} trusted certs and {num_untrusted_certs} untrusted certs.\n\n{error}")
+                return
             
             if self.app_manager.uninstall() and self.app_manager.install(apk_to_install=apk_to_install):
                 server_conns = intercept(self.app_manager.start())
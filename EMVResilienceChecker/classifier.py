@@ -9,6 +9,7 @@ os.environ["TRANSFORMERS_NO_TQDM"] = TRANSFORMERS_NO_TQDM
 
 import re
 import torch
+import threading
 
 from transformers import pipeline
 
@@ -24,6 +25,7 @@ class Classifier():
                             torch_dtype=torch.bfloat16, 
                             device_map = "auto",
                             )
+        self._lock = threading.Lock() # shared by all DevicePool workers, one generation at a time
 
     @staticmethod
     def _clean_response(text):
@@ -48,12 +50,13 @@ class Classifier():
         ]
 
         try:
-            outputs = self.pipe(
-                messages,
-                max_new_tokens=max_new_tokens,
-                do_sample=False,
-                top_p=1.0
-            )
+            with self._lock:
+                outputs = self.pipe(
+                    messages,
+                    max_new_tokens=max_new_tokens,
+                    do_sample=False,
+                    top_p=1.0
+                )
 
             response = self._clean_response(outputs[0]["generated_text"][-1]["content"])
         except Exception as e:
@@ -48,10 +48,12 @@ IR_ONLY     = 0    # Only check for identifier renaming
 # Results ==============================================================================
 
 """
-If 1, it will find the most recent results spreadsheet and skip any APKs already evaluated. 
-    Alternatively, you can set it to a specific file (recommended):
+If 1, skip any APKs already evaluated with the same evaluation settings above, wherever the APK file or
+    directory has moved since (APKs are recognised by content hash, see processedindex.py).
+    APKs listed in the most recent results spreadsheet are also skipped, in case it predates the index.
+    Alternatively, you can set it to a specific file (recommended), whose APKs are skipped and which results are added to:
     e.g. OMIT_PROCESSED = "results_2025-05-08_201339.xlsx"
-It is assumed that the evaluation config above and APK paths did not change.
+It is assumed that the evaluation config above did not change for spreadsheets that predate the index.
 Only works when -d is used and not -f.
 
 If 0, re-evaluate all APKs.
@@ -71,4 +73,17 @@ REPACK_ONLY     = 0     # skip testing if it the repacked APK can run normally
 # For 100 apps, TEE_GREP finishes in under 5 minutes, while TEE_SOOT took over 5 hours, with many timing out after 10 minutes
 
 TEE_GREP        = 0     # grep search for TEE related classes and methods in jadx-decompiled code, does not guarantee that the methods found are from the TEE classes, but are likely to be
-TEE_SOOT        = 1     # use Soot to check if found methods are actually from TEE related classes
\ No newline at end of file
+TEE_SOOT        = 1     # use Soot to check if found methods are actually from TEE related classes
+# Static batch (--static) ==============================================================
+
+# Runs HAS_TEE, HAS_ANTI_DEBUG and HAS_CODE_OBFUSCATION over the whole -d directory in parallel, no device needed
+STATIC_WORKERS          = 0     # worker processes, 0 = one per CPU core
+STATIC_TASK_TIMEOUT     = 180   # minutes per APK, unfinished checks are recorded as timed out
+STATIC_MEMORY_LIMIT     = 8     # GB of memory per worker process (and each tool it runs, e.g. Soot), 0 = no cap
+
+# Prefetch =============================================================================
+
+# While a device runs one APK, build the repackaged+signed APK (HAS_ANTI_REPACKAGING) and the apk-mitm
+# patched APK (HAS_NETWORK_INTEGRITY_CHECKING) of the next APKs in the background, so the device only installs and observes
+PREFETCH_LOOKAHEAD      = 2     # APKs to prepare ahead, 0 = build on demand as before
+PREFETCH_WORKERS        = 2     # background build threads (each runs apktool, uber-apk-signer or apk-mitm)
@@ -156,6 +156,7 @@ RESULTS_FILE_NAME = "results"
 RESULTS_FILE_EXT = "xlsx"
 RESULTS_APK_PATH_KEY = "APK_path"
 RESULTS_APK_NAME_KEY = "APK_name"
+RESULTS_DB_PATH = os.path.join(RESULTS_DIR_PATH, "results_store.sqlite3") # spreadsheets are exported from here, see resultsstore.py
 
 # droidbot tasks
 ROOT_CHECKING_TASK = HAS_ROOT_CHECKING # TRUE CONSTANT
@@ -0,0 +1,142 @@
+import queue
+import threading
+
+from loguru import logger
+from tqdm import tqdm
+
+from util import run_cmd
+from util import set_device
+from constants import PORT
+
+ALL_DEVICES = "all"
+
+
+def connected_devices():
+    """Serials of the devices and emulators adb reports as online"""
+    result = run_cmd(["adb", "devices"], quiet=True)
+    serials = []
+    for line in result.stdout.strip().split("\n")[1:]:
+        fields = line.split()
+        if len(fields) == 2 and fields[1] == "device":
+            serials.append(fields[0])
+    return serials
+
+
+def is_device_online(serial):
+    try:
+        result = run_cmd(["adb", "-s", serial, "get-state"], quiet=True, timeout=10)
+    except Exception:
+        return False
+    return result.stdout.strip() == "device"
+
+
+def resolve_devices(device_ids):
+    """
+    Turns the -id argument into a list of serials.
+
+    :param device_ids: None (adb's default device), "all" (every connected device), or comma-separated serials
+    """
+    if not device_ids:
+        return []
+    if device_ids == ALL_DEVICES:
+        return connected_devices()
+    return [serial.strip() for serial in device_ids.split(",") if serial.strip()]
+
+
+class DevicePool:
+    """
+    Hands APKs to several devices or emulators in parallel.
+
+    One worker thread per device pulls the next APK from a shared queue. Every adb, DroidBot and Frida
+    call made by the worker goes to its own device (see util.set_device), and each device gets its own
+    mitmdump port (PORT + worker index) so network integrity checks do not see each other's traffic.
+
+    If processing an APK raises (including exit() calls deep in a check), the worker checks its device:
+    if it is gone, the APK goes back to the queue for another device and the worker retires;
+    otherwise the failure is logged for that APK and the worker moves on. A device that drops out
+    therefore never stalls the rest of the batch.
+    """
+
+    def __init__(self, serials, process_apk, max_attempts=2):
+        """
+        :param serials: Device serials, one worker each
+        :param process_apk: Called with an APK path in the worker thread of the device that processes it
+        :param max_attempts: Devices an APK is tried on before it is given up
+        """
+        self.serials = list(serials)
+        self.process_apk = process_apk
+        self.max_attempts = max_attempts
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.processed = {serial: 0 for serial in self.serials}
+        self.failed = []    # (apk, serial, error) of APKs that raised on a device that was still online
+        self.lost = []      # APKs given up after max_attempts devices dropped out while processing them
+        self.retired = []   # serials of devices that went offline
+        self.pending = 0    # APKs queued or being processed
+        self.progress = None
+
+    def run(self, apk_list):
+        for apk in apk_list:
+            self.queue.put((apk, 0))
+        self.pending = len(apk_list)
+
+        logger.info(f"Processing {len(apk_list)} APKs on {len(self.serials)} devices: {', '.join(self.serials)}")
+        self.progress = tqdm(total=len(apk_list))
+        workers = [threading.Thread(target=self._work, args=(serial, PORT + i), name=serial, daemon=True)
+                   for i, serial in enumerate(self.serials)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.progress.close()
+
+        # every device dropped out before the queue was drained
+        unprocessed = []
+        while not self.queue.empty():
+            unprocessed.append(self.queue.get()[0])
+
+        logger.info(f"APKs per device: {', '.join(f'{s}: {n}' for s, n in self.processed.items())}")
+        if self.retired:
+            logger.warning(f"Devices that went offline: {', '.join(self.retired)}")
+        for apk, serial, error in self.failed:
+            logger.warning(f"Failed on {serial}: {apk} ({error})")
+        for apk in self.lost + unprocessed:
+            logger.warning(f"Not processed (no device left to run it): {apk}")
+        return unprocessed
+
+    def _work(self, serial, port):
+        set_device(serial, port)
+        while True:
+            try:
+                apk, attempts = self.queue.get(timeout=1)
+            except queue.Empty:
+                # an APK still in progress elsewhere may come back if its device drops out
+                with self.lock:
+                    if self.pending == 0:
+                        return
+                continue
+
+            try:
+                self.process_apk(apk)
+            except BaseException as e: # exit() raises SystemExit, which must not end the whole batch
+                if isinstance(e, KeyboardInterrupt):
+                    raise
+                if not is_device_online(serial):
+                    logger.error(f"Device {serial} went offline while processing {apk}, retiring it")
+                    with self.lock:
+                        self.retired.append(serial)
+                        if attempts + 1 < self.max_attempts:
+                            self.queue.put((apk, attempts + 1))
+                        else:
+                            self.lost.append(apk)
+                            self.pending -= 1
+                            self.progress.update()
+                    return
+                logger.error(f"Processing {apk} on {serial} failed: {e!r}")
+                with self.lock:
+                    self.failed.append((apk, serial, repr(e)))
+
+            with self.lock:
+                self.processed[serial] += 1
+                self.pending -= 1
+                self.progress.update()
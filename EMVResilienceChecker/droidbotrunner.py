@@ -8,6 +8,7 @@ import numpy as np
 
 from PIL import Image
 from util import run_cmd
+from util import device_serial
 from loguru import logger
 from datetime import datetime
 
@@ -64,13 +65,14 @@ class DroidBotRunner:
         logger.critical("TODO: a small logo in the center on a all white background may cause this to return True on accident")
         logger.critical("TODO: sometimes apps draw texts in a canvas pixel-by-pixel like an image, may need to use multimodal model in this case")
         
+        serial = device_serial()
         self.droidbot_proc = subprocess.Popen(["droidbot",
                                         "-a", self.app_manager.apk_path,
                                         "-o", self.output_dir,
                                         "-policy", "bfs_greedy",
                                         "-keep_app",
                                         # "-is_emulator"
-                                        ],   
+                                        ] + (["-d", serial] if serial else []),   
                                         stdout=subprocess.DEVNULL, # comment these out to show in terminal
                                         stderr=subprocess.DEVNULL, # comment these out to show in terminal
                                         stdin=subprocess.PIPE
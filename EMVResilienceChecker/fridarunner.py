@@ -3,6 +3,7 @@ import os
 import time
 import psutil
 
+from util import adb
 from util import adb_action
 from loguru import logger
 
@@ -36,7 +37,7 @@ class FridaRunner:
             logger.info(f"Our Frida server is already running: {self.server}")
             return
 
-        self.frida_proc = subprocess.Popen(["adb", "shell", "su", "-c", f"/data/local/tmp/{self.server}", "&"],  
+        self.frida_proc = subprocess.Popen(adb(["adb", "shell", "su", "-c", f"/data/local/tmp/{self.server}", "&"]),  
                                         stdout=subprocess.PIPE,
                                         stderr=subprocess.PIPE,
                                         stdin=subprocess.PIPE)
@@ -81,7 +82,7 @@ class FridaRunner:
     def kill_by_port(self, port):
         """Terminate all processes on the device that contains the strings 'frida' or FRIDA_SERVER_TAG ('frdaserver') but for a given port"""
         try:
-            result = subprocess.run(["adb", "shell", "netstat", "-antp", "|", "grep", port], capture_output=True, text=True)
+            result = subprocess.run(adb(["adb", "shell", "netstat", "-antp", "|", "grep", port]), capture_output=True, text=True)
             processes = result.stdout.splitlines()
             pids_to_kill = []
 
@@ -106,7 +107,7 @@ class FridaRunner:
     def kill_others(self):
         """Terminate all processes on the device that contains the strings 'frida' or FRIDA_SERVER_TAG ('frdaserver')"""
         try:
-            result = subprocess.run(["adb", "shell", "ps", "|", "grep", "-E", f"'frida|{FRIDA_SERVER_TAG}'"], capture_output=True, text=True)
+            result = subprocess.run(adb(["adb", "shell", "ps", "|", "grep", "-E", f"'frida|{FRIDA_SERVER_TAG}'"]), capture_output=True, text=True)
             processes = result.stdout.splitlines()
             pids_to_kill = []
 
@@ -126,7 +127,7 @@ class FridaRunner:
 
     def show_frida_processes(self):
         try:
-            result = subprocess.run(["adb", "shell", "su", "-c", "ps", "|", "grep", "-E", f"'frida|{FRIDA_SERVER_TAG}'"], capture_output=True, text=True)
+            result = subprocess.run(adb(["adb", "shell", "su", "-c", "ps", "|", "grep", "-E", f"'frida|{FRIDA_SERVER_TAG}'"]), capture_output=True, text=True)
             processes = result.stdout.splitlines()
             for process in processes:
                 print(process)
@@ -136,7 +137,7 @@ class FridaRunner:
 
     def is_server_started(self):
         try:
-            result = subprocess.run(["adb", "shell","su", "-c", "ps", "|", "grep", "-E", self.server], capture_output=True, text=True)
+            result = subprocess.run(adb(["adb", "shell","su", "-c", "ps", "|", "grep", "-E", self.server]), capture_output=True, text=True)
             processes = result.stdout.splitlines()
             for process in processes:
                 if self.server in process:
@@ -148,7 +149,7 @@ class FridaRunner:
             return False
 
     def _is_server_on_device(self):
-        return subprocess.run(["adb", "shell", "su", "-c", "ls", self.frida_device_path], capture_output=True, text=True).stdout.strip() == self.frida_device_path
+        return subprocess.run(adb(["adb", "shell", "su", "-c", "ls", self.frida_device_path]), capture_output=True, text=True).stdout.strip() == self.frida_device_path
 
     def _push_frida(self):
         return (adb_action(["adb", "push", self.frida_local_path, self.frida_device_path], "Push frida server to device") and \
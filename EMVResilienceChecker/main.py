@@ -9,14 +9,20 @@ if not atleast_one_task() and not config.INSTALL_ONLY and not config.START_ONLY:
 import os
 
 import argparse
-import pandas as pd
+import threading
 
 from checker import Checker
 from androguard.util import set_log
-from results import Results
+from results import Results, results_file_path
+from resultsstore import ResultsStore
+from processedindex import ProcessedIndex, task_set_hash
 from tqdm import tqdm
 from datetime import datetime
 from userinput import ask_to_continue
+from util import set_device
+from devicepool import DevicePool, resolve_devices
+from staticbatch import StaticBatch, static_tasks_selected, dynamic_tasks_selected
+from prefetch import Prefetcher, prefetch_needed
 
 from constants import (
     THICK_LINE, 
@@ -44,7 +50,9 @@ class Main():
 
         group.add_argument("-f", "--file", type=str, help="Single APK file")
 
-        parser.add_argument("-id", "--id", type=str, help="Device ID")
+        parser.add_argument("--static", action="store_true", help="Run only the checks that need no device (TEE, anti-debug, code obfuscation) on all cores, see STATIC_* in config.py")
+
+        parser.add_argument("-id", "--id", type=str, help="Device serial (see adb devices), several comma-separated serials, or 'all' to process APKs on every connected device in parallel")
 
         args = parser.parse_args()
 
@@ -59,6 +67,25 @@ class Main():
         self.split = args.split
         self.dir = args.dir
         self.apk = args.file
+        self.static = args.static
+
+        if self.static:
+            if not self.dir:
+                parser.error("--static requires -d")
+            if args.id:
+                parser.error("--static does not use a device, do not use -id")
+            if not static_tasks_selected():
+                parser.error("--static needs at least one of HAS_TEE, HAS_ANTI_DEBUG or HAS_CODE_OBFUSCATION in config.py")
+            if dynamic_tasks_selected():
+                logger.warning("--static: checks that run the app are skipped")
+
+        self.devices = resolve_devices(args.id)
+        if args.id and not self.devices:
+            parser.error(f"No device found for -id {args.id}, check adb devices")
+        if len(self.devices) > 1 and (config.START_ONLY or args.file):
+            parser.error("Several devices need -d and config.START_ONLY = 0")
+        if len(self.devices) == 1:
+            set_device(self.devices[0])
 
         if bool(config.OVERRIDE_MAIN_ACTIVITY) ^ bool(config.OVERRIDE_PACKAGE_NAME):
             logger.warning("Please specify both OVERRIDE_MAIN_ACTIVITY and OVERRIDE_PACKAGE_NAME")
@@ -66,18 +93,33 @@ class Main():
 
         self.tag = datetime.now().strftime("%Y-%m-%d_%H%M%S")
 
-        self.most_recent_result_path = None
-        self.apks_already_processed = self._get_already_processed()
+        self.prefetcher = None
+        self.most_recent_result_path = self._find_omit_processed_file()
+
+        self.store = ResultsStore()
+        self.processed = ProcessedIndex(task_set_hash(self.static))
+        if self.most_recent_result_path:
+            # spreadsheets written before the store and the index existed
+            self.store.import_excel(self.most_recent_result_path)
+            self.processed.import_sheet([row.get(RESULTS_APK_PATH_KEY) for row in self.store.rows(self.most_recent_result_path)], self.most_recent_result_path)
+
+        self.results_sheet = results_file_path(self.tag)
+        if config.SAVE_TO_OMIT_PROCESSED_FILE and self.most_recent_result_path:
+            self.results_sheet = self.most_recent_result_path
 
         self.classifier = None
-        if Checker.need_classifier():
+        if Checker.need_classifier() and not self.static:
             from classifier import Classifier
             self.classifier = Classifier()
 
-    def _get_already_processed(self):
+    def _find_omit_processed_file(self):
+        """The results spreadsheet selected by config.OMIT_PROCESSED, if any"""
         if config.OMIT_PROCESSED:
             if config.OMIT_PROCESSED == 1:
-                most_recent_result = sorted([f for f in os.listdir(RESULTS_DIR_PATH) if self._is_valid_file_name(f)])[-1]
+                results_files = sorted([f for f in os.listdir(RESULTS_DIR_PATH) if self._is_valid_file_name(f)]) if os.path.isdir(RESULTS_DIR_PATH) else []
+                if not results_files:
+                    return None
+                most_recent_result = results_files[-1]
 
             elif self._is_valid_file_name(config.OMIT_PROCESSED):
                 most_recent_result = config.OMIT_PROCESSED
@@ -86,12 +128,14 @@ class Main():
                 logger.warning(f"Please check config.OMIT_PROCESSED in config.py")    
                 exit() 
 
-            logger.info(f"Omitting APKs found in {most_recent_result}")
-            self.most_recent_result_path = os.path.join(RESULTS_DIR_PATH, most_recent_result)
+            return os.path.join(RESULTS_DIR_PATH, most_recent_result)
+        return None
 
-            df = pd.read_excel(self.most_recent_result_path)
-            return df[RESULTS_APK_PATH_KEY].dropna().tolist()
-        return []
+    def _is_already_processed(self, apk):
+        if config.OMIT_PROCESSED and self.processed.is_processed(apk):
+            logger.info(f"Already processed, omitting: {os.path.basename(apk)}")
+            return True
+        return False
 
     def _is_valid_file_name(self, f):
         return f.startswith(RESULTS_FILE_NAME) and f.endswith(RESULTS_FILE_EXT)
@@ -104,8 +148,16 @@ class Main():
         return config.HAS_TEE or config.HAS_ANTI_DEBUG or config.HAS_CODE_OBFUSCATION or config.HAS_ROOT_CHECKING or need_to_run_app()
 
     def _process_apk(self, apk_path):
+        try:
+            prefetched = self.prefetcher.take(apk_path) if self.prefetcher else None
+            self._check_apk(apk_path, prefetched)
+        finally:
+            if self.prefetcher:
+                self.prefetcher.release(apk_path)
+
+    def _check_apk(self, apk_path, prefetched=None):
        
-        checker = Checker(apk_path, self.tag, self.classifier)
+        checker = Checker(apk_path, self.tag, self.classifier, prefetched)
 
         def start_only():
             if not checker.app_manager.is_installed():
@@ -124,21 +176,37 @@ class Main():
 
         log_file_name = f"{os.path.basename(apk_path).replace('.apk','')}_{checker.app_manager.tag}.log"
         log_path = os.path.join(LOG_DIR_PATH, log_file_name)
-        log_file_handler = logger.add(log_path, level=LOG_LEVEL, mode='w')
+        thread_id = threading.get_ident() # with several devices, only this APK's worker logs to its file
+        log_file_handler = logger.add(log_path, level=LOG_LEVEL, mode='w', filter=lambda record: record["thread"].id == thread_id)
 
-        if config.SAVE_TO_OMIT_PROCESSED_FILE:
-            checker.results.excel_output_path = self.most_recent_result_path
+        checker.results.excel_output_path = self.results_sheet
 
-        checker.process_apk()
-        checker.results.to_excel() # appending everytime we finish an APK so we don't lose results in case of crash
+        try:
+            checker.process_apk()
+            # saving everytime we finish an APK so we don't lose results in case of crash; an APK that raised
+            # gets no row, DevicePool may retry it on another device
+            checker.results.save(self.store)
+            self.processed.mark(apk_path, self.results_sheet)
+        finally:
+            logger.remove(log_file_handler)
 
         logger.info(f"Log saved to {log_path}")
-        logger.info(f"Results saved to {checker.results.excel_output_path}")
-        logger.remove(log_file_handler)
+        logger.info(f"Results saved to {self.store.path}")
 
     def start(self):
+        try:
+            self._run()
+        finally:
+            if self.prefetcher:
+                # also on Ctrl+C or a crash: queued builds would otherwise keep the interpreter alive
+                self.prefetcher.shutdown()
+            excel_path = self.store.export_excel(self.results_sheet) # also after a crash or Ctrl+C, for what was finished
+            if excel_path:
+                logger.info(f"Results exported to {excel_path}")
 
-        logger.info(f"{len(self.apks_already_processed)} APKs already evaluated")   
+    def _run(self):
+
+        logger.info(f"{len(self.processed)} APKs already evaluated with these settings")   
 
         if self.dir:
 
@@ -151,15 +219,30 @@ class Main():
 
             logger.info(f"{len(apk_list)} APKs to evaluate")
 
-            for apk in tqdm(apk_list):
+            if config.OMIT_PROCESSED:
+                self.processed.hash_all(apk_list)
+            pending = [apk for apk in apk_list if not self._is_already_processed(apk)]
+
+            if not self.static and prefetch_needed():
+                self.prefetcher = Prefetcher(pending, self.tag)
 
-                if config.OMIT_PROCESSED and (os.path.join(apk, "base.apk") in self.apks_already_processed or apk in self.apks_already_processed):
-                    logger.info(f"Already processed, omitting: {os.path.basename(apk)}")
-                    continue
+            if self.static:
+                StaticBatch(self.tag, self.store, self.results_sheet, on_saved=lambda apk: self.processed.mark(apk, self.results_sheet)).run(pending)
+
+            elif len(self.devices) > 1:
+                def process(apk):
+                    logger.info(THICK_LINE)
+                    logger.info(f"Processing {apk} on {threading.current_thread().name}")
+                    self._process_apk(apk)
+
+                DevicePool(self.devices, process).run(pending)
+
+            else:
+                for apk in tqdm(pending):
 
-                logger.info(THICK_LINE)
-                logger.info(f"Processing {apk}")
-                self._process_apk(apk)
+                    logger.info(THICK_LINE)
+                    logger.info(f"Processing {apk}")
+                    self._process_apk(apk)
 
         elif self.apk:
 
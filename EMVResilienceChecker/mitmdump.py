@@ -15,6 +15,7 @@ from pprint import pprint as pp
 from loguru import logger
 from mitmproxy import tcp
 from util import adb_action
+from util import proxy_port
 
 from constants import MITMDUMP_COLLECTION_DURATION
 from constants import ANDROID_SYSTEM_STORE_PATH
@@ -66,7 +67,7 @@ class MitmCertManager:
         return adb_action(["adb", "shell", "rm", self.target_path], "adb rm")
 
     def install_global_http(self):
-        return adb_action(["adb", "shell", "settings", "put", "global", "http_proxy", IP, str(PORT)], "Installing global http settings")
+        return adb_action(["adb", "shell", "settings", "put", "global", "http_proxy", IP, str(proxy_port())], "Installing global http settings")
 
     def delete_global_http(self):
         status = True
@@ -112,8 +113,9 @@ class NetworkIntegrityChecker:
             # self.disconnect_list.append(e)
 
 class MitmDump:
-    def __init__(self):                             
+    def __init__(self, port=PORT):
         logging.basicConfig(level=logging.ERROR)    # MITMDUMP LOGGING
+        self.port = port
         self.mitmdump = None
         self.nic = NetworkIntegrityChecker()
         self.test_dict = {
@@ -137,7 +139,7 @@ class MitmDump:
                         }
 
     async def start(self):
-        opts = Options(listen_host=LISTEN_HOST, listen_port=int(PORT))
+        opts = Options(listen_host=LISTEN_HOST, listen_port=int(self.port))
 
         self.mitmdump = DumpMaster(opts)
         self.mitmdump.addons.add(self.nic)
@@ -168,10 +170,10 @@ class PipeWriter:
     def isatty(self):                
         return self.is_tty
 
-def worker(conn):
+def worker(conn, port=PORT):
     try: 
         sys.stdout = open(os.devnull, 'w')
-        mitmdump = MitmDump()
+        mitmdump = MitmDump(port)
         async def run_with_timeout():
             return await asyncio.wait_for(mitmdump.start(), timeout=MITMDUMP_COLLECTION_DURATION)        
         asyncio.run(run_with_timeout())
@@ -189,7 +191,7 @@ def intercept(init=None, finalize=None):
 
         logger.info(f"Collecting TLS connection attempts during the first {MITMDUMP_COLLECTION_DURATION}s of app startup...")
         parent_conn, child_conn = Pipe()
-        p = Process(target=worker, args=(child_conn,))
+        p = Process(target=worker, args=(child_conn, proxy_port())) # each device's proxy points at its own port
         p.start()
         server_conns = parent_conn.recv()  # Blocks until worker sends data or pipe closes
         p.join()
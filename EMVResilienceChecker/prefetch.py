@@ -0,0 +1,248 @@
+import os
+import psutil
+import shutil
+import threading
+import subprocess
+import config
+
+from concurrent.futures import ThreadPoolExecutor
+from appmanager import AppManager
+from loguru import logger
+
+from constants import (
+    APK_MITM_TAG,
+    INPUT_PATH,
+    KS_ALIAS,
+    KS_FILE,
+    KS_PASSWORD,
+    SIGNER_PATH,
+)
+
+BUILD_TOOLS = ("apktool", "apk-mitm", os.path.basename(SIGNER_PATH))
+
+REPACKAGED = "repackaged and signed APK"
+MITM_PATCHED = "apk-mitm patched APK"
+
+
+def _copy_split_apks(app_manager):
+    for split_apk in app_manager.split_apks:
+        if not os.path.exists(os.path.join(app_manager.output_apk_path, os.path.basename(split_apk))) or config.FORCE_REPACK:
+            if split_apk.endswith(".apk"):
+                shutil.copy(split_apk, app_manager.output_apk_path)
+
+def build_repackaged(app_manager, timeout=10):
+    """
+    Disassembles the APK with apktool, inserts a nugget, rebuilds it and signs it (and its splits) with uber-apk-signer,
+    leaving *-aligned-signed.apk files in app_manager.output_apk_path. Needs no device.
+
+    :param timeout: Minutes allowed for each tool
+    :return: None on success, otherwise the comment for the HAS_ANTI_REPACKAGING result
+    """
+    disassembly_output = os.path.join(app_manager.output_apk_path, "apktool_disassembly") # -f: Forces the decompilation, overwriting any existing files in the output directory.
+
+    if not os.path.exists(disassembly_output) or config.FORCE_REPACK:
+
+        logger.info("Disassembling with apktool")
+
+        disassembly = subprocess.run([
+                                        "apktool", "d",
+                                        app_manager.apk_path,
+                                        "-o", disassembly_output,
+                                        "-f"
+                                    ],
+                                    capture_output=True,
+                                    text=True,
+                                    timeout=timeout*60
+                                    )
+
+        def actual_error_in_disassembly(stderr):
+            if not stderr:
+                return False
+            return "Exception" in stderr or any(line.startswith("E:") for line in stderr.split("\n"))
+
+        if actual_error_in_disassembly(disassembly.stderr):
+            logger.error(f"\n{disassembly.stderr}")
+            logger.warning("APK CANNOT be disassembled, so it CANNOT be repackaged, which is a good thing, but...")
+            logger.warning("this was likely due to a failure in and does NOT indicate that the app has anti-repackaging abilities itself")
+            return f"Diassembly error: {disassembly.stderr}"
+
+        nugget = os.path.join(INPUT_PATH, "repackingtest")
+        logger.info(f"Inserting a nugget to guarantee a modified APK: {nugget}")
+        shutil.copy(nugget, disassembly_output)
+
+    repacked_path = app_manager.repacked_and_signed_apk_path.replace("-repacked-aligned-signed", "-repacked")
+    if not os.path.isfile(repacked_path) or config.FORCE_REPACK:
+
+        logger.info("Repackaging with apktool")
+
+        build = subprocess.run([
+                                    "apktool", "b",
+                                    disassembly_output,
+                                    "-o", repacked_path
+                                ],
+                                capture_output=True,
+                                text=True,
+                                timeout=timeout*60
+                                )
+
+        def actual_error_in_building(stderr):
+            if not stderr:
+                return False
+            return "error:" in stderr
+
+        if actual_error_in_building(build.stderr):
+            logger.error(f"\n{build.stderr}")
+            logger.warning("APK CANNOT be built (i.e. repackaged), which is a good thing, but...")
+            logger.warning("this was likely due to a failure in apktool or problem in the APK and does NOT indicate that the app has anti-repackaging abilities itself")
+            return f"Build error: {build.stderr}"
+
+    if app_manager.split_apks:
+        _copy_split_apks(app_manager)
+
+    apks_already_signed = [os.path.join(app_manager.output_apk_path, f).replace("-aligned-signed.apk.idsig", ".apk") for f in os.listdir(app_manager.output_apk_path) if f.endswith(".idsig")]
+    apks_to_sign = [os.path.join(app_manager.output_apk_path, f) for f in os.listdir(app_manager.output_apk_path) if f.endswith(".apk") and "-aligned-signed" not in f]
+    apks_to_sign = set(apks_to_sign) - set(apks_already_signed)
+
+    for apk_to_sign in apks_to_sign:
+        if not os.path.exists(apk_to_sign.replace(".apk", "-aligned-signed.apk")) or config.FORCE_REPACK:
+            logger.info(f"Signing {apk_to_sign} with {SIGNER_PATH}")
+
+            signed_apk = subprocess.run([
+                                            "java", "-jar", SIGNER_PATH,
+                                            "--apks", apk_to_sign,
+                                            "--ks", KS_FILE,
+                                            "--ksPass", KS_PASSWORD,
+                                            "--ksKeyPass", KS_PASSWORD,
+                                            "--ksAlias", KS_ALIAS,
+                                            "--allowResign"
+                                        ],
+                                        capture_output=True,
+                                        text=True,
+                                        timeout=timeout*60
+                                        )
+
+            if signed_apk.stderr:
+                logger.error(signed_apk.stderr)
+                logger.warning(apk_to_sign)
+                logger.warning("APK CANNOT be signed and thus CANNOT be repackaged, which is a good thing, but...")
+                logger.warning("this was due to a failure in signing the APK and does NOT indicate that the app has anti-repackaging abilities itself")
+                return "APK cannot be signed"
+
+    return None
+
+def can_patch_with_apkmitm(app_manager):
+    """apk-mitm fails for split APKs, so those need a merged APK"""
+    return bool(app_manager.merged_apk or not app_manager.split_apks)
+
+def build_mitm_patched(app_manager):
+    """
+    Patches the APK (or the merged APK of a split APK) with apk-mitm so it trusts user certificates. Needs no device.
+
+    :return: (path of the patched APK, None) on success, otherwise (None, error message)
+    """
+    if app_manager.merged_apk: # go straight to merged APK if there is one
+        apk_to_patch = app_manager.merged_apk
+        patched_apk = app_manager.merged_apk.replace(".apk", APK_MITM_TAG)
+        kind = "merged APK"
+    else: # single APK
+        apk_to_patch = app_manager.apk_path
+        patched_apk = app_manager.apk_mitm_patched_path
+        kind = "single APK"
+
+    if os.path.exists(patched_apk):
+        logger.info(f"{kind.capitalize()} already patched with apk-mitm")
+        return patched_apk, None
+
+    logger.info(f"Patching {kind} with apk-mitm, this may take several minutes...")
+
+    result = subprocess.run(["apk-mitm", apk_to_patch],
+                            capture_output=True,
+                            text=True,
+                            timeout=60*60)
+
+    if result.stderr:
+        m = f"Error while patching {'merged ' if app_manager.merged_apk else ''}APK with apk-mitm"
+        logger.warning(m)
+        logger.warning(result.stderr)
+        return None, f"{m}: {result.stderr}"
+    return patched_apk, None
+
+
+def prefetch_needed():
+    if not config.PREFETCH_LOOKAHEAD or config.INSTALL_ONLY or config.START_ONLY:
+        return False
+    return config.HAS_ANTI_REPACKAGING or (config.HAS_NETWORK_INTEGRITY_CHECKING and config.IS_DEVICE_ROOTED)
+
+
+class Prefetched:
+    """The AppManager of an APK and the futures of its host-side builds, keyed by REPACKAGED / MITM_PATCHED"""
+
+    def __init__(self, app_manager):
+        self.app_manager = app_manager
+        self.builds = {}
+
+
+class Prefetcher:
+    """
+    Builds the repackaged-and-signed APK and the apk-mitm patched APK of upcoming APKs in background threads,
+    so a device only installs and observes instead of waiting for apktool, uber-apk-signer and apk-mitm.
+
+    take(apk) returns the APK's Prefetched (preparing it right away if it was not scheduled yet) and schedules
+    the next config.PREFETCH_LOOKAHEAD APKs of the list. Checker waits on a build only when it gets to it.
+    Builds are speculative: an APK that turns out not to run normally never uses them.
+    Safe to share between DevicePool workers.
+    """
+
+    def __init__(self, apk_list, tag, lookahead=None, workers=None):
+        """
+        :param apk_list: APKs in the order they will be processed
+        :param tag: Run tag, passed to AppManager
+        """
+        self.apk_list = list(apk_list)
+        self.position = {apk: i for i, apk in enumerate(self.apk_list)}
+        self.tag = tag
+        self.lookahead = config.PREFETCH_LOOKAHEAD if lookahead is None else lookahead
+        self.pool = ThreadPoolExecutor(max_workers=workers or config.PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        self.lock = threading.Lock()
+        self.entries = {}   # apk -> Future of its Prefetched
+
+    def take(self, apk):
+        with self.lock:
+            i = self.position[apk]
+            entry = self._schedule(apk)
+            for upcoming in self.apk_list[i+1 : i+1+self.lookahead]:
+                self._schedule(upcoming)
+        return entry.result()
+
+    def release(self, apk):
+        """Forget an APK once it has been processed, its AppManager holds the parsed APK"""
+        with self.lock:
+            self.entries.pop(apk, None)
+
+    def shutdown(self):
+        """Cancel queued builds and kill the running ones, whose threads would otherwise keep the interpreter alive for up to an hour"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        for child in psutil.Process().children(recursive=True):
+            try:
+                if any(tool in " ".join(child.cmdline()) for tool in BUILD_TOOLS):
+                    child.kill()
+            except psutil.Error:
+                pass
+
+    def _schedule(self, apk):
+        if apk not in self.entries:
+            self.entries[apk] = self.pool.submit(self._prepare, apk)
+        return self.entries[apk]
+
+    def _prepare(self, apk):
+        app_manager = AppManager(apk, self.tag)
+        prefetched = Prefetched(app_manager)
+        if config.HAS_ANTI_REPACKAGING:
+            prefetched.builds[REPACKAGED] = self.pool.submit(self._build, apk, REPACKAGED, build_repackaged, app_manager)
+        if config.HAS_NETWORK_INTEGRITY_CHECKING and config.IS_DEVICE_ROOTED and can_patch_with_apkmitm(app_manager):
+            prefetched.builds[MITM_PATCHED] = self.pool.submit(self._build, apk, MITM_PATCHED, build_mitm_patched, app_manager)
+        return prefetched
+
+    def _build(self, apk, name, build, app_manager):
+        logger.info(f"Prefetching the {name} of {os.path.basename(os.path.normpath(apk))}")
+        return build(app_manager)
@@ -0,0 +1,177 @@
+import os
+import json
+import sqlite3
+import hashlib
+import config
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from loguru import logger
+
+from staticbatch import DYNAMIC_TASK_FLAGS
+from constants import (
+    APK_MITM_TAG,
+    RESULTS_DB_PATH,
+)
+
+# config.py settings that change what a result means; anything else (workers, logging, OMIT_PROCESSED...) does not
+RESULT_SETTINGS = [
+    "CHECK_RUNS_NORMALLY",
+    "HAS_TEE",
+    "HAS_ANTI_DEBUG",
+    "HAS_CODE_OBFUSCATION",
+    "HAS_ROOT_CHECKING",
+    "HAS_ANTI_HOOKING",
+    "HAS_ANTI_REPACKAGING",
+    "HAS_NETWORK_INTEGRITY_CHECKING",
+    "IS_DEVICE_ROOTED",
+    "OVERRIDE_MAIN_ACTIVITY",
+    "OVERRIDE_PACKAGE_NAME",
+    "BASE_PACKAGE_ONLY",
+    "FILTER_PKGS",
+    "HIDE_LIST",
+    "IR_RATIO",
+    "IR_ONLY",
+    "REPACK_ONLY",
+    "TEE_GREP",
+    "TEE_SOOT",
+]
+
+def task_set_hash(static=False):
+    """
+    Hash of the settings in RESULT_SETTINGS, i.e. of which checks run and how.
+    --static skips the checks that run the app, so it is a different task set.
+    """
+    settings = {key: getattr(config, key) for key in RESULT_SETTINGS}
+    if static:
+        for flag in DYNAMIC_TASK_FLAGS:
+            settings[flag] = 0
+        settings["CHECK_RUNS_NORMALLY"] = -1
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+def apk_files(apk_path):
+    """Files whose content identifies an APK: the file itself, or every APK of a split-APK directory"""
+    if not os.path.isdir(apk_path):
+        return [apk_path]
+    # apk-mitm writes its output next to the input, it is not part of the app
+    return sorted(os.path.join(apk_path, f) for f in os.listdir(apk_path) if f.endswith(".apk") and not f.endswith(APK_MITM_TAG))
+
+
+class ProcessedIndex:
+    """
+    Persistent index of the APKs already evaluated, keyed by (APK content hash, task_set_hash()).
+
+    Replaces reading the APK paths of the last results spreadsheet: a lookup is a set membership test, and an
+    APK is still recognised after its file or corpus directory is moved or renamed. File hashes are cached by
+    (path, size, modification time), so a restart only stats files it has seen before; files are hashed in
+    parallel otherwise. Lives in the same SQLite file as the ResultsStore.
+    """
+
+    def __init__(self, task_hash, path=RESULTS_DB_PATH):
+        """
+        :param task_hash: task_set_hash() of this run, APKs evaluated with other settings are not skipped
+        """
+        self.task_hash = task_hash
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS processed (
+                                apk_hash        TEXT NOT NULL,
+                                task_hash       TEXT NOT NULL,
+                                apk_path        TEXT,
+                                sheet           TEXT,
+                                processed_at    TEXT NOT NULL,
+                                PRIMARY KEY (apk_hash, task_hash)
+                            )""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS file_hashes (
+                                path        TEXT PRIMARY KEY,
+                                size        INTEGER NOT NULL,
+                                mtime_ns    INTEGER NOT NULL,
+                                sha256      TEXT NOT NULL
+                            )""")
+            self.processed = {apk_hash for apk_hash, in conn.execute("SELECT apk_hash FROM processed WHERE task_hash = ?", (self.task_hash,))}
+            self.sheets = {sheet for sheet, in conn.execute("SELECT DISTINCT sheet FROM processed WHERE task_hash = ?", (self.task_hash,))}
+            self.file_hashes = {path: (size, mtime_ns, sha256) for path, size, mtime_ns, sha256 in conn.execute("SELECT * FROM file_hashes")}
+        self.apk_hashes = {}    # apk path -> content hash, for this run
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def __len__(self):
+        return len(self.processed)
+
+    def _file_hash(self, path):
+        """(path, size, mtime_ns, sha256), hashing the file only if it changed since it was last hashed"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        cached = self.file_hashes.get(path)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return path, stat.st_size, stat.st_mtime_ns, cached[2]
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        return path, stat.st_size, stat.st_mtime_ns, digest
+
+    def hash_all(self, apk_list, workers=None):
+        """Compute the content hash of every APK (split-APK directories included) up front, in parallel"""
+        files = [f for apk in apk_list for f in apk_files(apk)]
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool: # hashlib releases the GIL while hashing
+            entries = list(pool.map(self._file_hash, files))
+
+        changed = [entry for entry in entries if self.file_hashes.get(entry[0]) != entry[1:]]
+        for path, size, mtime_ns, sha256 in entries:
+            self.file_hashes[path] = (size, mtime_ns, sha256)
+        if changed:
+            logger.info(f"Hashed {len(changed)} new or modified APK files")
+            with self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)", changed)
+
+        for apk in apk_list:
+            hashes = [self.file_hashes[os.path.abspath(f)][2] for f in apk_files(apk)]
+            if os.path.isdir(apk):
+                # a split APK is the set of its files, whatever the directory is called
+                self.apk_hashes[apk] = hashlib.sha256("\n".join(sorted(hashes)).encode()).hexdigest()
+            else:
+                self.apk_hashes[apk] = hashes[0]
+
+    def apk_hash(self, apk):
+        if apk not in self.apk_hashes:
+            self.hash_all([apk], workers=1)
+        return self.apk_hashes[apk]
+
+    def is_processed(self, apk):
+        return self.apk_hash(apk) in self.processed
+
+    def mark(self, apk, sheet=None):
+        """Record that an APK's results were saved (to the spreadsheet `sheet`)"""
+        apk_hash = self.apk_hash(apk)
+        self.processed.add(apk_hash)
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?, ?)",
+                         (apk_hash, self.task_hash, apk, os.path.basename(sheet) if sheet else None, datetime.now().isoformat()))
+
+    def import_sheet(self, apk_paths, sheet):
+        """
+        Mark the APKs of a results spreadsheet written before the index existed, assuming it was produced with the
+        current settings (as OMIT_PROCESSED always did). Done once per spreadsheet; APKs that no longer exist are ignored.
+        """
+        if os.path.basename(sheet) in self.sheets:
+            return
+        # split APKs are recorded as <dir>/base.apk
+        apks = {os.path.dirname(p) if os.path.basename(p) == "base.apk" else p for p in apk_paths if p}
+        apks = [apk for apk in apks if os.path.exists(apk)]
+        self.hash_all(apks)
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO processed VALUES (?, ?, ?, ?, ?)",
+                             [(self.apk_hash(apk), self.task_hash, apk, os.path.basename(sheet), now) for apk in apks])
+        self.processed.update(self.apk_hash(apk) for apk in apks)
+        self.sheets.add(os.path.basename(sheet))
+        logger.info(f"Indexed {len(apks)} APKs of {sheet} as already processed")
@@ -1,7 +1,7 @@
 import os
-import pandas as pd
 
 from dataclasses import dataclass
+from resultsstore import ResultsStore
 
 from constants import (
     IR, SE, RF, CF, VT, 
@@ -22,6 +22,10 @@ from constants import (
 
 from config import IS_DEVICE_ROOTED
 
+def results_file_path(tag):
+    root_tag = "rooted" if IS_DEVICE_ROOTED else "unrooted"
+    return os.path.join(RESULTS_DIR_PATH, f"{RESULTS_FILE_NAME}_{tag}_{root_tag}.{RESULTS_FILE_EXT}")
+
 @dataclass
 class Result:
     result: bool | str = None
@@ -37,8 +41,7 @@ class Results:
             from datetime import datetime
             self.tag = datetime.now().strftime("%Y-%m-%d_%H%M%S")
 
-        root_tag = "rooted" if IS_DEVICE_ROOTED else "unrooted"
-        self.excel_output_path = os.path.join(RESULTS_DIR_PATH, f"{RESULTS_FILE_NAME}_{self.tag}_{root_tag}.{RESULTS_FILE_EXT}")
+        self.excel_output_path = results_file_path(self.tag)
         
         self.task_names = [
                             RUNS_NORMALLY, 
@@ -67,18 +70,9 @@ class Results:
                 row[f"comments for {name}"] = "-"
         return row
 
-    def to_excel(self):
-        row = self._to_row()
-        df = pd.DataFrame([row])
-        
-        if not os.path.exists(self.excel_output_path):
-            df.to_excel(self.excel_output_path, index=False)
-        else:
-            with pd.ExcelWriter(self.excel_output_path, mode='a', if_sheet_exists='overlay', engine='openpyxl') as writer:
-                book = writer.book
-                sheet = book.active
-                startrow = sheet.max_row
-                df.to_excel(writer, index=False, header=False, startrow=startrow)
+    def save(self, store=None):
+        """Append this APK's row to the results store, under the spreadsheet it will be exported to"""
+        (store or ResultsStore()).append(self._to_row(), self.excel_output_path)
 
 if __name__ == "__main__":
 
@@ -97,4 +91,4 @@ if __name__ == "__main__":
 
     apk_results[apk_name] = r
 
-    r.to_excel()
+    r.save()
@@ -0,0 +1,117 @@
+import os
+import json
+import sqlite3
+import argparse
+import pandas as pd
+
+from contextlib import contextmanager
+from datetime import datetime
+from loguru import logger
+
+from constants import (
+    RESULTS_DIR_PATH,
+    RESULTS_DB_PATH,
+    RESULTS_APK_PATH_KEY,
+)
+
+class ResultsStore:
+    """
+    Append-only SQLite store of result rows (Results._to_row), grouped by the name of the spreadsheet they belong to.
+
+    Every APK's row is one INSERT in its own transaction, so appending costs the same for the 1st and the
+    10,000th APK, a crash never leaves a half-written row, and DevicePool threads, StaticBatch and separate
+    runs can write at the same time (WAL journal, writers wait for the lock instead of failing).
+    The spreadsheet is only built on demand by export_excel, with the same layout as before.
+    """
+
+    def __init__(self, path=RESULTS_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS results (
+                                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                                sheet       TEXT NOT NULL,
+                                apk_path    TEXT,
+                                written_at  TEXT NOT NULL,
+                                row         TEXT NOT NULL
+                            )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS results_sheet ON results (sheet)")
+
+    @contextmanager
+    def _connect(self):
+        # one connection per call: sqlite3 connections cannot be shared between threads
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            with conn: # commits, or rolls back if the block raises
+                yield conn
+        finally:
+            conn.close()
+
+    def append(self, row, sheet):
+        """
+        :param row: Results._to_row() of one APK
+        :param sheet: File name of the spreadsheet the row belongs to, e.g. results_<tag>_rooted.xlsx
+        """
+        with self._connect() as conn:
+            conn.execute("INSERT INTO results (sheet, apk_path, written_at, row) VALUES (?, ?, ?, ?)",
+                         (os.path.basename(sheet), row.get(RESULTS_APK_PATH_KEY), datetime.now().isoformat(), json.dumps(row, default=str)))
+
+    def rows(self, sheet):
+        """Rows of a spreadsheet in the order they were written"""
+        with self._connect() as conn:
+            cursor = conn.execute("SELECT row FROM results WHERE sheet = ? ORDER BY id", (os.path.basename(sheet),))
+            return [json.loads(row) for row, in cursor]
+
+    def sheets(self):
+        """(spreadsheet name, number of rows, last write) of every spreadsheet in the store"""
+        with self._connect() as conn:
+            return conn.execute("SELECT sheet, COUNT(*), MAX(written_at) FROM results GROUP BY sheet ORDER BY MIN(id)").fetchall()
+
+    def import_excel(self, excel_path):
+        """Add the rows of a spreadsheet written before the store existed, so exporting it again keeps them"""
+        if not os.path.exists(excel_path) or self.rows(excel_path):
+            return 0
+        df = pd.read_excel(excel_path)
+        df = df.astype(object).where(df.notna(), None)
+        for row in df.to_dict(orient="records"):
+            self.append(row, excel_path)
+        logger.info(f"Imported {len(df)} rows of {excel_path} into {self.path}")
+        return len(df)
+
+    def export_excel(self, sheet, excel_path=None):
+        """
+        Write a spreadsheet's rows to .xlsx in one go (the old per-APK layout: one row per APK, columns from Results._to_row).
+        The file is written next to itself and renamed, so a reader never sees a partial workbook.
+
+        :param excel_path: Defaults to the sheet name in RESULTS_DIR_PATH
+        :return: Path written, or None if the store has no rows for the sheet
+        """
+        rows = self.rows(sheet)
+        if not rows:
+            return None
+        excel_path = excel_path or os.path.join(RESULTS_DIR_PATH, os.path.basename(sheet))
+        tmp_path = f"{excel_path}.tmp"
+        pd.DataFrame(rows).to_excel(tmp_path, index=False, engine="openpyxl")
+        os.replace(tmp_path, excel_path)
+        return excel_path
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Export results from the results store to Excel")
+    parser.add_argument("sheet", nargs="?", help="Spreadsheet name to export, e.g. results_2025-05-08_201339_rooted.xlsx (lists them if omitted)")
+    parser.add_argument("-o", "--output", type=str, help="Output .xlsx path, defaults to the sheet name in the results directory")
+    args = parser.parse_args()
+
+    store = ResultsStore()
+
+    if not args.sheet:
+        for sheet, count, last_write in store.sheets():
+            print(f"{sheet}\t{count} APKs\tlast written {last_write}")
+    else:
+        path = store.export_excel(args.sheet, args.output)
+        if path:
+            logger.info(f"Exported {args.sheet} to {path}")
+        else:
+            logger.warning(f"No rows for {args.sheet} in {store.path}")
@@ -0,0 +1,185 @@
+import os
+import psutil
+import signal
+import resource
+import config
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from loguru import logger
+from tqdm import tqdm
+
+from checker import Checker
+from results import Result
+
+from constants import (
+    HAS_TEE,
+    HAS_ANTI_DEBUG,
+    HAS_CODE_OBFUSCATION,
+    LOG_LEVEL,
+    LOG_DIR_PATH,
+)
+
+DYNAMIC_TASK_FLAGS = ["HAS_ROOT_CHECKING", "HAS_ANTI_HOOKING", "HAS_ANTI_REPACKAGING", "HAS_NETWORK_INTEGRITY_CHECKING"]
+
+
+def static_tasks_selected():
+    return config.HAS_TEE or config.HAS_ANTI_DEBUG or config.HAS_CODE_OBFUSCATION
+
+def dynamic_tasks_selected():
+    return any(getattr(config, flag) for flag in DYNAMIC_TASK_FLAGS) or config.CHECK_RUNS_NORMALLY == 1
+
+
+class StaticTaskTimeout(BaseException):
+    """
+    Raised by SIGALRM when an APK runs past config.STATIC_TASK_TIMEOUT.
+    Not an Exception, so the checks' own `except Exception` blocks cannot swallow it and keep going;
+    whatever the APK left running (e.g. Soot) is killed on the way out.
+    """
+
+
+def _on_alarm(signum, frame):
+    raise StaticTaskTimeout()
+
+def _init_worker(memory_limit_gb):
+    """Runs once in every worker process"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # Ctrl+C is handled by the main process
+
+    # the worker only runs static checks, make sure nothing reaches for a device
+    for flag in DYNAMIC_TASK_FLAGS:
+        setattr(config, flag, 0)
+    config.CHECK_RUNS_NORMALLY = -1
+    config.UNINSTALL_EXISTING_APP = 0
+    config.UNINSTALL_AFTER_ANALYSIS = 0
+
+    if memory_limit_gb:
+        # RLIMIT_DATA rather than RLIMIT_AS: the JVM reserves far more address space than it uses,
+        # but only committed memory counts here. Tools started by the worker inherit the cap.
+        limit = int(memory_limit_gb * 1024**3)
+        resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+def _kill_children():
+    """subprocess.run only kills the process it started, and the checks start tools through a shell"""
+    for child in psutil.Process().children(recursive=True):
+        try:
+            child.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+def _mark_unfinished(results, message):
+    """Fill in the static checks that did not get a result before the APK was stopped"""
+    for name in results.task_names:
+        selected = (name == HAS_TEE and config.HAS_TEE) or (name == HAS_ANTI_DEBUG and config.HAS_ANTI_DEBUG) or (name.startswith(HAS_CODE_OBFUSCATION) and config.HAS_CODE_OBFUSCATION)
+        if selected and results.dict[name] is None:
+            results.dict[name] = Result("-", message)
+
+def _check_apk(apk_path, tag, timeout_min):
+    """
+    Runs the static checks of one APK in a worker process.
+
+    :return: (results row or None, error message or None). A row is returned if at least the APK could be
+             opened, with checks cut short by the timeout or the memory cap marked as such.
+    """
+    log_path = os.path.join(LOG_DIR_PATH, f"{os.path.basename(os.path.normpath(apk_path)).replace('.apk','')}_{tag}.log")
+    log_file_handler = logger.add(log_path, level=LOG_LEVEL, mode='w')
+
+    checker = None
+    signal.signal(signal.SIGALRM, _on_alarm)
+    signal.alarm(int(timeout_min * 60))
+    try:
+        checker = Checker(apk_path, tag)
+        checker.process_apk()
+        return checker.results._to_row(), None
+    except StaticTaskTimeout:
+        error = f"Timed out after {timeout_min} minutes"
+    except MemoryError:
+        error = f"Ran out of memory (STATIC_MEMORY_LIMIT = {config.STATIC_MEMORY_LIMIT} GB)"
+    except BaseException as e: # exit() inside a check raises SystemExit
+        error = repr(e)
+    finally:
+        signal.alarm(0)
+        _kill_children()
+        logger.remove(log_file_handler)
+
+    logger.error(f"{apk_path}: {error}")
+    if checker is None:
+        return None, error
+    _mark_unfinished(checker.results, error)
+    return checker.results._to_row(), error
+
+
+class StaticBatch:
+    """
+    Runs the checks that need no device (HAS_TEE, HAS_ANTI_DEBUG, HAS_CODE_OBFUSCATION) over a list of APKs
+    on a pool of worker processes, one APK per task.
+
+    Each APK is limited to config.STATIC_TASK_TIMEOUT minutes and each worker to config.STATIC_MEMORY_LIMIT GB.
+    Rows are appended to the results store by the main process as soon as each APK finishes, so a crash
+    loses at most the APKs in progress. If a worker dies outright (e.g. killed by the OOM killer) the
+    pool is restarted and the APKs it took down with it are tried once more.
+    """
+
+    def __init__(self, tag, store, sheet, on_saved=None, workers=None, timeout_min=None, memory_limit_gb=None, max_attempts=2):
+        """
+        :param tag: Run tag used in log file names
+        :param store: ResultsStore rows are appended to
+        :param sheet: Spreadsheet the rows belong to
+        :param on_saved: Called with the APK path after a complete row is saved; partial rows (timeout,
+                         memory cap, crash) are stored but the APK is tried again next run
+        :param workers: Worker processes, defaults to config.STATIC_WORKERS (0 = one per core)
+        """
+        self.tag = tag
+        self.store = store
+        self.sheet = sheet
+        self.on_saved = on_saved
+        self.workers = workers or config.STATIC_WORKERS or os.cpu_count()
+        self.timeout_min = timeout_min or config.STATIC_TASK_TIMEOUT
+        self.memory_limit_gb = config.STATIC_MEMORY_LIMIT if memory_limit_gb is None else memory_limit_gb
+        self.max_attempts = max_attempts
+        self.failed = []    # (apk, error) of APKs without a row
+
+    def run(self, apk_list):
+        logger.info(f"Static checks on {len(apk_list)} APKs with {self.workers} worker processes "
+                    f"(timeout {self.timeout_min} min per APK, memory cap {self.memory_limit_gb or 'none'} GB per worker)")
+
+        attempts = {apk: 0 for apk in apk_list}
+        remaining = list(apk_list)
+        progress = tqdm(total=len(apk_list))
+
+        while remaining:
+            retry = []
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(remaining)),
+                                     initializer=_init_worker,
+                                     initargs=(self.memory_limit_gb,)) as pool:
+                futures = {pool.submit(_check_apk, apk, self.tag, self.timeout_min): apk for apk in remaining}
+                for future in as_completed(futures):
+                    apk = futures[future]
+                    try:
+                        row, error = future.result()
+                    except BrokenProcessPool:
+                        attempts[apk] += 1
+                        if attempts[apk] < self.max_attempts:
+                            retry.append(apk)
+                            continue
+                        row, error = None, "Worker process died"
+                    self._record(apk, row, error)
+                    progress.update()
+            if retry:
+                logger.warning(f"A worker process died, restarting the pool for {len(retry)} APKs")
+            remaining = retry
+
+        progress.close()
+        for apk, error in self.failed:
+            logger.warning(f"No results for {apk}: {error}")
+
+    def _record(self, apk, row, error):
+        if row is None:
+            self.failed.append((apk, error))
+            return
+        self.store.append(row, self.sheet)
+        if error:
+            logger.warning(f"Partial results for {apk}: {error}")
+        else:
+            logger.success(f"Done: {apk}")
+            if self.on_saved:
+                self.on_saved(apk)
@@ -1,18 +1,45 @@
 import time
+import threading
 import subprocess
 
 from loguru import logger
 from userinput import ask_to_try_again
 
 from constants import ADB_ERROR_TAG
+from constants import PORT
+
+_device = threading.local()
+
+def set_device(serial, proxy_port=PORT):
+    """
+    Select the device that adb calls made from the current thread go to, and the
+    mitmdump port its proxy points at. Each DevicePool worker thread drives its own device.
+    serial=None falls back to adb's default device.
+    """
+    _device.serial = serial
+    _device.proxy_port = proxy_port
+
+def device_serial():
+    return getattr(_device, "serial", None)
+
+def proxy_port():
+    return getattr(_device, "proxy_port", PORT)
+
+def adb(cmd):
+    """Scope an ['adb', ...] command to the current thread's device (adds -s SERIAL)"""
+    serial = device_serial()
+    if serial and cmd and cmd[0] == "adb" and "-s" not in cmd[1:2]:
+        return ["adb", "-s", serial] + list(cmd[1:])
+    return cmd
 
 def run_cmd(cmd, exit_on_error=False, quiet=False, capture_output=True, timeout=None):
     """
     Helper function to run any shell command with consistent handling. Designed for interaction with adb
 
-    :param cmd: List of command arguments (e.g., ['adb', 'shell', 'ls'])
+    :param cmd: List of command arguments (e.g., ['adb', 'shell', 'ls']); adb commands go to the thread's device
     :return: CompletedProcess object with stdout and stderr
     """
+    cmd = adb(cmd)
     result = subprocess.run(cmd,
                             capture_output=True,
                             text=True,
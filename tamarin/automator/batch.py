@@ -0,0 +1,143 @@
+"""Multi-lemma batch search: one level-wise lattice per lemma, one prover run per distinct candidate."""
+
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Sequence
+
+from automator.min_cut_set import LabelIndex, LevelwiseSearch
+from automator.tamarin_utils import TAMARIN_RETRY_TIERS, Verdict
+
+ProveLemmasFn = Callable[[FrozenSet[str], list[str], int], dict[str, Verdict]]
+MapFn = Callable[[Callable, Sequence], list]
+
+
+@dataclass
+class LemmaResult:
+    """Outcome of the batch search for one lemma."""
+    minimal: list[FrozenSet[str]] = field(default_factory=list)
+    undecided: list[FrozenSet[str]] = field(default_factory=list)
+    candidates: int = 0
+
+
+class BatchSearch:
+    """
+    Level-wise search for several lemmas that shares the prover runs.
+
+    Every lemma keeps its own LevelwiseSearch, and all of them advance one
+    level at a time in lockstep. At each level the candidates of all lemmas
+    are merged, so a leak set that several lemmas need is generated once and
+    proved for all of them in one prover run (see
+    tamarin_utils.prove_leak_set_lemmas). A lemma stops taking part as soon
+    as its own lattice is exhausted; since candidates of one level never
+    contain each other, no verdict of the level can be implied by another.
+
+    UNKNOWN verdicts are retried after the rest of the level, one tier of
+    TAMARIN_RETRY_TIERS at a time, for the undecided lemmas only. A set still
+    undecided at max_tier is recorded in the lemma's `undecided` list and
+    passed to its LevelwiseSearch as None: never a minimal set, but its
+    supersets are still searched (as with RetryScheduler).
+    """
+
+    def __init__(
+        self,
+        lemma_names: Sequence[str],
+        leak_list: Sequence[str],
+        prove: ProveLemmasFn,
+        map_fn: MapFn | None = None,
+        max_tier: int = len(TAMARIN_RETRY_TIERS) - 1,
+        on_frontier: Callable[[int, int], None] | None = None,
+    ) -> None:
+        """
+        Args:
+            lemma_names: Lemmas to analyse
+            leak_list: Leak names spanning every lemma's lattice
+            prove: Proves a list of lemmas for one leak set at a retry tier
+            map_fn: Optional parallel map over (function, items), e.g. an executor's map;
+                runs are made one at a time when omitted
+            max_tier: Highest tier of TAMARIN_RETRY_TIERS to escalate to
+            on_frontier: Optional function called with (size, distinct candidates)
+                before each level is proved, e.g. Telemetry.set_frontier
+        """
+        if not 0 <= max_tier < len(TAMARIN_RETRY_TIERS):
+            raise ValueError(f"max_tier must be between 0 and {len(TAMARIN_RETRY_TIERS) - 1}, got {max_tier}")
+        self.lemma_names = list(lemma_names)
+        self.index = LabelIndex(leak_list)
+        self.prove = prove
+        self.map_fn = map_fn or (lambda fn, items: [fn(item) for item in items])
+        self.max_tier = max_tier
+        self.on_frontier = on_frontier
+        self.results = {lemma: LemmaResult() for lemma in self.lemma_names}
+        self.evaluations = 0
+
+    def _evaluate(self, needs: dict[int, list[str]]) -> dict[str, dict[int, bool | None]]:
+        """Prove every mask for the lemmas that need it, retrying UNKNOWN verdicts tier by tier."""
+        verdicts: dict[str, dict[int, bool | None]] = {lemma: {} for lemma in self.lemma_names}
+        pending = list(needs.items())
+        for tier in range(self.max_tier + 1):
+            if not pending:
+                break
+            if tier > 0:
+                print(f"[Batch] Retrying {len(pending)} undecided set(s) at tier {tier} "
+                      f"({TAMARIN_RETRY_TIERS[tier][0]} min, -c={TAMARIN_RETRY_TIERS[tier][1]})\n")
+            runs = self.map_fn(lambda item: self.prove(self.index.to_set(item[0]), item[1], tier), pending)
+            self.evaluations += sum(len(lemmas) for _, lemmas in pending)
+            retry = []
+            for (m, lemmas), run in zip(pending, runs):
+                unknown = [lemma for lemma in lemmas if run[lemma] is Verdict.UNKNOWN]
+                for lemma in lemmas:
+                    if run[lemma] is not Verdict.UNKNOWN:
+                        verdicts[lemma][m] = run[lemma] is Verdict.FALSIFIED
+                if unknown:
+                    retry.append((m, unknown))
+            pending = retry
+        for m, lemmas in pending:
+            for lemma in lemmas:
+                verdicts[lemma][m] = None
+                self.results[lemma].undecided.append(self.index.to_set(m))
+        return verdicts
+
+    def run(self) -> dict[str, LemmaResult]:
+        """
+        Search every lemma's lattice.
+
+        Returns:
+            Dict mapping each lemma name to its LemmaResult; minimal sets are in order of size
+        """
+        n = self.index.n
+        print(f"\n[Initial check] Testing {len(self.lemma_names)} lemma(s) with all {n} elements...")
+        full = self._evaluate({self.index.full: list(self.lemma_names)})
+        searches = {}
+        for lemma in self.lemma_names:
+            if full[lemma][self.index.full] is False:
+                print(f"[Initial check] {lemma}: entire set does not satisfy predicate - no solutions exist")
+                continue
+            if full[lemma][self.index.full] is None:
+                print(f"[Initial check] {lemma}: entire set could not be decided - searching anyway")
+            searches[lemma] = LevelwiseSearch(n)
+        print(f"[Initial check] Searching {len(searches)} lemma(s)\n")
+
+        level = 0
+        while searches:
+            needs: dict[int, list[str]] = {}
+            for lemma, search in searches.items():
+                for m in search.candidates:
+                    needs.setdefault(m, []).append(lemma)
+            if self.on_frontier is not None:
+                self.on_frontier(level, len(needs))
+            # the full set was proved by the initial check
+            verdicts = self._evaluate({m: lemmas for m, lemmas in needs.items() if m != self.index.full})
+            for lemma in needs.get(self.index.full, []):
+                verdicts[lemma][self.index.full] = full[lemma][self.index.full]
+            for lemma in list(searches):
+                search = searches[lemma]
+                found = search.record(verdicts[lemma])
+                self.results[lemma].minimal.extend(self.index.to_set(m) for m in found)
+                self.results[lemma].candidates = search.visited
+                if search.done:
+                    del searches[lemma]
+            shared = sum(len(lemmas) for lemmas in needs.values()) - len(needs)
+            print(f"[Batch] Completed size {level}: {len(needs)} distinct candidate(s), "
+                  f"{shared} proof(s) shared with another lemma, {len(searches)} lemma(s) still searching\n")
+            level += 1
+
+        print(f"[Batch] Complete - {self.evaluations} verdict(s) over {len(self.lemma_names)} lemma lattice(s)")
+        return self.results
@@ -0,0 +1,354 @@
+"""
+Benchmark of the cut-set enumerators against synthetic monotone predicates.
+
+Each trial plants a random antichain of minimal sets over n labels and uses
+P(S) = "S contains a planted set" as the oracle, so the expected answer is
+known and no tamarin-prover run is needed. Every oracle call draws a
+simulated proof time from a log-normal distribution whose median depends on
+the labels of the set; with --jobs, batched calls are scheduled on that many
+simulated workers. Each strategy is run with every label order of --orders
+(see automator.label_order), fed with a simulated history of the instance.
+
+Usage (from the tamarin directory):
+    python3 -m automator.benchmark --n 16 --minimal-sets 8 --trials 5
+"""
+
+import argparse
+import contextlib
+import heapq
+import io
+import math
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Sequence
+
+from automator.label_order import (
+    LABEL_ORDER_COST,
+    LABEL_ORDER_DYNAMIC,
+    LABEL_ORDER_FREQUENCY,
+    LABEL_ORDERS,
+    cost_order,
+    dynamic_order,
+    frequency_order,
+)
+from automator.min_cut_set import (
+    LabelIndex,
+    LabelOrder,
+    SearchStats,
+    enumerate_levelwise,
+    enumerate_marco,
+    enumerate_minimal_satisfying_cutsets,
+)
+
+
+def plant_minimal_sets(n: int, count: int, min_size: int, max_size: int, rng: random.Random) -> list[int]:
+    """
+    Draw up to `count` random label masks of size min_size..max_size and
+    reduce them to an antichain (no planted set contains another).
+    """
+    drawn = set()
+    for _ in range(count):
+        size = rng.randint(min_size, max_size)
+        drawn.add(sum(1 << i for i in rng.sample(range(n), size)))
+    return sorted(
+        (m for m in drawn if not any(t != m and t & m == t for t in drawn)),
+        key=lambda m: (m.bit_count(), m),
+    )
+
+
+class PlantedPredicate:
+    """
+    Monotone predicate that holds iff a set contains one of the planted masks.
+
+    Counts calls and accumulates a simulated prover time: every call draws a
+    log-normal latency, and a batch of calls costs the makespan of a longest-
+    processing-time-first schedule on `jobs` workers. Every label has a
+    log-cost drawn from N(0, label_cost_sigma), and the median latency of a
+    set is scaled by the exponential of the mean log-cost of its labels.
+    first_hit_calls and first_hit_time record the calls and simulated time
+    until a planted minimal set itself is first queried, i.e. until the
+    search first reaches a cut-set it will report.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        planted: list[int],
+        rng: random.Random,
+        latency_median: float = 30.0,
+        latency_sigma: float = 1.0,
+        jobs: int = 1,
+        label_cost_sigma: float = 0.5,
+    ) -> None:
+        self.index = LabelIndex(labels)
+        self.planted = planted
+        self.rng = rng
+        self.mu = math.log(latency_median)
+        self.sigma = latency_sigma
+        self.jobs = jobs
+        self.label_costs = {label: rng.gauss(0.0, label_cost_sigma) for label in labels}
+        self.calls = 0
+        self.simulated_time = 0.0
+        self.first_hit_calls: int | None = None
+        self.first_hit_time: float | None = None
+
+    def _holds(self, leak_set: FrozenSet[str]) -> bool:
+        m = self.index.mask(leak_set)
+        return any(t & m == t for t in self.planted)
+
+    def _latency(self, leak_set: FrozenSet[str]) -> float:
+        costs = [self.label_costs[x] for x in leak_set]
+        return self.rng.lognormvariate(self.mu + (statistics.fmean(costs) if costs else 0.0), self.sigma)
+
+    def _record_hits(self, leak_sets: Sequence[FrozenSet[str]]) -> None:
+        if self.first_hit_calls is None and any(self.index.mask(s) in self.planted for s in leak_sets):
+            self.first_hit_calls = self.calls
+            self.first_hit_time = self.simulated_time
+
+    def __call__(self, leak_set: FrozenSet[str]) -> bool:
+        self.calls += 1
+        self.simulated_time += self._latency(leak_set)
+        self._record_hits([leak_set])
+        return self._holds(leak_set)
+
+    def batch(self, leak_sets: Sequence[FrozenSet[str]]) -> list[bool]:
+        self.calls += len(leak_sets)
+        workers = [0.0] * min(self.jobs, len(leak_sets))
+        for latency in sorted((self._latency(s) for s in leak_sets), reverse=True):
+            heapq.heapreplace(workers, workers[0] + latency)
+        self.simulated_time += max(workers, default=0.0)
+        self._record_hits(leak_sets)
+        return [self._holds(s) for s in leak_sets]
+
+    def observations(self, count: int, rng: random.Random) -> list[tuple[FrozenSet[str], float]]:
+        """(set, latency) of `count` random sets, as telemetry of an earlier run; not counted as calls."""
+        observed = []
+        for _ in range(count):
+            leak_set = frozenset(x for x in self.index.labels if rng.random() < 0.5)
+            observed.append((leak_set, self._latency(leak_set)))
+        return observed
+
+
+Runner = Callable[[list, PlantedPredicate, SearchStats, LabelOrder | None], list]
+
+# the level-wise search proves the same sets in any label order, so it ignores label_order
+STRATEGIES: dict[str, Runner] = {
+    "levelwise": lambda L, P, stats, order: enumerate_levelwise(
+        L, P, batch_predicate=P.batch if P.jobs > 1 else None, stats=stats),
+    "dfs/linear": lambda L, P, stats, order: enumerate_minimal_satisfying_cutsets(
+        L, P, batch_predicate=P.batch if P.jobs > 1 else None, stats=stats, shrink_strategy="linear",
+        label_order=order),
+    "dfs/quickxplain": lambda L, P, stats, order: enumerate_minimal_satisfying_cutsets(
+        L, P, batch_predicate=P.batch if P.jobs > 1 else None, stats=stats, shrink_strategy="quickxplain",
+        label_order=order),
+    "marco/linear": lambda L, P, stats, order: enumerate_marco(
+        L, P, stats=stats, shrink_strategy="linear", label_order=order)[0],
+    "marco/quickxplain": lambda L, P, stats, order: enumerate_marco(
+        L, P, stats=stats, shrink_strategy="quickxplain", label_order=order)[0],
+}
+
+
+def simulated_label_order(
+    order: str,
+    labels: list[str],
+    planted: list[int],
+    P: PlantedPredicate,
+    rng: random.Random,
+) -> tuple[list[str], LabelOrder | None]:
+    """
+    Resolve a label order as plan_label_order does, from a simulated history:
+    a random half of the planted sets stands for the minimal sets of earlier
+    runs, and 4n random sets with their latencies for earlier telemetry.
+    """
+    index = LabelIndex(labels)
+    if order == LABEL_ORDER_COST:
+        return cost_order(labels, P.observations(4 * len(labels), rng)), None
+    if order in (LABEL_ORDER_FREQUENCY, LABEL_ORDER_DYNAMIC):
+        history = rng.sample(planted, len(planted) // 2)
+        ordered = frequency_order(labels, [index.to_set(m) for m in history])
+        return ordered, dynamic_order(len(labels)) if order == LABEL_ORDER_DYNAMIC else None
+    return labels, None
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one strategy on one planted instance."""
+    strategy: str
+    order: str
+    trial: int
+    oracle_calls: int
+    first_hit_calls: int
+    first_hit_time: float
+    shrink_oracle_calls: int
+    index_queries: int
+    wall_time: float
+    simulated_time: float
+    peak_kib: float
+    correct: bool
+
+
+def run_strategy(
+    strategy: str,
+    order: str,
+    trial: int,
+    labels: list[str],
+    planted: list[int],
+    seed: int,
+    latency_median: float,
+    latency_sigma: float,
+    jobs: int,
+    measure_memory: bool = True,
+) -> BenchmarkResult:
+    """
+    Run one strategy on one planted instance.
+
+    The search is run once for calls, index queries and wall time, and, with
+    measure_memory, a second time under tracemalloc for its peak memory, so
+    the tracing overhead does not distort the timing. Every label order of a
+    trial sees the same label costs and the same simulated history.
+    """
+    runner = STRATEGIES[strategy]
+
+    def run() -> tuple[list, PlantedPredicate, SearchStats]:
+        P = PlantedPredicate(labels, planted, random.Random(seed), latency_median, latency_sigma, jobs)
+        ordered, label_order = simulated_label_order(order, labels, planted, P, random.Random(seed))
+        stats = SearchStats()
+        with contextlib.redirect_stdout(io.StringIO()):
+            found = runner(ordered, P, stats, label_order)
+        return found, P, stats
+
+    start = time.perf_counter()
+    found, P, stats = run()
+    wall_time = time.perf_counter() - start
+
+    peak_kib = 0.0
+    if measure_memory:
+        tracemalloc.start()
+        run()
+        peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    index = LabelIndex(labels)
+    correct = sorted(index.mask(s) for s in found) == sorted(planted)
+    return BenchmarkResult(
+        strategy=strategy,
+        order=order,
+        trial=trial,
+        oracle_calls=P.calls,
+        first_hit_calls=P.first_hit_calls or 0,
+        first_hit_time=P.first_hit_time or 0.0,
+        shrink_oracle_calls=stats.shrink_oracle_calls,
+        index_queries=stats.index_queries,
+        wall_time=wall_time,
+        simulated_time=P.simulated_time,
+        peak_kib=peak_kib,
+        correct=correct,
+    )
+
+
+def run_benchmark(
+    n: int = 16,
+    minimal_sets: int = 8,
+    min_size: int = 2,
+    max_size: int = 4,
+    trials: int = 3,
+    seed: int = 0,
+    latency_median: float = 30.0,
+    latency_sigma: float = 1.0,
+    jobs: int = 1,
+    strategies: Sequence[str] = tuple(STRATEGIES),
+    orders: Sequence[str] = LABEL_ORDERS,
+    measure_memory: bool = True,
+) -> list[BenchmarkResult]:
+    """
+    Benchmark every strategy with every label order on the same `trials` planted instances.
+
+    Returns:
+        One BenchmarkResult per (trial, strategy, order)
+    """
+    labels = [f"L{i}" for i in range(n)]
+    results = []
+    for trial in range(trials):
+        rng = random.Random(seed + trial)
+        planted = plant_minimal_sets(n, minimal_sets, min_size, max_size, rng)
+        for strategy in strategies:
+            for order in orders:
+                results.append(run_strategy(
+                    strategy, order, trial, labels, planted, seed + trial,
+                    latency_median, latency_sigma, jobs, measure_memory,
+                ))
+    return results
+
+
+def print_summary(results: list[BenchmarkResult]) -> None:
+    """
+    Print the mean of every measurement per strategy and label order, then
+    the label order with the fewest oracle calls to full coverage per strategy.
+    """
+    header = (f"{'strategy':<18} {'order':<10} {'calls':>9} {'1st hit':>8} {'1st hit min':>11} {'shrink':>8} "
+              f"{'index ops':>11} {'wall s':>9} {'sim. h':>9} {'peak KiB':>10}  ok")
+    print(header)
+    print("-" * len(header))
+    mean_calls = {}
+    for strategy, order in dict.fromkeys((r.strategy, r.order) for r in results):
+        rows = [r for r in results if r.strategy == strategy and r.order == order]
+        mean = lambda attr: statistics.mean(getattr(r, attr) for r in rows)
+        ok = sum(r.correct for r in rows)
+        peak = f"{mean('peak_kib'):.1f}" if any(r.peak_kib for r in rows) else "-"
+        mean_calls[strategy, order] = mean('oracle_calls')
+        print(f"{strategy:<18} {order:<10} {mean('oracle_calls'):>9.1f} {mean('first_hit_calls'):>8.1f} "
+              f"{mean('first_hit_time') / 60:>11.1f} {mean('shrink_oracle_calls'):>8.1f} "
+              f"{mean('index_queries'):>11.1f} {mean('wall_time'):>9.3f} {mean('simulated_time') / 3600:>9.2f} "
+              f"{peak:>10}  {ok}/{len(rows)}")
+
+    if len({order for _, order in mean_calls}) > 1:
+        print()
+        for strategy in dict.fromkeys(strategy for strategy, _ in mean_calls):
+            calls = {order: c for (s, order), c in mean_calls.items() if s == strategy}
+            best = min(calls, key=calls.get)
+            print(f"{strategy:<18} fewest calls with {best} ({calls[best]:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare cut-set enumerators on synthetic monotone predicates")
+    parser.add_argument("--n", type=int, default=16, help="Number of labels (default: 16)")
+    parser.add_argument("--minimal-sets", type=int, default=8, help="Planted minimal sets per trial (default: 8)")
+    parser.add_argument("--min-size", type=int, default=2, help="Smallest planted set size (default: 2)")
+    parser.add_argument("--max-size", type=int, default=4, help="Largest planted set size (default: 4)")
+    parser.add_argument("--trials", type=int, default=3, help="Planted instances per strategy (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the first trial (default: 0)")
+    parser.add_argument("--latency-median", type=float, default=30.0, metavar="SECONDS",
+                        help="Median simulated proof time (default: 30)")
+    parser.add_argument("--latency-sigma", type=float, default=1.0,
+                        help="Log-normal sigma of the simulated proof time (default: 1.0)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Simulated parallel workers (default: 1)")
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES),
+                        help="Strategies to compare (default: all)")
+    parser.add_argument("--orders", nargs="+", choices=list(LABEL_ORDERS), default=list(LABEL_ORDERS),
+                        help="Label orders to run every strategy with (default: all)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run per strategy")
+    args = parser.parse_args()
+
+    if not 1 <= args.min_size <= args.max_size <= args.n:
+        parser.error("need 1 <= --min-size <= --max-size <= --n")
+
+    results = run_benchmark(
+        n=args.n,
+        minimal_sets=args.minimal_sets,
+        min_size=args.min_size,
+        max_size=args.max_size,
+        trials=args.trials,
+        seed=args.seed,
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        jobs=args.jobs,
+        strategies=args.strategies,
+        orders=args.orders,
+        measure_memory=not args.no_memory,
+    )
+    print(f"n={args.n}, {args.minimal_sets} planted set(s) of size {args.min_size}-{args.max_size}, "
+          f"{args.trials} trial(s), {args.jobs} simulated worker(s)\n")
+    print_summary(results)
@@ -0,0 +1,128 @@
+"""On-disk checkpoints of a running search, so an interrupted analysis can be resumed."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Sequence
+
+from automator.tamarin_utils import RESULTS_DIR
+from automator.verdict_cache import setup_fingerprint
+
+CHECKPOINT_DIR = RESULTS_DIR / "checkpoints"
+CHECKPOINT_INTERVAL_SECONDS = 60.0
+
+
+class Checkpoint:
+    """
+    Search state and verdict log of one analysis, saved as a JSON file.
+
+    The enumerators hand their state to save_search at every point they can
+    resume from (see min_cut_set.set_checkpoint_callback); it is written
+    straight away. Between those points every verdict is added to a log that
+    is written at most once per `interval` seconds, so a run stopped in the
+    middle of a level or a shrink replays the verdicts it already had
+    instead of proving them again. Only decided verdicts are logged, so a
+    set that stayed undecided is proved again when the resumed search
+    reaches it. Files are written to a temporary file and renamed, so a
+    killed run leaves either the previous or the new checkpoint, never a
+    partial one.
+
+    A checkpoint is only resumed for the same lemma, leaks, search and
+    model (main.spthy and leak_rules.json, see verdict_cache.setup_fingerprint).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        lemma_name: str,
+        leak_list: Sequence[str],
+        search: str,
+        interval: float = CHECKPOINT_INTERVAL_SECONDS,
+    ) -> None:
+        self.path = Path(path)
+        self.lemma_name = lemma_name
+        self.leak_list = list(leak_list)
+        self.search = search
+        self.interval = interval
+        self.fingerprint = setup_fingerprint()
+        self.state: dict | None = None
+        self.verdicts: dict[int, bool] = {}
+        self.saves = 0
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self._dirty = False
+
+    def load(self) -> None:
+        """
+        Read the checkpoint file into state and verdicts.
+
+        Raises:
+            FileNotFoundError: If there is no checkpoint to resume
+            ValueError: If the checkpoint was taken for another lemma, leak list, search or model
+        """
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        expected = {
+            "lemma": self.lemma_name,
+            "leaks": sorted(self.leak_list),
+            "search": self.search,
+            "fingerprint": self.fingerprint,
+        }
+        for key, value in expected.items():
+            found = sorted(data.get(key, [])) if key == "leaks" else data.get(key)
+            if found != value:
+                raise ValueError(f"checkpoint {self.path} does not match this run ({key} differs)")
+        # masks of the state follow the label order of the run that wrote it
+        self.leak_list = data["leaks"]
+        self.state = data["state"]
+        self.verdicts = {mask: result for mask, result in data["verdicts"]}
+
+    def save_search(self, state: dict) -> None:
+        """Store an enumerator state and write the checkpoint."""
+        with self._lock:
+            self.state = state
+            self._write()
+
+    def record(self, mask: int, result: bool) -> None:
+        """Add a decided verdict to the log; the file is rewritten if the last write is older than the interval."""
+        with self._lock:
+            self.verdicts[mask] = result
+            self._dirty = True
+            if time.monotonic() - self._last_write >= self.interval:
+                self._write()
+
+    def flush(self) -> None:
+        """Write verdicts logged since the last write."""
+        with self._lock:
+            if self._dirty:
+                self._write()
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the search has finished."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self._dirty = False
+
+    def _write(self) -> None:
+        if self.state is None:
+            # nothing to resume before the enumerator's first checkpoint
+            return
+        data = {
+            "lemma": self.lemma_name,
+            "leaks": self.leak_list,
+            "search": self.search,
+            "fingerprint": self.fingerprint,
+            "saved_at": time.time(),
+            "state": self.state,
+            "verdicts": sorted(self.verdicts.items()),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        self._last_write = time.monotonic()
+        self._dirty = False
+        self.saves += 1
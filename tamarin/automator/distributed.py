@@ -0,0 +1,366 @@
+"""
+Coordinator/worker queue for proving leak sets on several processes or hosts.
+
+The coordinator runs the search (python3 main.py <lemma> --coordinator PORT):
+it owns the lattice, the verdict cache and the telemetry, and serves leak
+sets to prove over XML-RPC. Workers pull one leak set at a time, prove it
+with their own tamarin-prover and push the verdict back.
+
+Usage (from the tamarin directory, on any host with the same model):
+    python3 -m automator.distributed --coordinator HOST:PORT --slots 4
+"""
+
+import argparse
+import hmac
+import os
+import socket
+import socketserver
+import threading
+import time
+import xmlrpc.client
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Sequence
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+from automator.tamarin_utils import (
+    WORKSPACES_DIR,
+    Verdict,
+    get_leak_catalog,
+    prove_leak_set,
+    set_prechecked,
+)
+from automator.verdict_cache import setup_fingerprint
+
+DEFAULT_PORT = 8765
+LEASE_SECONDS = 60
+# heartbeats per lease period
+HEARTBEATS_PER_LEASE = 4
+POLL_SECONDS = 2
+# how long a worker keeps retrying an unreachable coordinator before it exits
+CONNECT_RETRY_SECONDS = 60
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """
+    Split "HOST:PORT", "PORT" (localhost) or "HOST" (default port) into (host, port).
+
+    A coordinator only accepts workers from other hosts when given an
+    explicit host such as 0.0.0.0:PORT.
+    """
+    host, _, port = address.rpartition(":")
+    if not host:
+        if address.isdigit():
+            return "127.0.0.1", int(address)
+        return address, DEFAULT_PORT
+    return host, int(port)
+
+
+@dataclass
+class Job:
+    """One leak set to prove, with its current lease."""
+    id: int
+    leak_set: FrozenSet[str]
+    tier: int
+    owner: str | None = None
+    expires: float = 0.0
+    attempts: int = 0
+    verdict: Verdict | None = None
+    proof_time: float = 0.0
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class _ThreadingXMLRPCServer(socketserver.ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+
+
+class _QuietHandler(SimpleXMLRPCRequestHandler):
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class Coordinator:
+    """
+    Work queue serving leak sets to remote workers, with expiring leases.
+
+    prove() and map() have the signatures of TamarinWorkerPool.prove and
+    TamarinWorkerPool.map, so the coordinator can stand in for the local pool
+    behind the RetryScheduler. Each call queues a job and blocks until a
+    worker reports its verdict.
+
+    A worker leases one job at a time and must renew the lease with a
+    heartbeat while tamarin-prover runs. A reaper thread puts jobs whose lease
+    expired (the worker crashed, hung or lost the network) back at the front
+    of the queue. If the original worker reports after all, the first verdict
+    wins and later ones are ignored.
+
+    Workers say hello with setup_fingerprint() and are turned away if their
+    model or leak rules differ. Every call carries the shared token.
+    """
+
+    def __init__(
+        self,
+        lemma_name: str,
+        address: str = str(DEFAULT_PORT),
+        token: str = "",
+        lease_seconds: float = LEASE_SECONDS,
+    ) -> None:
+        """
+        Args:
+            lemma_name: Lemma every job is proved for
+            address: "HOST:PORT" or "PORT" to listen on (see parse_address)
+            token: Shared secret that workers must present
+            lease_seconds: Time a worker may go without a heartbeat before its job is requeued
+        """
+        self.lemma_name = lemma_name
+        self.token = token
+        self.lease_seconds = lease_seconds
+        # set by the analysis: VerdictCache and Telemetry receiving every verdict,
+        # and whether workers may skip the derivation checks
+        self.verdict_cache = None
+        self.telemetry = None
+        self.prechecked = False
+        self.fingerprint = setup_fingerprint()
+        self.catalog = get_leak_catalog()
+
+        self._lock = threading.Lock()
+        self._jobs: dict[int, Job] = {}
+        self._queue: deque[int] = deque()
+        self._next_id = 0
+        self._finished = False
+        self.workers: dict[str, int] = {}
+        self.requeued = 0
+
+        self._server = _ThreadingXMLRPCServer(
+            parse_address(address), requestHandler=_QuietHandler, allow_none=True, logRequests=False
+        )
+        for method in (self.hello, self.lease, self.heartbeat, self.complete):
+            self._server.register_function(method, method.__name__)
+        self.address = self._server.server_address
+        self._serve_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._serve_thread.start()
+        self._reaper = threading.Thread(target=self._reap, daemon=True)
+        self._reaper.start()
+        self._executor = ThreadPoolExecutor(max_workers=256, thread_name_prefix="coordinator")
+
+    def _check(self, token: str) -> None:
+        # constant-time comparison, so the token cannot be guessed from response times
+        if not isinstance(token, str) or not hmac.compare_digest(token.encode(), self.token.encode()):
+            raise PermissionError("invalid token")
+
+    # -- RPC methods ---------------------------------------------------------
+
+    def hello(self, token: str, worker_id: str, fingerprint: str) -> dict:
+        """Register a worker; returns the lemma and heartbeat interval, or an error if its setup differs."""
+        self._check(token)
+        if fingerprint != self.fingerprint:
+            print(f"[Coordinator] Rejected worker {worker_id}: model or leak rules differ")
+            return {"error": "model or leak rules differ from the coordinator's"}
+        with self._lock:
+            self.workers.setdefault(worker_id, 0)
+        print(f"[Coordinator] Worker {worker_id} connected")
+        return {"lemma": self.lemma_name, "heartbeat": self.lease_seconds / HEARTBEATS_PER_LEASE}
+
+    def lease(self, token: str, worker_id: str) -> dict | None:
+        """
+        Hand out the next job.
+
+        Returns:
+            {"id", "leaks", "tier", "prechecked"}, {"shutdown": True} once the
+            search is over, or None if the queue is empty for now
+        """
+        self._check(token)
+        with self._lock:
+            if self._finished:
+                return {"shutdown": True}
+            while self._queue:
+                job = self._jobs.get(self._queue.popleft())
+                if job is None or job.done.is_set():
+                    continue
+                job.owner = worker_id
+                job.expires = time.time() + self.lease_seconds
+                job.attempts += 1
+                return {"id": job.id, "leaks": sorted(job.leak_set), "tier": job.tier,
+                        "prechecked": self.prechecked}
+        return None
+
+    def heartbeat(self, token: str, worker_id: str, job_id: int) -> bool:
+        """Renew a lease; False if the job was requeued or already decided."""
+        self._check(token)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done.is_set() or job.owner != worker_id:
+                return False
+            job.expires = time.time() + self.lease_seconds
+            return True
+
+    def complete(self, token: str, worker_id: str, job_id: int, verdict: str, proof_time: float) -> bool:
+        """Report a verdict ("falsified", "verified" or "unknown"); False if it arrived too late."""
+        self._check(token)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done.is_set():
+                return False
+            job.verdict = Verdict(verdict)
+            job.proof_time = proof_time
+            self.workers[worker_id] = self.workers.get(worker_id, 0) + 1
+        if job.verdict is not Verdict.UNKNOWN and self.verdict_cache is not None:
+            self.verdict_cache.put(self.lemma_name, job.leak_set, job.verdict is Verdict.FALSIFIED, proof_time)
+        if self.telemetry is not None:
+            self.telemetry.record_call(job.leak_set, job.verdict.value, "prover", proof_time, 0, job.tier)
+        print(f"  [Coordinator] {{{', '.join(self.catalog.ordered(job.leak_set))}}} -> {job.verdict.value} "
+              f"(worker {worker_id}, {proof_time:.1f}s)")
+        job.done.set()
+        return True
+
+    # -- search side ---------------------------------------------------------
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(max(0.5, self.lease_seconds / HEARTBEATS_PER_LEASE))
+            now = time.time()
+            with self._lock:
+                expired = [job for job in self._jobs.values()
+                           if job.owner is not None and not job.done.is_set() and job.expires < now]
+                for job in expired:
+                    print(f"[Coordinator] Lease of worker {job.owner} on {{{', '.join(sorted(job.leak_set))}}} "
+                          f"expired, requeued")
+                    job.owner = None
+                    self._queue.appendleft(job.id)
+                    self.requeued += 1
+
+    def prove(self, leak_set: FrozenSet[str], tier: int = 0) -> Verdict:
+        """Queue a leak set and wait for a worker's verdict."""
+        with self._lock:
+            job = Job(self._next_id, frozenset(leak_set), tier)
+            self._next_id += 1
+            self._jobs[job.id] = job
+            self._queue.append(job.id)
+        job.done.wait()
+        with self._lock:
+            del self._jobs[job.id]
+        return job.verdict
+
+    def map(
+        self,
+        leak_sets: Sequence[FrozenSet[str]],
+        predicate: Callable[[FrozenSet[str]], object] | None = None,
+    ) -> list:
+        """Evaluate several leak sets at once; every set is queued before the first verdict arrives."""
+        return list(self._executor.map(predicate or (lambda s: self.prove(s) is Verdict.FALSIFIED), leak_sets))
+
+    def close(self) -> None:
+        """Tell polling workers to exit, then stop serving."""
+        with self._lock:
+            self._finished = True
+            connected = bool(self.workers)
+        if connected:
+            time.sleep(POLL_SECONDS + 1)
+        self._executor.shutdown(wait=False)
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def run_worker(address: str, token: str = "", worker_id: str | None = None) -> int:
+    """
+    Pull and prove leak sets until the coordinator shuts down.
+
+    Args:
+        address: Coordinator "HOST:PORT"
+        token: Shared secret of the coordinator
+        worker_id: Name reported to the coordinator (default: host-pid)
+
+    Returns:
+        Number of leak sets proved
+    """
+    host, port = parse_address(address)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    proxy = xmlrpc.client.ServerProxy(f"http://{host}:{port}/", allow_none=True)
+
+    def call(method: str, *args):
+        # retry while the coordinator is starting or briefly unreachable
+        deadline = time.time() + CONNECT_RETRY_SECONDS
+        while True:
+            try:
+                return getattr(proxy, method)(token, worker_id, *args)
+            except xmlrpc.client.Fault as fault:
+                # Coordinator._check's PermissionError arrives as a Fault
+                if "PermissionError" in fault.faultString:
+                    raise SystemExit(f"[Worker {worker_id}] Rejected by the coordinator: invalid token, "
+                                     f"check that --token matches the coordinator's")
+                raise
+            except (ConnectionError, OSError):
+                if time.time() > deadline:
+                    raise
+                time.sleep(POLL_SECONDS)
+
+    welcome = call("hello", setup_fingerprint())
+    if "error" in welcome:
+        print(f"[Worker {worker_id}] Rejected by the coordinator: {welcome['error']}")
+        return 0
+    lemma_name = welcome["lemma"]
+    heartbeat_seconds = welcome["heartbeat"]
+    workspace = WORKSPACES_DIR / lemma_name / f"remote_{worker_id}"
+    print(f"[Worker {worker_id}] Proving {lemma_name} for {host}:{port}")
+
+    proved = 0
+    while True:
+        try:
+            job = call("lease")
+        except (ConnectionError, OSError):
+            print(f"[Worker {worker_id}] Coordinator unreachable, exiting")
+            break
+        if job is None:
+            time.sleep(POLL_SECONDS)
+            continue
+        if job.get("shutdown"):
+            break
+
+        set_prechecked(job["prechecked"])
+        stop = threading.Event()
+
+        def beat(job_id: int = job["id"]) -> None:
+            # separate proxy: ServerProxy objects must not be shared between threads
+            beat_proxy = xmlrpc.client.ServerProxy(f"http://{host}:{port}/", allow_none=True)
+            while not stop.wait(heartbeat_seconds):
+                try:
+                    beat_proxy.heartbeat(token, worker_id, job_id)
+                except (ConnectionError, OSError):
+                    pass
+
+        heartbeat = threading.Thread(target=beat, daemon=True)
+        heartbeat.start()
+        start = time.time()
+        try:
+            verdict = prove_leak_set(frozenset(job["leaks"]), lemma_name, workspace, job["tier"])
+        finally:
+            stop.set()
+            heartbeat.join()
+        try:
+            call("complete", job["id"], verdict.value, time.time() - start)
+        except (ConnectionError, OSError):
+            print(f"[Worker {worker_id}] Coordinator unreachable, exiting")
+            break
+        proved += 1
+
+    print(f"[Worker {worker_id}] Done, {proved} leak set(s) proved")
+    return proved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prove leak sets for a coordinator started with main.py --coordinator")
+    parser.add_argument("--coordinator", required=True, metavar="HOST:PORT", help="Address of the coordinator")
+    parser.add_argument("--token", default="", help="Shared secret passed to main.py --token")
+    parser.add_argument("--slots", type=int, default=1,
+                        help="Workers to run in this process, each with its own workspace (default: 1)")
+    parser.add_argument("--id", default=None, help="Worker name shown by the coordinator (default: host-pid)")
+    args = parser.parse_args()
+
+    base_id = args.id or f"{socket.gethostname()}-{os.getpid()}"
+    if args.slots == 1:
+        run_worker(args.coordinator, args.token, base_id)
+    else:
+        with ThreadPoolExecutor(max_workers=args.slots) as executor:
+            list(executor.map(lambda slot: run_worker(args.coordinator, args.token, f"{base_id}-{slot}"),
+                              range(args.slots)))
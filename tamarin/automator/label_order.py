@@ -0,0 +1,155 @@
+"""Label ordering strategies for the enumerators: history frequency, observed proof cost, dynamic reordering."""
+
+import json
+import math
+from pathlib import Path
+from typing import FrozenSet, Iterable, Sequence
+
+from automator.min_cut_set import LabelOrder, bits_of
+from automator.seeds import seeds_from_report
+from automator.tamarin_utils import RESULTS_DIR
+from automator.verdict_cache import VerdictCache
+
+LABEL_ORDER_JSON = "json"
+LABEL_ORDER_FREQUENCY = "frequency"
+LABEL_ORDER_COST = "cost"
+LABEL_ORDER_DYNAMIC = "dynamic"
+LABEL_ORDERS = (LABEL_ORDER_JSON, LABEL_ORDER_FREQUENCY, LABEL_ORDER_COST, LABEL_ORDER_DYNAMIC)
+
+
+def minimal_antichain(sets: Iterable[FrozenSet[str]]) -> list[FrozenSet[str]]:
+    """The inclusion-minimal sets among `sets`, without duplicates."""
+    distinct = sorted(set(sets), key=len)
+    return [s for i, s in enumerate(distinct) if not any(t < s for t in distinct[:i])]
+
+
+def frequency_order(labels: Sequence[str], minimal_sets: Iterable[FrozenSet[str]]) -> list[str]:
+    """
+    Labels sorted by how many known minimal sets contain them, most frequent
+    first; ties keep the order of `labels`.
+    """
+    counts = {label: 0 for label in labels}
+    for s in minimal_sets:
+        for label in s:
+            if label in counts:
+                counts[label] += 1
+    return sorted(labels, key=lambda label: -counts[label])
+
+
+def cost_order(labels: Sequence[str], observations: Iterable[tuple[FrozenSet[str], float]]) -> list[str]:
+    """
+    Labels sorted by their observed effect on the proof time, cheapest first.
+
+    A label's cost is the mean log proof time of the observed sets that
+    contain it minus that of the sets that do not, so labels that appear
+    with expensive partners are not blamed for them as much as a plain mean
+    would. Labels never observed on both sides cost 0; ties keep the order
+    of `labels`.
+    """
+    sums = {label: [0.0, 0, 0.0, 0] for label in labels}
+    for leak_set, seconds in observations:
+        log_time = math.log(max(seconds, 1e-3))
+        for label, acc in sums.items():
+            if label in leak_set:
+                acc[0] += log_time
+                acc[1] += 1
+            else:
+                acc[2] += log_time
+                acc[3] += 1
+
+    def cost(label: str) -> float:
+        with_sum, with_n, without_sum, without_n = sums[label]
+        if not with_n or not without_n:
+            return 0.0
+        return with_sum / with_n - without_sum / without_n
+
+    return sorted(labels, key=cost)
+
+
+def dynamic_order(n: int) -> LabelOrder:
+    """
+    Reorder after every new minimal set: bit positions contained in the most
+    minimal sets found so far come first, ties keep the base order 0..n-1.
+    """
+    def order(minimal_masks: list[int]) -> list[int]:
+        counts = [0] * n
+        for m in minimal_masks:
+            for b in bits_of(m):
+                counts[b] += 1
+        return sorted(range(n), key=lambda b: -counts[b])
+
+    return order
+
+
+def previous_minimal_sets(
+    lemma_name: str,
+    leak_list: Sequence[str],
+    verdict_cache: VerdictCache | None = None,
+) -> list[FrozenSet[str]]:
+    """
+    Minimal sets known from earlier runs of a lemma: those of its summary
+    report and the smallest sets the verdict cache has seen falsify it.
+    """
+    found: list[FrozenSet[str]] = []
+    report = RESULTS_DIR / f"summary_{lemma_name}.txt"
+    if report.exists():
+        found.extend(seeds_from_report(report))
+    if verdict_cache is not None:
+        found.extend(verdict_cache.falsified_sets(lemma_name))
+    return minimal_antichain(s for s in found if s and s <= set(leak_list))
+
+
+def telemetry_observations(path: Path) -> list[tuple[FrozenSet[str], float]]:
+    """(leak set, wall time) of every prover call recorded in a telemetry JSONL file."""
+    observations = []
+    if not Path(path).exists():
+        return observations
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                # a run killed mid-write leaves a partial last line
+                continue
+            if event.get("event") == "call" and event.get("source") == "prover":
+                observations.append((frozenset(event["leaks"]), event["wall_time"]))
+    return observations
+
+
+def plan_label_order(
+    strategy: str,
+    lemma_name: str,
+    leak_list: Sequence[str],
+    verdict_cache: VerdictCache | None = None,
+    telemetry_path: Path | None = None,
+) -> tuple[list[str], LabelOrder | None]:
+    """
+    Resolve a strategy of LABEL_ORDERS for one lemma.
+
+    Args:
+        strategy: "json" (leak_rules.json order), "frequency" (labels of earlier
+            minimal sets first), "cost" (cheapest labels by telemetry first) or
+            "dynamic" (frequency, then reordered after every new minimal set)
+        lemma_name: Lemma whose history is used
+        leak_list: Leak names in leak_rules.json order
+        verdict_cache: Source of earlier falsifying sets, with the summary report
+        telemetry_path: Telemetry JSONL file with earlier prover calls of the lemma
+
+    Returns:
+        Tuple of (leak list in search order, label_order callback for the
+        enumerators or None for a static order)
+    """
+    if strategy not in LABEL_ORDERS:
+        raise ValueError(f"Unknown label order {strategy!r}, expected one of {list(LABEL_ORDERS)}")
+    labels = list(leak_list)
+    if strategy == LABEL_ORDER_COST:
+        observations = telemetry_observations(telemetry_path) if telemetry_path is not None else []
+        print(f"[Label order] {len(observations)} earlier prover call(s) in {telemetry_path}")
+        return cost_order(labels, observations), None
+    if strategy in (LABEL_ORDER_FREQUENCY, LABEL_ORDER_DYNAMIC):
+        history = previous_minimal_sets(lemma_name, labels, verdict_cache)
+        print(f"[Label order] {len(history)} minimal set(s) known from earlier runs")
+        labels = frequency_order(labels, history)
+        if strategy == LABEL_ORDER_DYNAMIC:
+            return labels, dynamic_order(len(labels))
+    return labels, None
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Callable, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
 RED = '\033[91m'
 GREEN = '\033[92m'
@@ -9,80 +9,230 @@ RESET = '\033[0m'
 
 
 Label = object  # can use str/int/etc.
-Predicate = Callable[[FrozenSet[Label]], bool]
+# True: falsifying set, False: the property holds, None: could not be decided
+Predicate = Callable[[FrozenSet[Label]], Optional[bool]]
+BatchPredicate = Callable[[Sequence[FrozenSet[Label]]], List[Optional[bool]]]
+InferenceCallback = Callable[[FrozenSet[Label], bool], None]
+FrontierCallback = Callable[[int, int], None]
+CheckpointCallback = Callable[[dict], None]
+# minimal masks found so far -> every bit position 0..n-1, in the order to explore them
+LabelOrder = Callable[[List[int]], List[int]]
 
+_inference_callback: Optional[InferenceCallback] = None
+_frontier_callback: Optional[FrontierCallback] = None
+_checkpoint_callback: Optional[CheckpointCallback] = None
 
-@dataclass
-class Node:
-    """A tiny trie node for storing seen minimal sets (as sorted tuples)."""
-    children: dict
-    terminal: bool = False
 
-    def __init__(self) -> None:
-        self.children = {}
-        self.terminal = False
+def set_inference_callback(callback: Optional[InferenceCallback]) -> None:
+    """Set a function called with (set, answer) whenever monotonicity answers a query."""
+    global _inference_callback
+    _inference_callback = callback
 
 
-class SetTrie:
+def set_frontier_callback(callback: Optional[FrontierCallback]) -> None:
+    """
+    Set a function called with (size, candidates) before a level-wise or
+    iterative-deepening search evaluates the candidates of one size.
     """
-    Trie over sorted label tuples.
+    global _frontier_callback
+    _frontier_callback = callback
+
+
+def set_checkpoint_callback(callback: Optional[CheckpointCallback]) -> None:
+    """
+    Set a function called with the search state (a JSON-serialisable dict of
+    label masks) whenever an enumerator reaches a point it can resume from:
+    before each depth of the DFS, before each level of the level-wise search
+    and after each MARCO seed. Passing that dict back as `resume` continues
+    the search from there.
+    """
+    global _checkpoint_callback
+    _checkpoint_callback = callback
+
+
+class LabelIndex:
+    """
+    Bit positions for a fixed-order label list.
+
+    Leak sets are handled as integer bitmasks (bit i <=> L[i]) throughout the
+    search; frozensets are only built at the predicate boundary and memoised.
+    """
+    def __init__(self, L: Sequence[Label]) -> None:
+        self.labels = list(L)
+        self.n = len(self.labels)
+        self.bit = {lab: 1 << i for i, lab in enumerate(self.labels)}
+        self.full = (1 << self.n) - 1
+        self._sets: dict = {}
+
+    def mask(self, S: Iterable[Label]) -> int:
+        m = 0
+        for x in S:
+            m |= self.bit[x]
+        return m
+
+    def to_set(self, m: int) -> FrozenSet[Label]:
+        s = self._sets.get(m)
+        if s is None:
+            s = frozenset(self.labels[i] for i in bits_of(m))
+            self._sets[m] = s
+        return s
+
+
+def bits_of(m: int) -> List[int]:
+    """Bit positions set in m, in increasing order."""
+    out = []
+    while m:
+        low = m & -m
+        out.append(low.bit_length() - 1)
+        m ^= low
+    return out
+
+
+class MaskIndex:
+    """
+    Bitset index of label masks, bucketed by popcount.
     Supports:
-      - insert(s)
-      - contains(s)
-      - has_subset_of(s): True iff some inserted set t is a subset of s.
+      - insert(m)
+      - contains(m)
+      - has_subset_of(m): True iff some inserted t has t ⊆ m (t & m == t),
+        scanning only buckets with popcount <= popcount(m)
+      - has_superset_of(m): True iff some inserted t has m ⊆ t,
+        scanning only buckets with popcount >= popcount(m)
+    queries counts subset/superset tests for benchmarking.
     """
     def __init__(self) -> None:
-        self.root = Node()
-
-    @staticmethod
-    def _as_tuple(s: FrozenSet[Label], order_index: dict) -> Tuple[Label, ...]:
-        return tuple(sorted(s, key=lambda x: order_index[x]))
-
-    def insert(self, s: FrozenSet[Label], order_index: dict) -> None:
-        t = self._as_tuple(s, order_index)
-        cur = self.root
-        for x in t:
-            cur = cur.children.setdefault(x, Node())
-        cur.terminal = True
-
-    def contains(self, s: FrozenSet[Label], order_index: dict) -> bool:
-        t = self._as_tuple(s, order_index)
-        cur = self.root
-        for x in t:
-            nxt = cur.children.get(x)
-            if nxt is None:
-                return False
-            cur = nxt
-        return cur.terminal
-
-    def has_subset_of(self, s: FrozenSet[Label], order_index: dict) -> bool:
-        """
-        Returns True if there exists an inserted set t such that t ⊆ s.
-        Because trie edges are ordered, we can walk s's ordered tuple and
-        choose to match or skip elements (subsequence test).
-        """
-        seq = self._as_tuple(s, order_index)
-
-        def dfs(node: Node, i: int) -> bool:
-            if node.terminal:
-                return True
-            if i >= len(seq):
-                return False
-            if dfs(node, i + 1):
-                return True
-            child = node.children.get(seq[i])
-            if child is not None and dfs(child, i + 1):
-                return True
-            return False
+        self.buckets: dict = {}
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self.buckets.values())
+
+    def __iter__(self):
+        for k in sorted(self.buckets):
+            yield from self.buckets[k]
+
+    def insert(self, m: int) -> None:
+        self.buckets.setdefault(m.bit_count(), set()).add(m)
+
+    def contains(self, m: int) -> bool:
+        return m in self.buckets.get(m.bit_count(), ())
+
+    def has_subset_of(self, m: int) -> bool:
+        self.queries += 1
+        size = m.bit_count()
+        for k, bucket in self.buckets.items():
+            if k <= size:
+                for t in bucket:
+                    if t & m == t:
+                        return True
+        return False
+
+    def has_superset_of(self, m: int) -> bool:
+        self.queries += 1
+        size = m.bit_count()
+        for k, bucket in self.buckets.items():
+            if k >= size:
+                for t in bucket:
+                    if t & m == m:
+                        return True
+        return False
+
+    def discard_supersets_of(self, m: int) -> None:
+        """Remove every t ⊋ m, keeping the index an antichain of minimal masks."""
+        size = m.bit_count()
+        for k, bucket in self.buckets.items():
+            if k > size:
+                bucket.difference_update([t for t in bucket if t & m == m])
+
+    def discard_subsets_of(self, m: int) -> None:
+        """Remove every t ⊊ m, keeping the index an antichain of maximal masks."""
+        size = m.bit_count()
+        for k, bucket in self.buckets.items():
+            if k < size:
+                bucket.difference_update([t for t in bucket if t & m == t])
 
-        return dfs(self.root, 0)
 
+@dataclass
+class SearchStats:
+    """Counters filled in by the enumerators."""
+    oracle_calls: int = 0
+    inferred_calls: int = 0
+    shrinks: int = 0
+    shrink_oracle_calls: int = 0
+    index_queries: int = 0  # subset/superset tests and frontier lookups, set when a search returns
 
-def shrink_to_minimal(
-    S: FrozenSet[Label],
-    P: Predicate,
-    shrink_callback: Optional[Callable[[str, FrozenSet[Label], FrozenSet[Label] | None], None]] = None
-) -> FrozenSet[Label]:
+
+class ImplicationOracle:
+    """
+    Monotonicity-aware front end for a predicate, queried with label masks.
+
+    Keeps an up-closed store of masks with P(S) == True (the property is
+    falsified, so every superset is too) and a down-closed store of masks with
+    P(S) == False (verified, so every subset is too). Both are kept as
+    antichains. Queries implied by either store are answered without calling
+    the underlying predicate.
+
+    A predicate answer of None (undecided) implies nothing about other masks,
+    so it is kept out of both stores. Such masks are collected in `undecided`
+    and answered with None again instead of calling the predicate twice; a
+    mask answered by monotonicity in the meantime gets the implied verdict.
+    """
+    def __init__(self, P: Predicate, index: LabelIndex, stats: Optional[SearchStats] = None) -> None:
+        self.P = P
+        self.index = index
+        self.stats = stats if stats is not None else SearchStats()
+        self.falsified = MaskIndex()
+        self.verified = MaskIndex()
+        self.undecided: set = set()
+
+    def implied(self, m: int) -> Optional[bool]:
+        """Answer implied by earlier verdicts, or None if P must be called."""
+        if self.falsified.has_subset_of(m):
+            return True
+        if self.verified.has_superset_of(m):
+            return False
+        return None
+
+    def state(self) -> dict:
+        """The implication stores as lists of masks, for checkpoints."""
+        return {"falsified": list(self.falsified), "verified": list(self.verified)}
+
+    def restore(self, state: dict) -> None:
+        for m in state["falsified"]:
+            self.falsified.insert(m)
+        for m in state["verified"]:
+            self.verified.insert(m)
+
+    def record(self, m: int, res: Optional[bool]) -> None:
+        if res is None:
+            self.undecided.add(m)
+        elif res:
+            self.falsified.discard_supersets_of(m)
+            self.falsified.insert(m)
+        else:
+            self.verified.discard_subsets_of(m)
+            self.verified.insert(m)
+
+    def __call__(self, m: int) -> Optional[bool]:
+        res = self.implied(m)
+        if res is not None:
+            self.stats.inferred_calls += 1
+            if _inference_callback is not None:
+                _inference_callback(self.index.to_set(m), res)
+            return res
+        if m in self.undecided:
+            return None
+        res = self.P(self.index.to_set(m))
+        self.stats.oracle_calls += 1
+        self.record(m, res)
+        return res
+
+
+ShrinkCallback = Callable[[str, FrozenSet[Label], FrozenSet[Label] | None], None]
+MaskPredicate = Callable[[int], Optional[bool]]
+
+
+def shrink_to_minimal(S: int, P: MaskPredicate) -> int:
     """
     SHRINKTOMINIMAL(S, P(.)):
       M <- S
@@ -90,26 +240,157 @@ def shrink_to_minimal(
         M' <- M \\ {x}
         if P(M') then M <- M'
       return M
+
+    Works on label masks and removes labels in bit order. Costs |S| predicate calls.
+    A label whose removal leaves an undecided set (P == None) is kept, so the
+    result is only minimal among the decided subsets.
     """
-    if shrink_callback:
-        shrink_callback("start", S, None)
-    
-    M = set(S)
-    # iterate over a snapshot of S (original pseudocode does "for all x in S")
-    for x in S:
-        M2 = frozenset(M - {x})
+    M = S
+    for b in bits_of(S):
+        M2 = M & ~(1 << b)
         if P(M2):
-            M.remove(x)
-    M_final = frozenset(M)
-    if shrink_callback:
-        shrink_callback("done", S, M_final)
-    return M_final
+            M = M2
+    return M
+
+
+def shrink_quickxplain(S: int, P: MaskPredicate) -> int:
+    """
+    QuickXplain (Junker, 2004) for a monotone predicate with P(S) == True:
+      QX(B, Δ, C):
+        if Δ ≠ ∅ and P(B) then return ∅
+        if |C| == 1 then return C
+        split C into C1, C2
+        X2 <- QX(B ∪ C1, C1, C2)
+        X1 <- QX(B ∪ X2, X2, C1)
+        return X1 ∪ X2
+
+    Works on label masks. Returns a minimal subset of S using
+    O(k log(|S|/k)) predicate calls, where k is the size of the result.
+    Undecided sets (P == None) are treated as not satisfying P.
+    """
+    def qx(B: int, has_delta: bool, C: List[int]) -> int:
+        if has_delta and P(B):
+            return 0
+        if len(C) == 1:
+            return 1 << C[0]
+        k = len(C) // 2
+        C1, C2 = C[:k], C[k:]
+        C1_mask = sum(1 << b for b in C1)
+        X2 = qx(B | C1_mask, True, C2)
+        X1 = qx(B | X2, X2 != 0, C1)
+        return X1 | X2
+
+    C = bits_of(S)
+    if not C or P(0):
+        return 0
+    return qx(0, False, C)
+
+
+SHRINK_STRATEGIES = {
+    "linear": shrink_to_minimal,
+    "quickxplain": shrink_quickxplain,
+}
+
+
+def _make_shrinker(
+    shrink_strategy: str,
+    oracle: ImplicationOracle,
+    shrink_callback: Optional[ShrinkCallback],
+) -> Callable[[int], int]:
+    """
+    Wrap a shrink strategy with callback reporting and shrink call accounting.
+
+    Undecided sets break the monotonicity a strategy other than the linear one
+    relies on, so if the shrink met one its result is finished with a linear
+    pass, which keeps it minimal among the decided subsets.
+    """
+    if shrink_strategy not in SHRINK_STRATEGIES:
+        raise ValueError(f"Unknown shrink strategy {shrink_strategy!r}, expected one of {sorted(SHRINK_STRATEGIES)}")
+    strategy = SHRINK_STRATEGIES[shrink_strategy]
+    stats = oracle.stats
+    index = oracle.index
+
+    def shrink(S: int) -> int:
+        if shrink_callback:
+            shrink_callback("start", index.to_set(S), None)
+        calls_before = stats.oracle_calls
+        met_undecided = False
+
+        def P(m: int) -> Optional[bool]:
+            nonlocal met_undecided
+            res = oracle(m)
+            if res is None:
+                met_undecided = True
+            return res
+
+        M = strategy(S, P)
+        if met_undecided and strategy is not shrink_to_minimal:
+            M = shrink_to_minimal(M, oracle)
+        stats.shrinks += 1
+        stats.shrink_oracle_calls += stats.oracle_calls - calls_before
+        if shrink_callback:
+            shrink_callback("done", index.to_set(S), index.to_set(M))
+        return M
+
+    return shrink
+
+
+def confirm_seeds(
+    seeds: Sequence[FrozenSet[Label]],
+    oracle: ImplicationOracle,
+    shrink: Callable[[int], int],
+) -> List[int]:
+    """
+    Confirm candidate minimal sets from earlier runs or hand-written leak files.
+
+    Seeds are tried smallest first. Each one costs a single call to P, plus a
+    shrink as the minimality check: a seed that no longer satisfies P is
+    dropped, and one that is not minimal any more (e.g. after a model edit)
+    is reduced to a minimal subset. An undecided seed is dropped as well. Seeds naming labels outside L and seeds
+    containing an already confirmed set are skipped without any call.
+
+    Returns:
+        Masks of the confirmed minimal sets, an antichain
+    """
+    index = oracle.index
+    confirmed = MaskIndex()
+    for seed in sorted(seeds, key=lambda s: (len(s), sorted(map(str, s)))):
+        name = ", ".join(sorted(map(str, seed))) or "(empty)"
+        if any(x not in index.bit for x in seed):
+            print(f"[Seeds] Skipping {{{name}}}: not a subset of the analysed labels")
+            continue
+        S = index.mask(seed)
+        if confirmed.has_subset_of(S):
+            continue
+        res = oracle(S)
+        if res is None:
+            print(f"[Seeds] {{{name}}} could not be decided - dropped")
+            continue
+        if not res:
+            print(f"{GREEN}[Seeds] {{{name}}} no longer satisfies the predicate - dropped{RESET}")
+            continue
+        M = shrink(S)
+        if confirmed.has_subset_of(M):
+            continue
+        confirmed.discard_supersets_of(M)
+        confirmed.insert(M)
+        if M == S:
+            print(f"{RED}[Seeds] {{{name}}} confirmed minimal{RESET}")
+        else:
+            print(f"{RED}[Seeds] {{{name}}} shrunk to {{{', '.join(sorted(map(str, index.to_set(M))))}}}{RESET}")
+    return list(confirmed)
 
 
 def enumerate_minimal_satisfying_cutsets(
     L: Sequence[Label],
     P: Predicate,
-    shrink_callback: Optional[Callable[[str, FrozenSet[Label], FrozenSet[Label] | None], None]] = None,
+    shrink_callback: Optional[ShrinkCallback] = None,
+    batch_predicate: Optional[BatchPredicate] = None,
+    stats: Optional[SearchStats] = None,
+    shrink_strategy: str = "linear",
+    seeds: Sequence[FrozenSet[Label]] = (),
+    resume: Optional[dict] = None,
+    label_order: Optional[LabelOrder] = None,
 ) -> List[FrozenSet[Label]]:
     """
     Algorithm 1: Minimal Satisfying Cut-set Enumeration for a Monotone Predicate
@@ -117,49 +398,519 @@ def enumerate_minimal_satisfying_cutsets(
     Input:
       - fixed-order indexable label set L = [l1, ..., ln]
       - monotone predicate P over sets of labels
+      - optional batch_predicate evaluating many sets at once (e.g. a worker pool);
+        before each depth pass, the children of every verified set found at the
+        previous depth (the whole frontier of the new size) are submitted in one
+        batch, and the DFS then consumes the prefetched answers in its usual order
+      - optional stats object receiving oracle call counts
+      - shrink_strategy: key of SHRINK_STRATEGIES used to minimise falsifying sets.
+        Iterative deepening decides every proper subset of a set before reaching
+        it, so here shrinking is answered by the ImplicationOracle and the
+        strategy does not change the number of calls to P; it matters for
+        enumerate_marco
+      - optional seeds: sets believed to be minimal cut-sets (see confirm_seeds);
+        confirmed seeds are reported and every superset is pruned from the
+        search before it starts
+      - optional resume: a state passed to the checkpoint callback (see
+        set_checkpoint_callback); the search restarts the depth it was in,
+        with the minimal sets and the implication stores of that moment, so
+        sets decided before the checkpoint are not passed to P again
+      - optional label_order: called with the minimal sets found so far before
+        each depth pass, returns the order in which that pass extends sets
+        with labels (default: the order of L). Every pass enumerates all sets
+        of its size, so reordering between passes keeps the search complete
+
+    Sets are label bitmasks internally (see LabelIndex); every query goes
+    through an ImplicationOracle, so sets whose answer follows from
+    monotonicity are never passed to P.
+
+    An undecided set (P(s) is None) is not a cut-set, but it proves nothing
+    about its subsets or supersets either: its supersets are still explored,
+    and a cut-set found above it is only minimal among the decided sets.
 
     Output:
       - all minimal cut-sets s ⊆ L such that P(s) == True
     """
-    order_index = {lab: i for i, lab in enumerate(L)}  
+    index = LabelIndex(L)
+    oracle = ImplicationOracle(P, index, stats)
+    stats = oracle.stats
+    shrink = _make_shrinker(shrink_strategy, oracle, shrink_callback)
     result: List[FrozenSet[Label]] = []
-    seen = SetTrie()
-
-    print(f"\n[Initial check] Testing with all {len(L)} elements...")
-    if not P(frozenset(L)):
-        print(f"[Initial check] Entire set does not satisfy predicate - no solutions exist")
-        return result
-
-    print(f"[Initial check] Entire set satisfies predicate - proceeding with search\n")
-    n = len(L)
-
-    def DFS(S: FrozenSet[Label], nxtLblIdx: int, depth_limit: int) -> None:
+    seen = MaskIndex()
+    prefetched: dict = {}
+    n = index.n
+
+    def evaluate(S: int) -> bool:
+        if S in prefetched:
+            return prefetched.pop(S)
+        return oracle(S)
+
+    # position of each bit in the exploration order of the current pass
+    order = list(range(n))
+    position = list(range(n))
+
+    def children_of(frontier: List[int]) -> Iterable[int]:
+        for S in frontier:
+            start = max((position[b] + 1 for b in bits_of(S)), default=0)
+            for i in range(start, n):
+                yield S | (1 << order[i])
+
+    def prefetch(frontier: List[int]) -> None:
+        children = children_of(frontier)
+        pending = [
+            C for C in dict.fromkeys(children)
+            if C not in prefetched and not seen.has_subset_of(C)
+            and oracle.implied(C) is None and C not in oracle.undecided
+        ]
+        if len(pending) > 1:
+            verdicts = batch_predicate([index.to_set(C) for C in pending])
+            stats.oracle_calls += len(pending)
+            for C, res in zip(pending, verdicts):
+                oracle.record(C, res)
+                prefetched[C] = res
+
+    # verified sets of size depth_limit reached by the last DFS pass
+    frontier: List[int] = [0]
+    next_frontier: List[int] = []
+    start_depth = 1
+    result_masks: List[int] = []
+
+    if resume is not None:
+        oracle.restore(resume["oracle"])
+        for M in resume["result"]:
+            seen.insert(M)
+            result_masks.append(M)
+            result.append(index.to_set(M))
+        frontier = list(resume["frontier"])
+        start_depth = resume["depth"]
+        print(f"\n[Resume] Continuing at size {start_depth} with {len(result)} minimal set(s) found")
+    else:
+        print(f"\n[Initial check] Testing with all {len(L)} elements...")
+        full = oracle(index.full)
+        if full is False:
+            print(f"[Initial check] Entire set does not satisfy predicate - no solutions exist")
+            return result
+
+        if full is None:
+            print(f"[Initial check] Entire set could not be decided - searching anyway\n")
+        else:
+            print(f"[Initial check] Entire set satisfies predicate - proceeding with search\n")
+        for M in confirm_seeds(seeds, oracle, shrink):
+            seen.insert(M)
+            result_masks.append(M)
+            result.append(index.to_set(M))
+
+    def checkpoint(depth: int) -> None:
+        if _checkpoint_callback is not None:
+            _checkpoint_callback({
+                "search": "dfs",
+                "depth": depth,
+                "frontier": list(frontier),
+                "result": list(result_masks),
+                "oracle": oracle.state(),
+            })
+
+    def DFS(S: int, nxtLblIdx: int, size: int, depth_limit: int) -> None:
         
-        if seen.contains(S, order_index) or len(S) > depth_limit:
+        # supersets of a known minimal set cannot be minimal; skip them before
+        # any predicate call or shrink
+        if size > depth_limit or seen.has_subset_of(S):
             return
 
-        if P(S):
-            s_min = shrink_to_minimal(S, P, shrink_callback)
-            if not seen.has_subset_of(s_min, order_index):
-                seen.insert(s_min, order_index)
-                result.append(s_min)
+        if evaluate(S):
+            s_min = shrink(S)
+            if not seen.has_subset_of(s_min):
+                seen.insert(s_min)
+                result_masks.append(s_min)
+                result.append(index.to_set(s_min))
             return   
 
+        if size + 1 > depth_limit:
+            next_frontier.append(S)
+            return
         for i in range(nxtLblIdx, n):
-            if len(S) + 1 > depth_limit:
-                break
-            DFS(frozenset(set(S) | {L[i]}), i + 1, depth_limit)
+            DFS(S | (1 << order[i]), i + 1, size + 1, depth_limit)
 
     print(f"[Search] Exploring sets of increasing size (1 to {n})...\n")
-    for depth in range(1, n + 1):
-        DFS(frozenset(), 0, depth)
+    for depth in range(start_depth, n + 1):
+        checkpoint(depth)
+        if label_order is not None:
+            order = label_order(list(result_masks))
+            for i, b in enumerate(order):
+                position[b] = i
+        if _frontier_callback is not None:
+            children = dict.fromkeys(children_of(frontier))
+            _frontier_callback(depth, sum(
+                1 for C in children
+                if not seen.has_subset_of(C) and oracle.implied(C) is None and C not in oracle.undecided
+            ))
+        if batch_predicate is not None:
+            prefetch(frontier)
+        next_frontier.clear()
+        DFS(0, 0, 0, depth)
+        frontier = list(next_frontier)
+        prefetched.clear()
         if depth < n:
             print(f"[Search] Completed size {depth}, found {len(result)} minimal set(s) so far\n")
 
+    stats.index_queries += oracle.falsified.queries + oracle.verified.queries + seen.queries
     print(f"\n[Search] Complete - explored all sizes up to {n}")
+    print(f"[Search] {stats.oracle_calls} oracle call(s), {stats.inferred_calls} answered by monotonicity")
+    print(f"[Search] {shrink_strategy} shrinking: {stats.shrinks} shrink(s), {stats.shrink_oracle_calls} oracle call(s)")
     return result
 
 
+class LevelwiseSearch:
+    """
+    Breadth-first (Apriori-style) enumeration state over label masks.
+
+    Level k holds the candidate masks of size k. A candidate is generated
+    once, by extending a verified (P == False) mask of size k-1 with a label
+    above its highest bit, and is kept only if all of its (k-1)-subsets are
+    verified. Every subset of a candidate is therefore known not to satisfy
+    P, so a candidate with P == True is a minimal set without any shrinking,
+    and anything containing a satisfying set is never generated.
+
+    Undecided masks (P is None) are extended like verified ones, so the
+    search still reaches the sets above them, but they are kept in
+    `undecided` and never counted as minimal; a set found above one of them
+    is only minimal among the decided sets.
+
+    Only the verified frontier of the current level is kept in memory. The
+    caller drives the search:
+        while not search.done:
+            search.record({m: P(m) for m in search.candidates})
+    """
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.level = 0
+        self.candidates: List[int] = [0]
+        self.minimal: List[int] = []
+        self.undecided: List[int] = []
+        self.visited = 0
+        self.lookups = 0
+
+    @property
+    def done(self) -> bool:
+        return not self.candidates
+
+    def record(self, verdicts: dict) -> List[int]:
+        """
+        Record verdicts for every current candidate and advance one level.
+
+        Returns:
+            The candidates of this level that satisfy P (new minimal sets)
+        """
+        found = [m for m in self.candidates if verdicts[m]]
+        not_found = [m for m in self.candidates if not verdicts[m]]
+        self.visited += len(self.candidates)
+        self.minimal.extend(found)
+        self.undecided.extend(m for m in not_found if verdicts[m] is None)
+        self.candidates = self._join(not_found)
+        self.level += 1
+        return found
+
+    def _join(self, frontier: List[int]) -> List[int]:
+        frontier_set = set(frontier)
+        out = []
+        for f in frontier:
+            for j in range(f.bit_length(), self.n):
+                c = f | (1 << j)
+                for b in bits_of(f):
+                    self.lookups += 1
+                    if c & ~(1 << b) not in frontier_set:
+                        break
+                else:
+                    out.append(c)
+        return out
+
+
+def enumerate_levelwise(
+    L: Sequence[Label],
+    P: Predicate,
+    batch_predicate: Optional[BatchPredicate] = None,
+    stats: Optional[SearchStats] = None,
+    seeds: Sequence[FrozenSet[Label]] = (),
+    resume: Optional[dict] = None,
+) -> List[FrozenSet[Label]]:
+    """
+    Level-wise minimal satisfying cut-set enumeration for a monotone predicate.
+
+    Evaluates each candidate of LevelwiseSearch exactly once, smallest sets
+    first. With a batch_predicate, every level is submitted as one batch.
+    No shrinking is needed: candidates that satisfy P are minimal.
+
+    Seeds (see confirm_seeds) are confirmed with a linear shrink before the
+    search; a confirmed seed is then answered by monotonicity when its level
+    is reached, and its supersets are never generated.
+
+    A checkpoint taken before a level (see set_checkpoint_callback) holds the
+    candidates of that level; passing it as resume proves that level again,
+    answering the candidates already decided from the implication stores.
+
+    Output:
+      - all minimal cut-sets s ⊆ L such that P(s) == True, in order of size
+    """
+    index = LabelIndex(L)
+    oracle = ImplicationOracle(P, index, stats)
+    stats = oracle.stats
+    n = index.n
+
+    search = LevelwiseSearch(n)
+    if resume is not None:
+        oracle.restore(resume["oracle"])
+        search.level = resume["level"]
+        search.candidates = list(resume["candidates"])
+        search.minimal = list(resume["minimal"])
+        search.visited = resume["visited"]
+        print(f"\n[Resume] Continuing at size {search.level} with {len(search.minimal)} minimal set(s) found")
+    else:
+        print(f"\n[Initial check] Testing with all {len(L)} elements...")
+        full = oracle(index.full)
+        if full is False:
+            print(f"[Initial check] Entire set does not satisfy predicate - no solutions exist")
+            return []
+        if full is None:
+            print(f"[Initial check] Entire set could not be decided - searching anyway\n")
+        else:
+            print(f"[Initial check] Entire set satisfies predicate - proceeding with search\n")
+        if seeds:
+            confirm_seeds(seeds, oracle, _make_shrinker("linear", oracle, None))
+
+    print(f"[Search] Exploring sets level by level (0 to {n})...\n")
+    while not search.done:
+        if _checkpoint_callback is not None:
+            _checkpoint_callback({
+                "search": "levelwise",
+                "level": search.level,
+                "candidates": list(search.candidates),
+                "minimal": list(search.minimal),
+                "visited": search.visited,
+                "oracle": oracle.state(),
+            })
+        if _frontier_callback is not None:
+            _frontier_callback(search.level, len(search.candidates))
+        # every subset of a candidate is verified and no superset has been
+        # evaluated, so monotonicity never answers a candidate here unless
+        # seeds were confirmed first or the level is resumed
+        verdicts = evaluate_masks(search.candidates, oracle, batch_predicate,
+                                  infer=bool(seeds) or resume is not None)
+        found = search.record(verdicts)
+        print(f"[Search] Completed size {search.level - 1}: {len(verdicts)} candidate(s), "
+              f"{len(found)} new minimal set(s), {len(search.minimal)} so far\n")
+
+    stats.index_queries += oracle.falsified.queries + oracle.verified.queries + search.lookups
+    print(f"\n[Search] Complete - visited {search.visited} candidate(s)")
+    print(f"[Search] {stats.oracle_calls} oracle call(s), {stats.inferred_calls} answered by monotonicity")
+    return [index.to_set(m) for m in search.minimal]
+
+
+def evaluate_masks(
+    masks: List[int],
+    oracle: ImplicationOracle,
+    batch_predicate: Optional[BatchPredicate] = None,
+    infer: bool = True,
+) -> dict:
+    """
+    Evaluate many masks through an ImplicationOracle, sending the ones it
+    cannot infer to batch_predicate in one call when one is given.
+
+    With infer=False the implication stores are neither queried nor updated,
+    for callers that already know no answer can be implied.
+    """
+    if not infer:
+        index = oracle.index
+        if batch_predicate is not None and len(masks) > 1:
+            results = batch_predicate([index.to_set(m) for m in masks])
+        else:
+            results = [oracle.P(index.to_set(m)) for m in masks]
+        oracle.stats.oracle_calls += len(masks)
+        return dict(zip(masks, results))
+
+    verdicts = {}
+    pending = []
+    for m in masks:
+        res = oracle.implied(m)
+        if res is None and m in oracle.undecided:
+            verdicts[m] = None
+        elif res is None:
+            pending.append(m)
+        else:
+            oracle.stats.inferred_calls += 1
+            if _inference_callback is not None:
+                _inference_callback(oracle.index.to_set(m), res)
+            verdicts[m] = res
+    if batch_predicate is not None and len(pending) > 1:
+        results = batch_predicate([oracle.index.to_set(m) for m in pending])
+        oracle.stats.oracle_calls += len(pending)
+        for m, res in zip(pending, results):
+            oracle.record(m, res)
+            verdicts[m] = res
+    else:
+        for m in pending:
+            verdicts[m] = oracle(m)
+    return verdicts
+
+
+def next_unexplored_seed(
+    n: int,
+    minimal_masks: List[int],
+    maximal_masks: List[int],
+    order: Optional[Sequence[int]] = None,
+    excluded: Iterable[int] = (),
+) -> Optional[int]:
+    """
+    Hitting-set seed generator over label bit positions 0..n-1.
+
+    Finds a mask S that is unexplored, i.e.
+      - S ⊉ M for every known minimal satisfying set M (S misses an element of M)
+      - S ⊈ V for every known maximal unsatisfying set V (S hits the complement of V)
+    Labels are tried "include" first in bit order (or in the given order of
+    bit positions), so the first mask found is inclusion-maximal among
+    unexplored masks. Labels outside every known
+    minimal set are always included, so only the bits of those sets are
+    branched on. Returns None once the two antichains cover the whole lattice.
+
+    Masks in `excluded` are never returned, but block nothing else: their
+    bits are branched on as well, so their subsets can still be seeds.
+    """
+    full = (1 << n) - 1
+    complements = [full & ~V for V in maximal_masks]
+    if any(c == 0 for c in complements) or any(M == 0 for M in minimal_masks):
+        return None
+    excluded = set(excluded)
+    used = 0
+    for M in minimal_masks:
+        used |= M
+    for X in excluded:
+        used |= X
+    branch_bits = bits_of(used)
+    if order is not None:
+        rank = {b: i for i, b in enumerate(order)}
+        branch_bits.sort(key=rank.__getitem__)
+    by_bit_min = {b: [M for M in minimal_masks if M >> b & 1] for b in branch_bits}
+    by_bit_comp = {b: [c for c in complements if c >> b & 1] for b in branch_bits}
+
+    def search(k: int, inc: int, exc: int) -> Optional[int]:
+        if k == len(branch_bits):
+            return None if inc in excluded else inc
+        b = branch_bits[k]
+        bit = 1 << b
+        inc2 = inc | bit
+        # including b must not complete a known minimal satisfying set
+        if all(M & ~inc2 for M in by_bit_min[b]):
+            res = search(k + 1, inc2, exc)
+            if res is not None:
+                return res
+        exc2 = exc | bit
+        # excluding b must leave every complement hittable
+        if all(c & ~exc2 for c in by_bit_comp[b]):
+            return search(k + 1, inc, exc2)
+        return None
+
+    return search(0, full & ~used, 0)
+
+
+def enumerate_marco(
+    L: Sequence[Label],
+    P: Predicate,
+    shrink_callback: Optional[ShrinkCallback] = None,
+    stats: Optional[SearchStats] = None,
+    shrink_strategy: str = "quickxplain",
+    seeds: Sequence[FrozenSet[Label]] = (),
+    resume: Optional[dict] = None,
+    label_order: Optional[LabelOrder] = None,
+) -> Tuple[List[FrozenSet[Label]], List[FrozenSet[Label]]]:
+    """
+    MARCO-style dual enumeration for a monotone predicate.
+
+    Repeatedly asks next_unexplored_seed for a maximal unexplored set S:
+      - if P(S): shrink S to a minimal satisfying set (MUS analogue) and block
+        all its supersets
+      - if not P(S): S is a maximal unsatisfying set (MSS analogue), because
+        every proper superset is explored and therefore contains a known
+        minimal satisfying set; block all its subsets
+      - if P(S) is None (undecided): only S itself is excluded from later
+        seeds; it joins neither antichain and blocks nothing, so its subsets
+        are still explored
+    The search stops as soon as the two antichains cover the lattice, which
+    also proves that no minimal cut-set was missed, unless some seeds stayed
+    undecided: such a seed may itself be, or contain, a minimal cut-set, and
+    a set shrunk past it is only minimal among the decided sets. Confirmed seeds (see
+    confirm_seeds) start the minimal antichain, so their supersets are never
+    offered as seeds. A checkpoint (see set_checkpoint_callback) holds both
+    antichains, so a resumed search picks the next seed where it stopped.
+    An optional label_order is called with the minimal sets found so far
+    before every seed and decides which labels the seed generator keeps first.
+
+    Output:
+      - (all minimal cut-sets s with P(s) == True,
+         all maximal sets s with P(s) == False)
+        Undecided seeds are left to the caller's predicate to report.
+    """
+    index = LabelIndex(L)
+    oracle = ImplicationOracle(P, index, stats)
+    stats = oracle.stats
+    shrink = _make_shrinker(shrink_strategy, oracle, shrink_callback)
+    n = index.n
+
+    minimal: List[FrozenSet[Label]] = []
+    maximal: List[FrozenSet[Label]] = []
+    minimal_masks: List[int] = []
+    maximal_masks: List[int] = []
+    undecided_masks: List[int] = []
+
+    if resume is not None:
+        oracle.restore(resume["oracle"])
+        minimal_masks.extend(resume["minimal"])
+        maximal_masks.extend(resume["maximal"])
+        minimal.extend(index.to_set(m) for m in minimal_masks)
+        maximal.extend(index.to_set(m) for m in maximal_masks)
+        print(f"\n[Resume] Continuing with {len(minimal)} minimal / {len(maximal)} maximal set(s) found")
+    else:
+        for M in confirm_seeds(seeds, oracle, shrink):
+            minimal.append(index.to_set(M))
+            minimal_masks.append(M)
+
+    print(f"\n[Search] MARCO dual enumeration over {n} labels...\n")
+    while True:
+        order = label_order(list(minimal_masks)) if label_order is not None else None
+        seed = next_unexplored_seed(n, minimal_masks, maximal_masks, order, undecided_masks)
+        if seed is None:
+            break
+        res = oracle(seed)
+        if res is None:
+            undecided_masks.append(seed)
+        elif res:
+            s_min = shrink(seed)
+            if any(M & s_min == s_min for M in minimal_masks):
+                # an earlier set shrunk past an undecided one is not minimal after all
+                minimal_masks[:] = [M for M in minimal_masks if M & s_min != s_min]
+                minimal[:] = [index.to_set(M) for M in minimal_masks]
+            minimal.append(index.to_set(s_min))
+            minimal_masks.append(s_min)
+        else:
+            maximal.append(index.to_set(seed))
+            maximal_masks.append(seed)
+        if _checkpoint_callback is not None:
+            _checkpoint_callback({
+                "search": "marco",
+                "minimal": list(minimal_masks),
+                "maximal": list(maximal_masks),
+                "oracle": oracle.state(),
+            })
+        undecided_text = f" / {len(undecided_masks)} undecided" if undecided_masks else ""
+        print(f"[Search] {len(minimal)} minimal falsifying / {len(maximal)} maximal verified{undecided_text} set(s) so far\n")
+
+    stats.index_queries += oracle.falsified.queries + oracle.verified.queries
+    print(f"\n[Search] Complete - the lattice is covered by {len(minimal)} minimal and {len(maximal)} maximal set(s)")
+    if undecided_masks:
+        print(f"[Search] {len(undecided_masks)} seed(s) could not be decided - minimal sets among them may be missing")
+    print(f"[Search] {stats.oracle_calls} oracle call(s), {stats.inferred_calls} answered by monotonicity")
+    print(f"[Search] {shrink_strategy} shrinking: {stats.shrinks} shrink(s), {stats.shrink_oracle_calls} oracle call(s)")
+    return minimal, maximal
+
+
 if __name__ == "__main__":
     L = ["a", "b", "c", "d", "e"]
 
@@ -0,0 +1,111 @@
+"""Per-rule fingerprints of main.spthy, scoped to the leak sets and lemmas each rule can affect."""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import FrozenSet
+
+from automator.tamarin_utils import MAIN_SPTHY_PATH
+
+_ITEM_RE = re.compile(r'^(rule|restriction|lemma)\s+(\w+)', re.MULTILINE)
+_GATE_RE = re.compile(r'Leak_(\w+)_Allowed\s*\(')
+_SHARED_LEMMA_RE = re.compile(r'\[[^\]]*\b(reuse|sources|use_induction)\b[^\]]*\]')
+
+
+@dataclass(frozen=True)
+class ModelItem:
+    """
+    One top-level item of the model and the verdicts it can affect.
+
+    kind is "header" (builtins, functions and anything before the first
+    item), "rule", "restriction" or "lemma". A rule whose premises consume
+    Leak_<X>_Allowed() facts can only fire in theories enabling every such X,
+    so it is gated by those leaks. A lemma only affects its own verdicts,
+    unless it is a reuse/sources lemma that other proofs build on.
+    """
+    kind: str
+    name: str
+    digest: str
+    gates: FrozenSet[str] = field(default_factory=frozenset)
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind} {self.name}"
+
+    @property
+    def scope(self) -> str:
+        """Human-readable description of the verdicts this item can affect."""
+        if self.kind == "lemma":
+            return f"lemma {self.name} only"
+        if self.gates:
+            return f"sets enabling {', '.join(sorted(self.gates))}"
+        return "every leak set"
+
+
+def _normalise(text: str) -> str:
+    """Drop comments and collapse whitespace so formatting-only edits keep the digest."""
+    text = re.sub(r'/\*.*?\*/', ' ', text, flags=re.DOTALL)
+    text = re.sub(r'//[^\n]*', ' ', text)
+    return " ".join(text.split())
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def parse_model(content: str, leak_names: set[str]) -> dict[str, ModelItem]:
+    """
+    Split a theory into its header, rules, restrictions and lemmas.
+
+    The theory name, begin/end and #include lines are ignored, since they are
+    rewritten for every candidate. Gates naming a leak outside leak_names are
+    not trusted and leave the rule ungated.
+
+    Args:
+        content: Text of main.spthy
+        leak_names: Leak names of leak_rules.json
+
+    Returns:
+        Dict mapping ModelItem.key to the item, in file order
+    """
+    content = re.sub(r'^theory\s+\S+', '', content, flags=re.MULTILINE)
+    content = re.sub(r'^#include\s+"[^"]+"', '', content, flags=re.MULTILINE)
+    content = re.sub(r'^(begin|end)\s*$', '', content, flags=re.MULTILINE)
+
+    matches = list(_ITEM_RE.finditer(content))
+    header_end = matches[0].start() if matches else len(content)
+    items = {"header main": ModelItem("header", "main", _digest(_normalise(content[:header_end])))}
+    for i, match in enumerate(matches):
+        kind, name = match.group(1), match.group(2)
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        text = _normalise(content[match.start():end])
+        gates: FrozenSet[str] = frozenset()
+        if kind == "rule":
+            premises = re.split(r'--\[|-->', text, maxsplit=1)[0]
+            found = frozenset(_GATE_RE.findall(premises))
+            if found and found <= leak_names:
+                gates = found
+        elif kind == "lemma" and _SHARED_LEMMA_RE.search(text.split(":", 1)[0]):
+            kind = "shared-lemma"
+        item = ModelItem(kind, name, _digest(text), gates)
+        items[item.key] = item
+    return items
+
+
+def load_model(leak_names: set[str], main_spthy_path: Path = MAIN_SPTHY_PATH) -> dict[str, ModelItem]:
+    """parse_model applied to main.spthy."""
+    with open(main_spthy_path, 'r') as f:
+        return parse_model(f.read(), leak_names)
+
+
+def scoped_digests(items: dict[str, ModelItem], lemma_name: str, leak_set: FrozenSet[str]) -> dict[str, str]:
+    """
+    Digests of the model items that can affect the verdict of one lemma on
+    one leak set: every ungated item, the rules gated by leaks of the set,
+    and the lemma itself (other plain lemmas are left out).
+    """
+    return {
+        key: item.digest for key, item in items.items()
+        if (item.kind != "lemma" or item.name == lemma_name) and item.gates <= leak_set
+    }
@@ -0,0 +1,67 @@
+"""Portfolio of tamarin-prover configurations raced per leak set, ordered by past wins."""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from automator.tamarin_utils import RESULTS_DIR
+
+PORTFOLIO_WINS_PATH = RESULTS_DIR / "portfolio_wins.json"
+
+# name -> flags overriding or extending the tier flags (see tamarin_utils.merge_flags)
+PORTFOLIO_CONFIGS: dict[str, list[str]] = {
+    "default": [],
+    "heuristic-C": ["--heuristic=C"],
+    "heuristic-I": ["--heuristic=I"],
+    "derivcheck-off": ["--derivcheck-timeout=0"],
+    "c-10": ["-c=10"],
+}
+
+
+class ProverPortfolio:
+    """
+    Prover configurations to race on every leak set, with per-lemma win counts.
+
+    Only the `width` configurations that won most often for a lemma are
+    raced, most successful first (ties keep the PORTFOLIO_CONFIGS order), so
+    the portfolio adapts to the configurations that decide a lemma quickly.
+    Win counts are saved to a JSON file after every win and reloaded on the
+    next run.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        configs: dict[str, list[str]] = PORTFOLIO_CONFIGS,
+        path: Path = PORTFOLIO_WINS_PATH,
+    ) -> None:
+        if not 1 <= width <= len(configs):
+            raise ValueError(f"portfolio width must be between 1 and {len(configs)}, got {width}")
+        self.width = width
+        self.configs = configs
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.wins: dict[str, dict[str, int]] = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.wins = json.load(f)
+
+    def ranked(self, lemma_name: str) -> list[tuple[str, list[str]]]:
+        """The configurations to race for a lemma, as (name, flags) pairs."""
+        order = list(self.configs)
+        with self._lock:
+            wins = dict(self.wins.get(lemma_name, {}))
+        order.sort(key=lambda name: -wins.get(name, 0))
+        return [(name, self.configs[name]) for name in order[:self.width]]
+
+    def record_win(self, lemma_name: str, config: str) -> None:
+        """Count a win and persist the counts (written to a temporary file, then renamed)."""
+        with self._lock:
+            lemma_wins = self.wins.setdefault(lemma_name, {})
+            lemma_wins[config] = lemma_wins.get(config, 0) + 1
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(self.wins, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,145 @@
+"""Retry scheduler that escalates the prover budget for leak sets tamarin-prover could not decide."""
+
+from typing import Callable, FrozenSet, Optional, Sequence
+
+from automator.min_cut_set import LabelIndex, MaskIndex
+from automator.tamarin_utils import TAMARIN_RETRY_TIERS, Verdict
+
+ProveFn = Callable[[FrozenSet[str], int], Verdict]
+MapFn = Callable[[Sequence[FrozenSet[str]], Callable[[FrozenSet[str]], Verdict]], list]
+
+
+class RetryScheduler:
+    """
+    Evaluates batches of leak sets, re-running UNKNOWN ones at higher retry tiers.
+
+    Every set in a batch is first proved at tier 0. Sets that come back
+    UNKNOWN are only retried after the rest of the batch has run, one tier
+    at a time (see TAMARIN_RETRY_TIERS). Before each retry round the
+    scheduler checks the verdicts decided so far: an undecided set with a
+    falsified subset is falsified, and one with a verified superset is
+    verified, so it is never re-run. The remaining sets are retried smallest
+    first, since fewer enabled leaks usually means a shorter proof.
+
+    Sets still UNKNOWN after the last tier are collected in `undecided` and
+    reported to the search as None, which it neither records as falsified nor
+    as verified (see min_cut_set.ImplicationOracle).
+    """
+
+    def __init__(
+        self,
+        prove: ProveFn,
+        index: LabelIndex,
+        map_fn: MapFn | None = None,
+        max_tier: int = len(TAMARIN_RETRY_TIERS) - 1,
+        on_inferred: Callable[[FrozenSet[str], bool], None] | None = None,
+    ) -> None:
+        """
+        Args:
+            prove: Runs one leak set at a retry tier and returns its verdict
+            index: Bit index of the leak names, used for the implication checks
+            map_fn: Optional parallel map (e.g. TamarinWorkerPool.map); sets are
+                proved one at a time when omitted
+            max_tier: Highest tier of TAMARIN_RETRY_TIERS to escalate to
+            on_inferred: Optional function called with (set, is_falsified) when a
+                retry is settled by monotonicity instead of a prover run
+        """
+        if not 0 <= max_tier < len(TAMARIN_RETRY_TIERS):
+            raise ValueError(f"max_tier must be between 0 and {len(TAMARIN_RETRY_TIERS) - 1}, got {max_tier}")
+        self.prove = prove
+        self.index = index
+        self.map_fn = map_fn
+        self.max_tier = max_tier
+        self.falsified = MaskIndex()  # antichain of minimal falsified masks
+        self.verified = MaskIndex()   # antichain of maximal verified masks
+        self.undecided: list[FrozenSet[str]] = []
+        self.retries = [0] * (max_tier + 1)
+        self.inferred = 0
+        self.on_inferred = on_inferred
+
+    def _implied(self, m: int) -> Verdict:
+        if self.falsified.has_subset_of(m):
+            return Verdict.FALSIFIED
+        if self.verified.has_superset_of(m):
+            return Verdict.VERIFIED
+        return Verdict.UNKNOWN
+
+    def _infer(self, leak_set: FrozenSet[str], verdict: Verdict) -> None:
+        self.inferred += 1
+        if self.on_inferred is not None:
+            self.on_inferred(leak_set, verdict is Verdict.FALSIFIED)
+
+    def _record(self, m: int, verdict: Verdict) -> None:
+        if verdict is Verdict.FALSIFIED:
+            self.falsified.discard_supersets_of(m)
+            self.falsified.insert(m)
+        elif verdict is Verdict.VERIFIED:
+            self.verified.discard_subsets_of(m)
+            self.verified.insert(m)
+
+    def _run_tier(self, leak_sets: list[FrozenSet[str]], tier: int) -> list[Verdict]:
+        self.retries[tier] += len(leak_sets)
+        if self.map_fn is not None:
+            return self.map_fn(leak_sets, lambda s: self.prove(s, tier))
+        verdicts = []
+        for leak_set in leak_sets:
+            # sequential retries can still profit from verdicts found earlier in the round
+            implied = self._implied(self.index.mask(leak_set)) if tier > 0 else Verdict.UNKNOWN
+            if implied is not Verdict.UNKNOWN:
+                self._infer(leak_set, implied)
+                self.retries[tier] -= 1
+                verdicts.append(implied)
+                continue
+            verdict = self.prove(leak_set, tier)
+            self._record(self.index.mask(leak_set), verdict)
+            verdicts.append(verdict)
+        return verdicts
+
+    def run(self, leak_sets: Sequence[FrozenSet[str]]) -> list[Optional[bool]]:
+        """
+        Decide a batch of leak sets.
+
+        Returns:
+            For each set, True if the property is falsified, False if it holds,
+            None if it could not be decided at any tier
+        """
+        verdicts: dict[FrozenSet[str], Verdict] = {}
+        pending = list(dict.fromkeys(leak_sets))
+
+        for tier in range(self.max_tier + 1):
+            if tier > 0:
+                still_pending = []
+                for leak_set in pending:
+                    implied = self._implied(self.index.mask(leak_set))
+                    if implied is Verdict.UNKNOWN:
+                        still_pending.append(leak_set)
+                    else:
+                        self._infer(leak_set, implied)
+                        verdicts[leak_set] = implied
+                pending = sorted(still_pending, key=len)
+                if pending:
+                    timeout, bound = TAMARIN_RETRY_TIERS[tier]
+                    print(f"[Retry] Tier {tier}: re-running {len(pending)} undecided set(s) "
+                          f"with a {timeout} min timeout and -c={bound}\n")
+            if not pending:
+                break
+
+            results = self._run_tier(pending, tier)
+            next_pending = []
+            for leak_set, verdict in zip(pending, results):
+                self._record(self.index.mask(leak_set), verdict)
+                if verdict is Verdict.UNKNOWN:
+                    next_pending.append(leak_set)
+                else:
+                    verdicts[leak_set] = verdict
+            pending = next_pending
+
+        for leak_set in pending:
+            self.undecided.append(leak_set)
+            verdicts[leak_set] = Verdict.UNKNOWN
+
+        return [None if verdicts[s] is Verdict.UNKNOWN else verdicts[s] is Verdict.FALSIFIED for s in leak_sets]
+
+    def __call__(self, leak_set: FrozenSet[str]) -> Optional[bool]:
+        """Decide a single leak set, escalating immediately if it is undecided."""
+        return self.run([leak_set])[0]
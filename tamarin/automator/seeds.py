@@ -0,0 +1,78 @@
+"""Warm-start seeds: leak sets believed to be minimal cut-sets, read from leak files, reports or the verdict cache."""
+
+import re
+from pathlib import Path
+from typing import FrozenSet
+
+from automator.tamarin_utils import RESULTS_DIR
+from automator.verdict_cache import VerdictCache
+
+SEED_SOURCE_CACHE = "cache"
+SEED_SOURCE_REPORTS = "reports"
+
+_LEAK_RULE_RE = re.compile(r'rule\s+Enable_Leak_(\w+)\s*:')
+_REPORT_ENTRY_RE = re.compile(r'^\s+\d+\.\s+(.+?)\s*$')
+
+
+def seeds_from_leak_file(path: Path) -> list[FrozenSet[str]]:
+    """The leak set enabled by a leak .spthy file (e.g. leaks/CR1.spthy), as a single seed."""
+    with open(path, 'r') as f:
+        return [frozenset(_LEAK_RULE_RE.findall(f.read()))]
+
+
+def seeds_from_report(path: Path) -> list[FrozenSet[str]]:
+    """The minimal cut-sets listed in a summary report written by generate_summary_report."""
+    seeds = []
+    in_minimal = False
+    with open(path, 'r') as f:
+        for line in f:
+            # every section starts with an unindented header line
+            if line.strip() and not line.startswith(" "):
+                in_minimal = line.startswith("Found ") and "minimal cut-sets" in line
+            if not in_minimal:
+                continue
+            match = _REPORT_ENTRY_RE.match(line)
+            if match:
+                seeds.append(frozenset(name.strip() for name in match.group(1).split(",")))
+    return seeds
+
+
+def load_seeds(
+    sources: list[str],
+    lemma_name: str,
+    leak_list: list[str],
+    verdict_cache: VerdictCache | None = None,
+) -> list[FrozenSet[str]]:
+    """
+    Collect warm-start seeds for a lemma.
+
+    Args:
+        sources: Each either a leak .spthy file, a summary report .txt file,
+            "reports" for results/summary_<lemma>.txt, or "cache" for every
+            set the verdict cache has seen falsify the lemma
+        lemma_name: Lemma the seeds are for
+        leak_list: Leak names analysed; seeds with other leaks are ignored
+        verdict_cache: Cache queried by the "cache" source
+
+    Returns:
+        Distinct seeds within leak_list, in source order. They are hints only:
+        the enumerators prove and shrink each one (see min_cut_set.confirm_seeds)
+    """
+    seeds: list[FrozenSet[str]] = []
+    for source in sources:
+        if source == SEED_SOURCE_CACHE:
+            if verdict_cache is None:
+                print("[Seeds] No verdict cache in use, skipping the cache seeds")
+                continue
+            found = verdict_cache.falsified_sets(lemma_name)
+        elif source == SEED_SOURCE_REPORTS:
+            report = RESULTS_DIR / f"summary_{lemma_name}.txt"
+            found = seeds_from_report(report) if report.exists() else []
+        elif source.endswith(".spthy"):
+            found = seeds_from_leak_file(Path(source))
+        else:
+            found = seeds_from_report(Path(source))
+        usable = [seed for seed in found if seed and seed <= set(leak_list)]
+        print(f"[Seeds] {source}: {len(found)} seed(s), {len(found) - len(usable)} outside the analysed leaks")
+        seeds.extend(usable)
+    return list(dict.fromkeys(seeds))
@@ -1,10 +1,19 @@
 """Utility functions for running tamarin-prover and processing results."""
 
 import json
+import os
+import queue
 import re
+import signal
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import Enum
 from pathlib import Path
-from typing import Callable, FrozenSet
+from typing import Callable, FrozenSet, Sequence
+
+from automator.min_cut_set import LabelIndex, bits_of
 
 PROJECT_ROOT = Path(__file__).parent.parent
 LEAK_RULES_PATH = PROJECT_ROOT / "automator" / "leak_rules.json"
@@ -14,21 +23,128 @@ MAIN_SPTHY_PATH = PROJECT_ROOT / "main.spthy"
 RESULTS_DIR = PROJECT_ROOT / "results"
 STDOUT_DIR = RESULTS_DIR / "stdout"
 STDERR_DIR = RESULTS_DIR / "stderr"
+WORKSPACES_DIR = RESULTS_DIR / "workspaces"
+
+TAMARIN_FLAGS = ["--derivcheck-timeout=120", "-c=50"]
+TAMARIN_TIMEOUT_MINUTES = 1
+# (timeout in minutes, -c bound) for each attempt at an undecided leak set;
+# tier 0 is the plain TAMARIN_FLAGS / TAMARIN_TIMEOUT_MINUTES run
+TAMARIN_RETRY_TIERS = [(TAMARIN_TIMEOUT_MINUTES, 50), (5, 100), (20, 200)]
+# used for per-candidate proofs once the derivation checks ran in the well-formedness stage
+TAMARIN_PRECHECKED_FLAGS = ["--derivcheck-timeout=0"]
 
+_progress_lock = threading.Lock()
 _progress_counter = 0
-_progress_callback: Callable[[int, FrozenSet[str], bool | None], None] = None
+_progress_callback: Callable[[int, FrozenSet[str], "Verdict | dict[str, Verdict] | None"], None] = None
+_verdict_cache = None
+_telemetry = None
+_portfolio = None
+_prechecked = False
+
+
+class Verdict(Enum):
+    """Outcome of one tamarin-prover run on a leak set."""
+    FALSIFIED = "falsified"
+    VERIFIED = "verified"
+    UNKNOWN = "unknown"  # timed out, crashed, or printed no summary line
+
+
+class LeakCatalog:
+    """
+    Leak rules and short names, parsed once from leak_rules.json and leak_rules_short.json.
+    
+    Leaks are kept in JSON key order, which fixes their bit positions, the
+    order of rules in generated theories and the short-name order in
+    filenames. Filenames and theory suffixes are memoised per leak bitmask,
+    so candidate evaluations and progress callbacks do no file I/O.
+    
+    The JSON files are not watched on every call; get_leak_catalog(refresh=True)
+    compares their modification times and reloads them if either changed.
+    """
+
+    def __init__(self, rules_path: Path = LEAK_RULES_PATH, short_names_path: Path = LEAK_RULES_SHORT_PATH) -> None:
+        self.rules_path = rules_path
+        self.short_names_path = short_names_path
+        self.reload()
+
+    def _stamp(self) -> tuple:
+        return tuple((p.stat().st_mtime_ns, p.stat().st_size) for p in (self.rules_path, self.short_names_path))
+
+    def reload(self) -> None:
+        """(Re)read both JSON files and drop every memoised name."""
+        self.stamp = self._stamp()
+        with open(self.rules_path, 'r') as f:
+            self.rules: dict[str, str] = json.load(f)
+        with open(self.short_names_path, 'r') as f:
+            self.short_names: dict[str, str] = json.load(f)
+        self.names = list(self.rules.keys())
+        self.index = LabelIndex(self.names)
+        self._suffixes: dict[int, str] = {}
+
+    def is_stale(self) -> bool:
+        """True if either JSON file changed on disk since it was loaded."""
+        return self._stamp() != self.stamp
+
+    def mask(self, leak_names: FrozenSet[str]) -> int:
+        """Bitmask of a leak set; names missing from leak_rules.json are ignored."""
+        bit = self.index.bit
+        m = 0
+        for name in leak_names:
+            m |= bit.get(name, 0)
+        return m
+
+    def ordered(self, leak_names: FrozenSet[str]) -> list[str]:
+        """Leak names of a set in JSON key order."""
+        return [self.names[i] for i in bits_of(self.mask(leak_names))]
+
+    def short_name(self, leak_name: str) -> str:
+        return self.short_names.get(leak_name, leak_name)
+
+    def theory_suffix(self, leak_names: FrozenSet[str]) -> str:
+        """Short names concatenated in JSON key order, or "NoLeaks" for the empty set."""
+        m = self.mask(leak_names)
+        suffix = self._suffixes.get(m)
+        if suffix is None:
+            suffix = "".join(self.short_name(name) for name in self.ordered(leak_names)) or "NoLeaks"
+            self._suffixes[m] = suffix
+        return suffix
+
+    def filename(self, leak_names: FrozenSet[str]) -> str:
+        return self.theory_suffix(leak_names) + ".spthy"
+
+    def rule_text(self, leak_names: FrozenSet[str]) -> list[str]:
+        """Rules of a leak set in JSON key order."""
+        return [self.rules[name] for name in self.ordered(leak_names)]
+
+
+_catalog: LeakCatalog | None = None
+_catalog_lock = threading.Lock()
+
+
+def get_leak_catalog(refresh: bool = False) -> LeakCatalog:
+    """
+    Return the shared LeakCatalog, loading it on first use.
+    
+    Args:
+        refresh: Reload the catalog if a JSON file changed since it was loaded
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = LeakCatalog()
+        elif refresh and _catalog.is_stale():
+            _catalog.reload()
+        return _catalog
 
 
 def load_leak_rules() -> dict[str, str]:
-    """Load leak rules from JSON file."""
-    with open(LEAK_RULES_PATH, 'r') as f:
-        return json.load(f)
+    """Load leak rules from JSON file (re-read only if it changed since the last load)."""
+    return dict(get_leak_catalog(refresh=True).rules)
 
 
 def load_leak_short_names() -> dict[str, str]:
-    """Load leak short name mappings from JSON file."""
-    with open(LEAK_RULES_SHORT_PATH, 'r') as f:
-        return json.load(f)
+    """Load leak short name mappings from JSON file (re-read only if it changed since the last load)."""
+    return dict(get_leak_catalog(refresh=True).short_names)
 
 
 def get_short_name(leak_name: str) -> str:
@@ -41,8 +157,7 @@ def get_short_name(leak_name: str) -> str:
     Returns:
         Short name from JSON, or original if not found
     """
-    short_names = load_leak_short_names()
-    return short_names.get(leak_name, leak_name)
+    return get_leak_catalog().short_name(leak_name)
 
 
 def get_leak_filename(leak_names: FrozenSet[str]) -> str:
@@ -56,13 +171,7 @@ def get_leak_filename(leak_names: FrozenSet[str]) -> str:
     Returns:
         Filename like "AipCvmSk.spthy" (ordered by JSON key order, no separator)
     """
-    if not leak_names:
-        return "NoLeaks.spthy"
-
-    rules = load_leak_rules()
-    ordered_leaks = [name for name in rules.keys() if name in leak_names]
-    short_names = [get_short_name(name) for name in ordered_leaks]
-    return "".join(short_names) + ".spthy"
+    return get_leak_catalog().filename(leak_names)
 
 
 def generate_leak_file(leak_names: FrozenSet[str], output_path: Path) -> None:
@@ -73,13 +182,10 @@ def generate_leak_file(leak_names: FrozenSet[str], output_path: Path) -> None:
         leak_names: Set of leak names to include (e.g., {"AIP", "ATC", "Token"})
         output_path: Path where the .spthy file should be written
     """
-    rules = load_leak_rules()
-    
     output_lines = []
-    for leak_name in rules.keys():
-        if leak_name in leak_names:
-            output_lines.append(rules[leak_name])
-            output_lines.append('') 
+    for rule in get_leak_catalog().rule_text(leak_names):
+        output_lines.append(rule)
+        output_lines.append('') 
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, 'w') as f:
@@ -88,6 +194,45 @@ def generate_leak_file(leak_names: FrozenSet[str], output_path: Path) -> None:
             f.write('\n')
 
 
+def get_theory_suffix(leak_names: FrozenSet[str]) -> str:
+    """
+    Build the theory name suffix used in main.spthy for a leak set.
+    
+    Args:
+        leak_names: Set of leak names (e.g., {"AIP", "CVM", "SessionKey"})
+    
+    Returns:
+        Short names concatenated in JSON key order, or "NoLeaks" for the empty set
+    """
+    return get_leak_catalog().theory_suffix(leak_names)
+
+
+def render_theory(leak_names: FrozenSet[str], main_spthy_path: Path = MAIN_SPTHY_PATH) -> str:
+    """
+    Render main.spthy with the leak rules for a set inlined in place of the #include line.
+    
+    The shared main.spthy and leaks/ directory are left untouched, so several
+    renders can be proved concurrently from separate workspaces.
+    
+    Args:
+        leak_names: Set of leak names to enable
+        main_spthy_path: Path to main.spthy
+    
+    Returns:
+        Self-contained theory text
+    """
+    if not main_spthy_path.exists():
+        raise FileNotFoundError(f"main.spthy not found: {main_spthy_path}")
+    
+    with open(main_spthy_path, 'r') as f:
+        content = f.read()
+    
+    inlined = "\n\n".join(get_leak_catalog().rule_text(leak_names))
+    new_content = re.sub(r'#include\s+"leaks/[^"]+"', lambda _: inlined, content)
+    theory_replacement = f'theory leak{get_theory_suffix(leak_names)}'
+    return re.sub(r'^theory\s+leak[\w\d]+', theory_replacement, new_content, flags=re.MULTILINE)
+
+
 def update_main_spthy_include(main_spthy_path: Path, leak_filename: str, leak_names: FrozenSet[str] = None) -> None:
     """
     Update the #include line and theory name in main.spthy.
@@ -108,56 +253,231 @@ def update_main_spthy_include(main_spthy_path: Path, leak_filename: str, leak_na
     new_content = re.sub(pattern, replacement, content)
     
     if leak_names is not None:
-        if not leak_names:
-            leak_suffix = "NoLeaks"
-        else:
-            rules = load_leak_rules()
-            ordered_leaks = [name for name in rules.keys() if name in leak_names]
-            short_names = [get_short_name(name) for name in ordered_leaks]
-            leak_suffix = "".join(short_names)
         theory_pattern = r'^theory\s+leak[\w\d]+'
-        theory_replacement = f'theory leak{leak_suffix}'
+        theory_replacement = f'theory leak{get_theory_suffix(leak_names)}'
         new_content = re.sub(theory_pattern, theory_replacement, new_content, flags=re.MULTILINE)
     
     with open(main_spthy_path, 'w') as f:
         f.write(new_content)
 
 
-def run_tamarin_prover(lemma_name: str = "TestCardCloningResistance") -> tuple[str, str, int]:
+def merge_flags(flags: Sequence[str], overrides: Sequence[str]) -> list[str]:
     """
-    Run tamarin-prover on main.spthy and return stdout, stderr, and return code.
+    Apply prover flag overrides: an override replaces the flag with the same
+    option name (the part before "="), other overrides are appended.
+    """
+    names = {flag.split("=", 1)[0]: flag for flag in overrides}
+    merged = [names.pop(flag.split("=", 1)[0], flag) for flag in flags]
+    return merged + list(names.values())
+
+
+def kill_process_tree(proc: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session=True together with all of its children."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_tamarin_prover(
+    lemma_name: str | Sequence[str] | None = "TestCardCloningResistance",
+    cwd: Path = PROJECT_ROOT,
+    theory_file: str = "main.spthy",
+    stdout_path: Path | None = None,
+    tier: int = 0,
+    extra_flags: Sequence[str] = (),
+    on_start: Callable[[subprocess.Popen], None] | None = None,
+    timeout_minutes: float | None = None,
+) -> tuple[str, str, int, int]:
+    """
+    Run tamarin-prover on a theory and return stdout, stderr, return code and peak memory.
+    
+    Stdout is read line by line and, when stdout_path is given, written straight
+    to that file. As soon as the "<lemma> (...): falsified|verified" summary line
+    of every proved lemma appears the verdicts are known, so the prover and every
+    process it spawned are killed instead of waiting for it to exit. The timeout
+    also kills the whole process group, not only the tamarin-prover parent.
     
     Args:
-        lemma_name: Lemma name to prove (e.g., "TestCardCloningResistance")
+        lemma_name: Lemma name to prove (e.g., "TestCardCloningResistance"), or several
+            lemma names proved in the same invocation; None only loads the theory,
+            running its well-formedness and derivation checks
+        cwd: Directory to run tamarin-prover from (the project root or a worker workspace)
+        theory_file: Theory file, relative to cwd
+        stdout_path: Optional file that receives stdout as it is produced
+        tier: Index into TAMARIN_RETRY_TIERS selecting the timeout and -c bound
+        extra_flags: Flags overriding (same option name) or extending the tier's flags
+        on_start: Optional function called with the prover process once it started,
+            e.g. to kill it from another thread with kill_process_tree
+        timeout_minutes: Optional timeout replacing the tier's
     
     Returns:
-        Tuple of (stdout, stderr, return_code)
+        Tuple of (stdout, stderr, return_code, max_rss_kb); return_code is 0 when
+        the run was stopped after its summary line, and -1 on timeout or error.
+        max_rss_kb is the peak resident set size of the prover (0 if it never started)
     """
+    num_min_timeout, bound = TAMARIN_RETRY_TIERS[tier]
+    if timeout_minutes is not None:
+        num_min_timeout = timeout_minutes
+    if lemma_name is None:
+        lemma_names = []
+    elif isinstance(lemma_name, str):
+        lemma_names = [lemma_name]
+    else:
+        lemma_names = list(lemma_name)
+    flags = [flag if not flag.startswith("-c=") else f"-c={bound}" for flag in TAMARIN_FLAGS]
+    if _prechecked and lemma_names:
+        flags = merge_flags(flags, TAMARIN_PRECHECKED_FLAGS)
+    flags = merge_flags(flags, extra_flags)
     cmd = [
         "tamarin-prover",
-        "main.spthy",
-        "--derivcheck-timeout=120",
-        f"--prove={lemma_name}",
-        "-c=50"
+        theory_file,
+        *flags,
+    ]
+    cmd += [f"--prove={name}" for name in lemma_names]
+
+    summary_patterns = [
+        re.compile(rf"{re.escape(name)}\s+\([^)]+\):\s+(falsified|verified)") for name in lemma_names
     ]
 
-    num_min_timeout = 1
-    
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            cwd=PROJECT_ROOT,
-            capture_output=True,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=60*num_min_timeout
+            bufsize=1,
+            start_new_session=True,
         )
-        return result.stdout, result.stderr, result.returncode
-    except subprocess.TimeoutExpired:
-        return "", f"Command timed out after {num_min_timeout} minutes", -1
     except FileNotFoundError:
-        return "", "tamarin-prover not found in PATH", -1
+        return "", "tamarin-prover not found in PATH", -1, 0
     except Exception as e:
-        return "", f"Error running tamarin-prover: {str(e)}", -1
+        return "", f"Error running tamarin-prover: {str(e)}", -1, 0
+
+    if on_start is not None:
+        on_start(proc)
+
+    timed_out = threading.Event()
+
+    def on_timeout() -> None:
+        timed_out.set()
+        kill_process_tree(proc)
+
+    stderr_lines: list[str] = []
+    stderr_reader = threading.Thread(target=lambda: stderr_lines.extend(proc.stderr), daemon=True)
+    stderr_reader.start()
+    timer = threading.Timer(60*num_min_timeout, on_timeout)
+    timer.start()
+
+    stdout_lines: list[str] = []
+    decided = False
+    stdout_file = open(stdout_path, 'w') if stdout_path is not None else None
+    try:
+        for line in proc.stdout:
+            stdout_lines.append(line)
+            if stdout_file is not None:
+                stdout_file.write(line)
+            summary_patterns = [pattern for pattern in summary_patterns if not pattern.search(line)]
+            if lemma_names and not summary_patterns:
+                decided = True
+                kill_process_tree(proc)
+                break
+    finally:
+        timer.cancel()
+        if stdout_file is not None:
+            stdout_file.close()
+        proc.stdout.close()
+        # reap the prover ourselves to get its resource usage
+        _, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        stderr_reader.join()
+        proc.stderr.close()
+
+    stdout = "".join(stdout_lines)
+    stderr = "".join(stderr_lines)
+    max_rss_kb = rusage.ru_maxrss
+    if decided:
+        return stdout, stderr, 0, max_rss_kb
+    if timed_out.is_set():
+        return stdout, stderr + f"Command timed out after {num_min_timeout} minutes\n", -1, max_rss_kb
+    return stdout, stderr, proc.returncode, max_rss_kb
+
+
+def race_tamarin_prover(
+    lemma_name: str,
+    configs: Sequence[tuple[str, Sequence[str]]],
+    cwd: Path = PROJECT_ROOT,
+    theory_file: str = "main.spthy",
+    stdout_path: Path | None = None,
+    tier: int = 0,
+) -> tuple[str, str, int, int, str | None]:
+    """
+    Race several prover configurations on the same theory and keep the first decisive run.
+
+    Every configuration runs run_tamarin_prover with its flags as extra_flags,
+    streaming to "<stdout_path stem>.<name>.stdout". As soon as one prints the
+    lemma's summary line, the process trees of all others are killed. The
+    winner's output is then moved to stdout_path and the other files are removed.
+
+    Args:
+        lemma_name: Lemma name to prove
+        configs: (name, flag overrides) pairs, started in this order
+        cwd: Directory to run tamarin-prover from
+        theory_file: Theory file, relative to cwd
+        stdout_path: Optional file that receives the winner's stdout
+        tier: Index into TAMARIN_RETRY_TIERS selecting the timeout and -c bound
+
+    Returns:
+        Tuple of (stdout, stderr, return_code, max_rss_kb, winner) of the winning
+        configuration, or of the first configuration with winner None if none decided
+        (return_code -1 if no prover could be started, which callers treat as UNKNOWN)
+    """
+    lock = threading.Lock()
+    procs: list[subprocess.Popen] = []
+    winner: str | None = None
+
+    def register(proc: subprocess.Popen) -> None:
+        with lock:
+            procs.append(proc)
+            if winner is not None:
+                kill_process_tree(proc)
+
+    def config_stdout_path(name: str) -> Path | None:
+        if stdout_path is None:
+            return None
+        return stdout_path.with_name(f"{stdout_path.stem}.{name}{stdout_path.suffix}")
+
+    def run(name: str, flags: Sequence[str]) -> tuple[str, str, int, int]:
+        return run_tamarin_prover(lemma_name, cwd, theory_file, config_stdout_path(name), tier, flags, register)
+
+    results: dict[str, tuple[str, str, int, int]] = {}
+    with ThreadPoolExecutor(max_workers=len(configs), thread_name_prefix="race") as executor:
+        futures = {executor.submit(run, name, flags): name for name, flags in configs}
+        for future in as_completed(futures):
+            name = futures[future]
+            results[name] = future.result()
+            stdout, _, return_code, _ = results[name]
+            if winner is None and return_code != -1 and parse_tamarin_summary(stdout, lemma_name) is not None:
+                with lock:
+                    winner = name
+                    for proc in procs:
+                        # the runner sets returncode once it has reaped its prover
+                        if proc.returncode is None:
+                            kill_process_tree(proc)
+
+    kept = winner if winner is not None else configs[0][0]
+    if stdout_path is not None:
+        for name, _ in configs:
+            path = config_stdout_path(name)
+            # a configuration whose prover could not be started never opened its file
+            if not path.exists():
+                continue
+            if name == kept:
+                os.replace(path, stdout_path)
+            else:
+                path.unlink()
+    return (*results[kept], winner)
 
 
 def parse_tamarin_result(stdout: str, stderr: str, return_code: int, lemma_name: str) -> bool:
@@ -175,33 +495,91 @@ def parse_tamarin_result(stdout: str, stderr: str, return_code: int, lemma_name:
     Returns:
         True if security property is falsified (proof failed/violated), False if verified
     """
- 
+    return parse_tamarin_summary(stdout, lemma_name) is True
+
+
+def parse_tamarin_summary(stdout: str, lemma_name: str) -> bool | None:
+    """
+    Find the "<lemma> (...): falsified|verified" summary line in tamarin-prover output.
+    
+    Args:
+        stdout: Standard output from tamarin-prover
+        lemma_name: Name of the lemma being tested
+    
+    Returns:
+        True if falsified, False if verified, None if no summary line was printed
+        (timeout, crash, or tamarin-prover missing)
+    """
     lines = stdout.splitlines()
     pattern = rf"{re.escape(lemma_name)}\s+\([^)]+\):\s+(falsified|verified)"
     for line in reversed(lines):
         match = re.search(pattern, line)
         if match:
-            result = match.group(1).lower()
-            if result == "falsified":
-                return True
-            elif result == "verified":
-                return False
-    return False
+            return match.group(1).lower() == "falsified"
+    return None
 
 
-def set_progress_callback(callback: Callable[[int, FrozenSet[str], bool | None], None]) -> None:
-    """Set a callback function to report progress."""
+def set_progress_callback(callback: Callable[[int, FrozenSet[str], Verdict | dict[str, Verdict] | None], None]) -> None:
+    """Set a callback function to report progress (see prove_leak_set_lemmas for the verdict argument)."""
     global _progress_callback
     _progress_callback = callback
 
 
+def set_verdict_cache(cache) -> None:
+    """
+    Set a persistent verdict store (see automator.verdict_cache.VerdictCache).
+    
+    prove_leak_set records every decisive verdict in it; runs that timed
+    out or produced no summary line are never stored.
+    """
+    global _verdict_cache
+    _verdict_cache = cache
+
+
+def set_telemetry(telemetry) -> None:
+    """
+    Set a per-call event recorder (see automator.telemetry.Telemetry).
+    
+    prove_leak_set reports every tamarin-prover run to it, with its verdict,
+    wall time and the prover's peak memory.
+    """
+    global _telemetry
+    _telemetry = telemetry
+
+
+def set_portfolio(portfolio) -> None:
+    """
+    Set a portfolio of prover configurations to race per leak set
+    (see automator.portfolio.ProverPortfolio); None runs the plain flags only.
+    """
+    global _portfolio
+    _portfolio = portfolio
+
+
+def set_prechecked(prechecked: bool) -> None:
+    """
+    Mark the model as checked by the well-formedness stage (see automator.wellformedness).
+    
+    While set, every proof runs with TAMARIN_PRECHECKED_FLAGS, so the derivation
+    checks are not repeated for each candidate.
+    """
+    global _prechecked
+    _prechecked = prechecked
+
+
 def reset_progress_counter() -> None:
     """Reset the progress counter."""
     global _progress_counter
     _progress_counter = 0
 
 
-def generate_summary_report(lemma_name: str, mincutsets: list[FrozenSet[str]], leak_list: list[str]) -> Path:
+def generate_summary_report(
+    lemma_name: str,
+    mincutsets: list[FrozenSet[str]],
+    leak_list: list[str],
+    maximal_verified: list[FrozenSet[str]] | None = None,
+    undecided: list[FrozenSet[str]] | None = None,
+) -> Path:
     """
     Generate a summary report of found mincutsets and save it to results directory.
     
@@ -209,6 +587,8 @@ def generate_summary_report(lemma_name: str, mincutsets: list[FrozenSet[str]], l
         lemma_name: Name of the lemma tested
         mincutsets: List of minimal cut-sets that violate the property
         leak_list: List of all available leak types
+        maximal_verified: Optional list of maximal leak sets for which the property holds
+        undecided: Optional list of leak sets tamarin-prover could not decide at any retry tier
     
     Returns:
         Path to the generated summary report file
@@ -233,70 +613,242 @@ def generate_summary_report(lemma_name: str, mincutsets: list[FrozenSet[str]], l
             f.write(f"  {idx}. {', '.join(leak_names)}\n")
             f.write(f"     File: {filename}\n")
             f.write(f"     Leak count: {len(mincutset)}\n\n")
+
+        if maximal_verified:
+            f.write(f"Found {len(maximal_verified)} maximal leak sets for which the security property holds:\n\n")
+            for idx, leak_set in enumerate(maximal_verified, start=1):
+                f.write(f"  {idx}. {', '.join(sorted(leak_set)) or '(no leaks)'}\n")
+                f.write(f"     Leak count: {len(leak_set)}\n\n")
+
+        if undecided:
+            f.write(f"{len(undecided)} leak sets stayed undecided after every retry; they were counted neither as violating\n")
+            f.write("nor as holding. Minimal cut-sets among them may be missing, and listed cut-sets that contain one\n")
+            f.write("of them are only minimal among the decided sets:\n\n")
+            for idx, leak_set in enumerate(undecided, start=1):
+                f.write(f"  {idx}. {', '.join(sorted(leak_set)) or '(no leaks)'}\n")
+                f.write(f"     File: {get_leak_filename(leak_set)}\n\n")
         
         f.write("=" * 80 + "\n")
     
     return report_file
 
 
-def security_predicate(leak_set: FrozenSet[str], lemma_name: str) -> bool:
+def prove_leak_set(
+    leak_set: FrozenSet[str],
+    lemma_name: str,
+    workspace: Path | None = None,
+    tier: int = 0,
+) -> Verdict:
     """
-    Predicate that tests if a leak combination violates the security property.
+    Prove a lemma for one leak combination.
 
     This function:
-    1. Generates a leak file for the given cut-set
-    2. Updates main.spthy to include that leak file
-    3. Runs tamarin-prover to check the security property
-    4. Returns True if the property is falsified (proof failed), False otherwise
+    1. Generates a leak file for the given cut-set and updates main.spthy to include it,
+       or, when a workspace is given, writes a self-contained theory into that workspace
+    2. Runs tamarin-prover to check the security property, streaming its output
+       to results/stdout/<lemma>/ and stopping it once the verdict is printed
+       (racing the configurations of the portfolio set with set_portfolio, if any)
+    3. Returns the verdict, or UNKNOWN if the run timed out or printed no summary line
 
     Args:
         leak_set: Set of leak names to test
         lemma_name: Name of the lemma to test
+        workspace: Optional private directory for this call (see TamarinWorkerPool)
+        tier: Index into TAMARIN_RETRY_TIERS selecting the timeout and -c bound
 
     Returns:
-        True if security property is falsified, False if property holds
+        Verdict of the run
     """
-    global _progress_counter, _progress_callback
-    
-    if _progress_callback:
-        _progress_callback(_progress_counter, leak_set, None)
+    return prove_leak_set_lemmas(leak_set, [lemma_name], workspace, tier)[lemma_name]
+
+
+def prove_leak_set_lemmas(
+    leak_set: FrozenSet[str],
+    lemma_names: Sequence[str],
+    workspace: Path | None = None,
+    tier: int = 0,
+) -> dict[str, Verdict]:
+    """
+    Prove several lemmas for one leak combination in a single tamarin-prover run.
+
+    The theory is generated once and every lemma is passed with its own
+    --prove flag, so the prover starts and preprocesses the theory only once.
+    Output goes to results/stdout/<lemma>/ of the first lemma and is hard-linked
+    into the directories of the others. The portfolio is only raced for a
+    single lemma.
+    The progress callback receives the Verdict for a single lemma, and a dict
+    of verdicts by lemma otherwise; telemetry records one call whose verdict
+    joins the per-lemma verdicts with "+".
+
+    Args:
+        leak_set: Set of leak names to test
+        lemma_names: Names of the lemmas to prove
+        workspace: Optional private directory for this call (see TamarinWorkerPool)
+        tier: Index into TAMARIN_RETRY_TIERS selecting the timeout and -c bound
+
+    Returns:
+        Dict mapping each lemma name to its verdict
+    """
+    global _progress_counter
     
-    _progress_counter += 1
+    with _progress_lock:
+        counter = _progress_counter
+        _progress_counter += 1
+        if _progress_callback:
+            _progress_callback(counter, leak_set, None)
     
     filename = get_leak_filename(leak_set)
     output_path = LEAKS_DIR / filename
 
-    lemma_stdout_dir = STDOUT_DIR / lemma_name
-    lemma_stderr_dir = STDERR_DIR / lemma_name
-    lemma_stdout_dir.mkdir(parents=True, exist_ok=True)
-    lemma_stderr_dir.mkdir(parents=True, exist_ok=True)
+    label = lemma_names[0]
+    for lemma_name in lemma_names:
+        (STDOUT_DIR / lemma_name).mkdir(parents=True, exist_ok=True)
+        (STDERR_DIR / lemma_name).mkdir(parents=True, exist_ok=True)
+    lemma_stdout_dir = STDOUT_DIR / label
+    lemma_stderr_dir = STDERR_DIR / label
 
-    try:
-        
+    base_name = filename.replace(".spthy", "")
+    stdout_file = lemma_stdout_dir / f"{base_name}.stdout"
+    stderr_file = lemma_stderr_dir / f"{base_name}.stderr"
+
+    start = time.time()
+    if workspace is None:
         generate_leak_file(leak_set, output_path)
         update_main_spthy_include(MAIN_SPTHY_PATH, filename, leak_set)
+        cwd = PROJECT_ROOT
+    else:
+        workspace.mkdir(parents=True, exist_ok=True)
+        with open(workspace / "main.spthy", 'w') as f:
+            f.write(render_theory(leak_set))
+        cwd = workspace
+    winner = None
+    if _portfolio is not None and len(lemma_names) == 1:
+        stdout, stderr, return_code, max_rss_kb, winner = race_tamarin_prover(
+            label, _portfolio.ranked(label), cwd=cwd, stdout_path=stdout_file, tier=tier
+        )
+        if winner is not None:
+            _portfolio.record_win(label, winner)
+    else:
+        stdout, stderr, return_code, max_rss_kb = run_tamarin_prover(
+            list(lemma_names), cwd=cwd, stdout_path=stdout_file, tier=tier
+        )
+    proof_time = time.time() - start
+
+    if stderr:
+        with open(stderr_file, 'w') as f:
+            f.write(stderr)
+    for lemma_name in lemma_names[1:]:
+        for path, other_dir in ((stdout_file, STDOUT_DIR), (stderr_file, STDERR_DIR)):
+            if path.exists():
+                link = other_dir / lemma_name / path.name
+                link.unlink(missing_ok=True)
+                os.link(path, link)
+
+    verdicts: dict[str, Verdict] = {}
+    for lemma_name in lemma_names:
+        summary = parse_tamarin_summary(stdout, lemma_name) if return_code != -1 else None
+        if summary is None:
+            verdicts[lemma_name] = Verdict.UNKNOWN
+        else:
+            verdicts[lemma_name] = Verdict.FALSIFIED if summary else Verdict.VERIFIED
+            if _verdict_cache is not None:
+                _verdict_cache.put(lemma_name, leak_set, summary, proof_time)
 
-        stdout, stderr, return_code = run_tamarin_prover(lemma_name)
+    if _telemetry is not None:
+        verdict_text = "+".join(verdict.value for verdict in verdicts.values())
+        _telemetry.record_call(leak_set, verdict_text, "prover", proof_time, max_rss_kb, tier, winner)
+    
+    with _progress_lock:
+        if _progress_callback:
+            _progress_callback(counter, leak_set, verdicts if len(lemma_names) > 1 else verdicts[lemma_names[0]])
 
-        base_name = filename.replace(".spthy", "")
-        stdout_file = lemma_stdout_dir / f"{base_name}.stdout"
-        stderr_file = lemma_stderr_dir / f"{base_name}.stderr"
+    return verdicts
 
-        with open(stdout_file, 'w') as f:
-            f.write(stdout)
 
-        if stderr:
-            with open(stderr_file, 'w') as f:
-                f.write(stderr)
+def security_predicate(leak_set: FrozenSet[str], lemma_name: str, workspace: Path | None = None) -> bool | None:
+    """
+    Predicate that tests if a leak combination violates the security property.
 
-        is_falsified = parse_tamarin_result(stdout, stderr, return_code, lemma_name)
+    Runs prove_leak_set once at tier 0. An UNKNOWN verdict is reported as None;
+    use automator.retry_scheduler.RetryScheduler to retry those.
+
+    Args:
+        leak_set: Set of leak names to test
+        lemma_name: Name of the lemma to test
+        workspace: Optional private directory for this call (see TamarinWorkerPool)
+
+    Returns:
+        True if security property is falsified, False if it holds, None if it was not decided
+    """
+    verdict = prove_leak_set(leak_set, lemma_name, workspace)
+    if verdict is Verdict.UNKNOWN:
+        return None
+    return verdict is Verdict.FALSIFIED
+
+
+class TamarinWorkerPool:
+    """
+    Pool of tamarin-prover workers, each proving in its own scratch workspace.
+    
+    Every worker owns a directory under results/workspaces/ holding a private
+    main.spthy with the leak rules inlined, so candidates can be proved in
+    parallel without touching the shared main.spthy or leaks/ files. Stdout and
+    stderr are still written to results/stdout/<lemma>/ and results/stderr/<lemma>/.
+    """
+
+    def __init__(self, lemma_name: str, jobs: int, workspaces_dir: Path = WORKSPACES_DIR) -> None:
+        if jobs < 1:
+            raise ValueError(f"jobs must be at least 1, got {jobs}")
+        self.lemma_name = lemma_name
+        self.jobs = jobs
+        self._workspaces: queue.Queue[Path] = queue.Queue()
+        for i in range(jobs):
+            self._workspaces.put(workspaces_dir / lemma_name / f"worker_{i}")
+        self._executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="tamarin")
+
+    def __call__(self, leak_set: FrozenSet[str]) -> bool:
+        """Prove one leak set in the calling thread, inside a free workspace."""
+        return self.prove(leak_set) is Verdict.FALSIFIED
+
+    def prove(self, leak_set: FrozenSet[str], tier: int = 0) -> Verdict:
+        """Like __call__, but returns the full verdict of a run at the given retry tier."""
+        workspace = self._workspaces.get()
+        try:
+            return prove_leak_set(leak_set, self.lemma_name, workspace, tier)
+        finally:
+            self._workspaces.put(workspace)
+
+    def prove_lemmas(self, leak_set: FrozenSet[str], lemma_names: Sequence[str], tier: int = 0) -> dict[str, Verdict]:
+        """Prove several lemmas for one leak set in one run, inside a free workspace."""
+        workspace = self._workspaces.get()
+        try:
+            return prove_leak_set_lemmas(leak_set, lemma_names, workspace, tier)
+        finally:
+            self._workspaces.put(workspace)
+
+    def map(
+        self,
+        leak_sets: Sequence[FrozenSet[str]],
+        predicate: Callable[[FrozenSet[str]], object] | None = None,
+    ) -> list:
+        """
+        Evaluate several leak sets concurrently on the pool's threads.
         
-        if _progress_callback:
-            _progress_callback(_progress_counter - 1, leak_set, is_falsified)
+        Args:
+            leak_sets: Leak sets to evaluate
+            predicate: Predicate to run per set (defaults to proving in a workspace);
+                may itself call back into the pool
+        
+        Returns:
+            Predicate results in input order
+        """
+        return list(self._executor.map(predicate or self, leak_sets))
 
-        return is_falsified
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
 
-    finally:
-        if output_path.exists():
-            pass
+    def __enter__(self) -> "TamarinWorkerPool":
+        return self
 
+    def __exit__(self, *exc) -> None:
+        self.close()
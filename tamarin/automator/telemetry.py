@@ -0,0 +1,169 @@
+"""Per-call telemetry: a JSONL event stream, a latency histogram by set size, and a frontier-based ETA."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import FrozenSet
+
+from automator.tamarin_utils import RESULTS_DIR, get_leak_catalog
+
+TELEMETRY_DIR = RESULTS_DIR / "telemetry"
+
+
+class LatencyHistogram:
+    """Prover wall times grouped by leak set size."""
+
+    def __init__(self) -> None:
+        self.times: dict[int, list[float]] = {}
+
+    def add(self, size: int, seconds: float) -> None:
+        self.times.setdefault(size, []).append(seconds)
+
+    def mean(self, size: int) -> float | None:
+        """
+        Mean wall time at a size, falling back to the closest size with data.
+
+        Returns:
+            Seconds per call, or None before the first prover call
+        """
+        if not self.times:
+            return None
+        closest = min(self.times, key=lambda k: (abs(k - size), -k))
+        samples = self.times[closest]
+        return sum(samples) / len(samples)
+
+    def rows(self) -> list[tuple[int, int, float, float, float]]:
+        """(size, calls, mean, max, total) per size, in size order."""
+        return [
+            (size, len(t), sum(t) / len(t), max(t), sum(t))
+            for size, t in sorted(self.times.items())
+        ]
+
+
+class Telemetry:
+    """
+    Records every oracle query of an analysis.
+
+    Each query becomes one JSON line in `path` (appended, so several runs can
+    share a file) with the leak mask over leak_rules.json order, the verdict,
+    where it came from ("prover", "verdict_cache", "memo" for the in-run
+    cache, or "inferred" by monotonicity), the search phase ("search" or
+    "shrink"), the prover's wall time and peak RSS, the retry tier, and the
+    winning configuration when a portfolio is raced.
+
+    Prover calls also feed a LatencyHistogram. The enumerators report the
+    number of candidates at the size they are about to evaluate (see
+    min_cut_set.set_frontier_callback); the ETA is the part of that frontier
+    still to be proved times the mean latency at that size, divided by the
+    number of workers. With path=None nothing is written and only the
+    histogram and ETA are kept.
+    """
+
+    def __init__(self, path: Path | None, lemma_name: str, jobs: int = 1) -> None:
+        self.path = Path(path) if path is not None else None
+        self.lemma_name = lemma_name
+        self.jobs = jobs
+        self.run_id = time.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+        self.histogram = LatencyHistogram()
+        self.phase = "search"
+        self.frontier_size: int | None = None
+        self.frontier_total = 0
+        self.frontier_done = 0
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a')
+
+    def event(self, kind: str, **fields) -> None:
+        """Append one event line; flushed immediately so a killed run keeps its events."""
+        if self._file is None:
+            return
+        line = json.dumps({"ts": time.time(), "run": self.run_id, "lemma": self.lemma_name, "event": kind, **fields})
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def set_phase(self, phase: str) -> None:
+        self.phase = phase
+
+    def set_frontier(self, size: int, count: int) -> None:
+        """Called by the enumerators before they evaluate the candidates of one size."""
+        with self._lock:
+            self.frontier_size = size
+            self.frontier_total = count
+            self.frontier_done = 0
+        self.event("frontier", size=size, candidates=count)
+
+    def record_call(
+        self,
+        leak_set: FrozenSet[str],
+        verdict: str,
+        source: str = "prover",
+        wall_time: float = 0.0,
+        max_rss_kb: int = 0,
+        tier: int = 0,
+        config: str | None = None,
+    ) -> None:
+        """
+        Record one oracle query.
+
+        Args:
+            leak_set: Leak names of the query
+            verdict: "falsified", "verified" or "unknown"
+            source: "prover", "verdict_cache", "memo" or "inferred"
+            wall_time: Prover wall time in seconds (original proof time for cache replays)
+            max_rss_kb: Peak resident set size of the prover
+            tier: Retry tier of the prover run
+            config: Winning portfolio configuration, when configurations were raced
+        """
+        size = len(leak_set)
+        if source == "prover":
+            with self._lock:
+                self.histogram.add(size, wall_time)
+                if size == self.frontier_size:
+                    self.frontier_done += 1
+        catalog = get_leak_catalog()
+        self.event(
+            "call",
+            mask=catalog.mask(leak_set),
+            leaks=catalog.ordered(leak_set),
+            size=size,
+            verdict=verdict,
+            source=source,
+            phase=self.phase,
+            wall_time=round(wall_time, 3),
+            max_rss_kb=max_rss_kb,
+            tier=tier,
+            config=config,
+        )
+
+    def eta(self) -> tuple[int, int, float] | None:
+        """
+        Estimate the time left for the current frontier.
+
+        Returns:
+            Tuple of (candidates left, frontier size, seconds), or None if no
+            frontier was reported or no prover call has finished yet
+        """
+        with self._lock:
+            if self.frontier_size is None:
+                return None
+            mean = self.histogram.mean(self.frontier_size)
+            if mean is None:
+                return None
+            left = max(0, self.frontier_total - self.frontier_done)
+            return left, self.frontier_total, left * mean / self.jobs
+
+    def close(self) -> None:
+        """Write the latency histogram as a final event and close the stream."""
+        self.event("histogram", rows=[
+            {"size": size, "calls": calls, "mean": round(mean, 3), "max": round(peak, 3), "total": round(total, 3)}
+            for size, calls, mean, peak, total in self.histogram.rows()
+        ])
+        if self._file is not None:
+            with self._lock:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,233 @@
+"""Persistent, content-addressed cache of tamarin-prover verdicts for leak sets."""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import FrozenSet
+
+from automator.model_rules import load_model, scoped_digests
+from automator.tamarin_utils import (
+    MAIN_SPTHY_PATH,
+    RESULTS_DIR,
+    TAMARIN_FLAGS,
+    TAMARIN_TIMEOUT_MINUTES,
+    load_leak_rules,
+)
+
+VERDICT_CACHE_PATH = RESULTS_DIR / "verdicts.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    lemma       TEXT    NOT NULL,
+    leaks       TEXT    NOT NULL,
+    fingerprint TEXT    NOT NULL,
+    falsified   INTEGER NOT NULL,
+    proof_time  REAL    NOT NULL,
+    created     REAL    NOT NULL,
+    PRIMARY KEY (lemma, leaks, fingerprint)
+)
+"""
+
+_SNAPSHOT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS model_items (
+    key    TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    scope  TEXT NOT NULL
+)
+"""
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def model_fingerprint(main_spthy_path: Path = MAIN_SPTHY_PATH) -> str:
+    """
+    Hash main.spthy, ignoring the #include line and theory name.
+
+    Both are rewritten for every candidate by update_main_spthy_include, so
+    they must not change the fingerprint of the model itself.
+    """
+    with open(main_spthy_path, 'r') as f:
+        content = f.read()
+    content = re.sub(r'#include\s+"leaks/[^"]+"', '#include', content)
+    content = re.sub(r'^theory\s+leak[\w\d]+', 'theory', content, flags=re.MULTILINE)
+    return _sha256(content)
+
+
+def setup_fingerprint() -> str:
+    """Hash of the model and all leak rules, for state that is only valid for an identical setup."""
+    return _sha256(model_fingerprint() + json.dumps(load_leak_rules(), sort_keys=True))
+
+
+class VerdictCache:
+    """
+    On-disk verdict store keyed by (lemma, leak set, theory fingerprint).
+
+    Leak sets are keyed by their sorted leak names rather than a bitmask over
+    leak_rules.json order, so inserting or reordering rules in the JSON file
+    does not shift the keys of unrelated sets.
+
+    The fingerprint of a leak set covers the JSON rules of the leaks in that
+    set, the prover flags and timeout, and only the items of main.spthy that
+    can affect it (see model_rules.scoped_digests): a rule gated by
+    Leak_<X>_Allowed() counts only for sets enabling X, and a lemma only for
+    its own verdicts. Editing a leak rule or a gated rule therefore only
+    invalidates the sets that enable it, adding a leak only extends the
+    lattice, and editing one lemma keeps the verdicts of the others. Edits to
+    ungated rules, restrictions, the header or the prover flags invalidate
+    everything. Stale rows are simply never looked up again.
+
+    The item digests of the previous run are kept in the same file, so the
+    edits since then can be listed (changes) and their effect on the stored
+    verdicts counted (impact).
+    """
+
+    def __init__(self, path: Path = VERDICT_CACHE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_SNAPSHOT_SCHEMA)
+        self._conn.commit()
+
+        self.leak_rules = load_leak_rules()
+        self.model_items = load_model(set(self.leak_rules))
+        self.base_fingerprint = _sha256(json.dumps({
+            "flags": TAMARIN_FLAGS,
+            "timeout_minutes": TAMARIN_TIMEOUT_MINUTES,
+        }, sort_keys=True))
+        self.changes = self._update_snapshot()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def leak_key(leak_set: FrozenSet[str]) -> str:
+        """Canonical, order-independent key of a leak set."""
+        return ",".join(sorted(leak_set))
+
+    def fingerprint(self, lemma_name: str, leak_set: FrozenSet[str]) -> str:
+        """Fingerprint of the parts of the theory that decide a lemma on a leak set."""
+        rules = {name: self.leak_rules[name] for name in sorted(leak_set)}
+        model = scoped_digests(self.model_items, lemma_name, leak_set)
+        return _sha256(self.base_fingerprint + json.dumps([rules, model], sort_keys=True))
+
+    def _snapshot(self) -> dict[str, tuple[str, str]]:
+        """Current model items and leak rules as key -> (digest, scope)."""
+        snapshot = {item.key: (item.digest, item.scope) for item in self.model_items.values()}
+        for name, rule in self.leak_rules.items():
+            snapshot[f"leak {name}"] = (_sha256(rule), f"sets enabling {name}")
+        return snapshot
+
+    def _update_snapshot(self) -> list[tuple[str, str, str]]:
+        """
+        Compare the model and leak rules with the previous run and store the current ones.
+
+        Returns:
+            (key, "added"/"removed"/"changed", scope) per edited item; empty on
+            the first run with this cache file
+        """
+        current = self._snapshot()
+        with self._lock:
+            previous = {key: (digest, scope) for key, digest, scope in
+                        self._conn.execute("SELECT key, digest, scope FROM model_items")}
+            self._conn.execute("DELETE FROM model_items")
+            self._conn.executemany(
+                "INSERT INTO model_items VALUES (?, ?, ?)",
+                [(key, digest, scope) for key, (digest, scope) in current.items()],
+            )
+            self._conn.commit()
+        if not previous:
+            return []
+        changes = [(key, "removed", scope) for key, (_, scope) in previous.items() if key not in current]
+        for key, (digest, scope) in current.items():
+            if key not in previous:
+                changes.append((key, "added", scope))
+            elif previous[key][0] != digest:
+                changes.append((key, "changed", scope))
+        return changes
+
+    def impact(self, lemma_name: str) -> tuple[int, int]:
+        """
+        Count the leak sets with a stored verdict for a lemma.
+
+        Returns:
+            Tuple of (sets whose verdict still holds and will be replayed,
+            sets only proved under an earlier model or rules, which are proved
+            again when the search reaches them). Sets naming leaks that no
+            longer exist are not counted.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT leaks, fingerprint FROM verdicts WHERE lemma = ?", (lemma_name,)
+            ).fetchall()
+        fingerprints: dict[str, set[str]] = {}
+        for leaks, fingerprint in rows:
+            fingerprints.setdefault(leaks, set()).add(fingerprint)
+        carried = stale = 0
+        for leaks, stored in fingerprints.items():
+            leak_set = frozenset(leaks.split(",")) if leaks else frozenset()
+            if not leak_set <= set(self.leak_rules):
+                continue
+            if self.fingerprint(lemma_name, leak_set) in stored:
+                carried += 1
+            else:
+                stale += 1
+        return carried, stale
+
+    def get(self, lemma_name: str, leak_set: FrozenSet[str]) -> tuple[bool, float] | None:
+        """
+        Look up a cached verdict.
+
+        Returns:
+            Tuple of (is_falsified, proof_time), or None if the set was never
+            proved against the current model and rules
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT falsified, proof_time FROM verdicts WHERE lemma = ? AND leaks = ? AND fingerprint = ?",
+                (lemma_name, self.leak_key(leak_set), self.fingerprint(lemma_name, leak_set)),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return bool(row[0]), row[1]
+
+    def put(self, lemma_name: str, leak_set: FrozenSet[str], is_falsified: bool, proof_time: float) -> None:
+        """
+        Record a decisive verdict; committed immediately so an interrupted run keeps it.
+
+        Callers must not store results of runs that timed out or errored.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)",
+                (lemma_name, self.leak_key(leak_set), self.fingerprint(lemma_name, leak_set),
+                 int(is_falsified), proof_time, time.time()),
+            )
+            self._conn.commit()
+
+    def falsified_sets(self, lemma_name: str) -> list[FrozenSet[str]]:
+        """
+        Every leak set ever recorded as falsifying a lemma, under any fingerprint.
+
+        Rows of an older model or older rules are included, so the result is
+        only a hint (e.g. warm-start seeds) and must be proved again.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT leaks FROM verdicts WHERE lemma = ? AND falsified = 1",
+                (lemma_name,),
+            ).fetchall()
+        return [frozenset(leaks.split(",")) if leaks else frozenset() for (leaks,) in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,150 @@
+"""One-time well-formedness and derivation checks, run before the per-candidate proofs."""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import FrozenSet
+
+from automator.tamarin_utils import (
+    RESULTS_DIR,
+    TAMARIN_FLAGS,
+    get_leak_catalog,
+    render_theory,
+    run_tamarin_prover,
+)
+from automator.verdict_cache import model_fingerprint
+
+WELLFORMEDNESS_DIR = RESULTS_DIR / "wellformedness"
+WELLFORMEDNESS_MANIFEST = WELLFORMEDNESS_DIR / "manifest.json"
+WELLFORMEDNESS_TIMEOUT_MINUTES = 10
+
+
+@dataclass
+class CheckResult:
+    """Outcome of loading one theory with tamarin-prover (no lemma proved)."""
+    name: str
+    leaks: list[str]
+    fingerprint: str
+    ok: bool
+    warnings: list[str]
+    output: str
+
+
+def check_targets(leak_list: list[str]) -> list[tuple[str, FrozenSet[str]]]:
+    """
+    Theories checked by the stage: the model with every leak enabled, and the
+    model with each single leak enabled, so that a new or edited leak rule only
+    re-checks its own theory.
+    """
+    catalog = get_leak_catalog()
+    targets = [("all", frozenset(leak_list))]
+    targets += [(catalog.theory_suffix(frozenset([leak])), frozenset([leak])) for leak in leak_list]
+    return targets
+
+
+def check_fingerprint(leak_set: FrozenSet[str], base: str) -> str:
+    """Fingerprint of a checked theory: the model, the prover flags and the enabled rules."""
+    catalog = get_leak_catalog()
+    rules = {name: catalog.rules[name] for name in catalog.ordered(leak_set)}
+    return hashlib.sha256((base + json.dumps(rules, sort_keys=True)).encode()).hexdigest()
+
+
+def extract_warnings(output: str) -> list[str]:
+    """Lines of tamarin-prover output reporting failed well-formedness or derivation checks."""
+    return [line.strip() for line in output.splitlines() if "WARNING" in line or "Derivation checks timed out" in line]
+
+
+def _run_check(name: str, leak_set: FrozenSet[str], fingerprint: str) -> CheckResult:
+    theories_dir = WELLFORMEDNESS_DIR / "theories"
+    theories_dir.mkdir(parents=True, exist_ok=True)
+    theory_file = f"{name}.spthy"
+    with open(theories_dir / theory_file, 'w') as f:
+        f.write(render_theory(leak_set))
+
+    output_file = WELLFORMEDNESS_DIR / f"{name}.out"
+    stdout, stderr, return_code, _ = run_tamarin_prover(
+        None,
+        cwd=theories_dir,
+        theory_file=theory_file,
+        stdout_path=output_file,
+        timeout_minutes=WELLFORMEDNESS_TIMEOUT_MINUTES,
+    )
+    if stderr:
+        with open(output_file, 'a') as f:
+            f.write(stderr)
+
+    return CheckResult(
+        name=name,
+        leaks=get_leak_catalog().ordered(leak_set),
+        fingerprint=fingerprint,
+        ok=return_code == 0,
+        warnings=extract_warnings(stdout + stderr),
+        output=str(output_file),
+    )
+
+
+def run_wellformedness_stage(leak_list: list[str], jobs: int = 1) -> list[CheckResult]:
+    """
+    Check the model once per rule set and write results/wellformedness/report.txt.
+
+    Theories that loaded are kept in a manifest keyed by fingerprint, so
+    theories whose model, flags and rules are unchanged since an earlier run
+    are not loaded again. Failed or timed-out loads are checked again next time.
+
+    Args:
+        leak_list: Leak names considered by the analysis
+        jobs: Number of theories loaded in parallel
+
+    Returns:
+        One CheckResult per theory of check_targets, the full leak set first
+    """
+    manifest: dict[str, dict] = {}
+    if WELLFORMEDNESS_MANIFEST.exists():
+        with open(WELLFORMEDNESS_MANIFEST, 'r') as f:
+            manifest = json.load(f)
+
+    base = model_fingerprint() + json.dumps(TAMARIN_FLAGS)
+    targets = [(name, leak_set, check_fingerprint(leak_set, base)) for name, leak_set in check_targets(leak_list)]
+    pending = [target for target in targets if target[2] not in manifest]
+
+    print(f"[Well-formedness] {len(targets) - len(pending)} of {len(targets)} theories already checked, "
+          f"loading {len(pending)}...")
+    checked = {fingerprint: CheckResult(**manifest[fingerprint]) for _, _, fingerprint in targets
+               if fingerprint in manifest}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for result in executor.map(lambda target: _run_check(*target), pending):
+            checked[result.fingerprint] = result
+            if result.ok:
+                manifest[result.fingerprint] = asdict(result)
+
+    WELLFORMEDNESS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = WELLFORMEDNESS_MANIFEST.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, WELLFORMEDNESS_MANIFEST)
+
+    results = [checked[fingerprint] for _, _, fingerprint in targets]
+    write_wellformedness_report(results)
+    return results
+
+
+def write_wellformedness_report(results: list[CheckResult]) -> Path:
+    """Write the warnings of every checked theory to results/wellformedness/report.txt."""
+    report_file = WELLFORMEDNESS_DIR / "report.txt"
+    with open(report_file, 'w') as f:
+        f.write("=" * 80 + "\n")
+        f.write("WELL-FORMEDNESS AND DERIVATION CHECKS\n")
+        f.write("=" * 80 + "\n\n")
+        for result in results:
+            status = "ok" if result.ok else "FAILED TO LOAD"
+            f.write(f"{result.name}: {status}, {len(result.warnings)} warning line(s)\n")
+            f.write(f"  Leaks: {', '.join(result.leaks)}\n")
+            f.write(f"  Output: {result.output}\n")
+            for warning in result.warnings:
+                f.write(f"    {warning}\n")
+            f.write("\n")
+        f.write("=" * 80 + "\n")
+    return report_file
@@ -11,9 +11,23 @@ This script:
 import argparse
 import time
 from pathlib import Path
-from typing import Callable, FrozenSet
+from typing import Callable, FrozenSet, Sequence
 
-from automator.min_cut_set import enumerate_minimal_satisfying_cutsets
+from automator.batch import BatchSearch, LemmaResult
+from automator.checkpoint import CHECKPOINT_DIR, CHECKPOINT_INTERVAL_SECONDS, Checkpoint
+from automator.label_order import LABEL_ORDER_JSON, LABEL_ORDERS, plan_label_order
+from automator.distributed import LEASE_SECONDS, Coordinator
+from automator.min_cut_set import (
+    SHRINK_STRATEGIES,
+    LabelIndex,
+    LabelOrder,
+    enumerate_levelwise,
+    enumerate_marco,
+    enumerate_minimal_satisfying_cutsets,
+    set_checkpoint_callback,
+    set_frontier_callback,
+    set_inference_callback,
+)
 
 RED = '\033[91m'
 GREEN = '\033[92m'
@@ -24,12 +38,27 @@ RESET = '\033[0m'
 
 from automator.tamarin_utils import (
     generate_summary_report,
+    get_leak_catalog,
     get_leak_filename,
     load_leak_rules,
+    prove_leak_set,
+    prove_leak_set_lemmas,
     reset_progress_counter,
-    security_predicate,
+    set_portfolio,
+    set_prechecked,
     set_progress_callback,
+    set_telemetry,
+    set_verdict_cache,
+    TAMARIN_RETRY_TIERS,
+    TamarinWorkerPool,
+    Verdict,
 )
+from automator.portfolio import PORTFOLIO_CONFIGS, ProverPortfolio
+from automator.retry_scheduler import RetryScheduler
+from automator.seeds import load_seeds
+from automator.telemetry import TELEMETRY_DIR, Telemetry
+from automator.verdict_cache import VERDICT_CACHE_PATH, VerdictCache
+from automator.wellformedness import WELLFORMEDNESS_DIR, run_wellformedness_stage
 
 
 def apply_test_mode_limit_leaks(leak_rules: dict[str, str], limit: int) -> list[str]:
@@ -50,21 +79,144 @@ def apply_test_mode_limit_leaks(leak_rules: dict[str, str], limit: int) -> list[
     return leak_list
 
 
+def verdict_text(result: Verdict) -> str:
+    """Colored verdict for the progress lines."""
+    if result is Verdict.FALSIFIED:
+        return f"{RED}FALSIFIED{RESET}"
+    if result is Verdict.VERIFIED:
+        return f"{GREEN}verified{RESET}"
+    return f"{YELLOW}UNKNOWN{RESET} (no verdict, will be retried with a larger budget)"
+
+
+def make_progress_callback(
+    lemma_name: str,
+    jobs: int,
+    telemetry: Telemetry,
+    analysis_start_time: float,
+) -> Callable[[int, FrozenSet[str], Verdict | dict[str, Verdict] | None], None]:
+    """
+    Build the callback printing one line per started and finished prover run,
+    with the elapsed time every 10 runs and the ETA of the current set size.
+
+    Args:
+        lemma_name: Lemma whose stdout directory is shown (a placeholder in batch mode)
+        jobs: Number of workers; with several, result lines are tagged with the test number
+        telemetry: Source of the ETA
+        analysis_start_time: Start of the analysis, for the elapsed time
+    """
+    catalog = get_leak_catalog()
+
+    def progress_callback(counter: int, leak_set: FrozenSet[str], result: Verdict | dict[str, Verdict] | None) -> None:
+        leak_names = catalog.ordered(leak_set)
+        base_name = get_leak_filename(leak_set).replace(".spthy", "")
+
+        num = str(counter)
+        pad = " " * max(0, 4 - len(num)) 
+        prefix = f"  {pad}[{num}] "
+        # with several workers the result lines interleave, so tag them with the test number
+        cont = " " * len(prefix) if jobs == 1 else prefix
+
+        stdout_path = Path("results") / "stdout" / lemma_name / f"{base_name}.stdout"
+    
+        if result is None:
+            print(f"{prefix}Test set: {BLUE}{{{', '.join(leak_names)}}}{RESET}")
+            print(f"{cont}Stdout: {stdout_path}")
+        else:
+            if isinstance(result, dict):
+                result_text = ", ".join(f"{name} {verdict_text(verdict)}" for name, verdict in result.items())
+            else:
+                result_text = verdict_text(result)
+            print(f"{cont}Result: {result_text}\n")
+        
+            if counter > 0 and counter % 10 == 0:
+                elapsed = time.time() - analysis_start_time
+                minutes = int(elapsed // 60)
+                seconds = int(elapsed % 60)
+            
+                avg_time_per_test = elapsed / counter
+                avg_seconds = int(avg_time_per_test)
+                avg_ms = int((avg_time_per_test - avg_seconds) * 1000)
+            
+                elapsed_str = f"{minutes}m {seconds}s"
+                avg_str = f"{avg_seconds}s {avg_ms}ms" if avg_ms > 0 else f"{avg_seconds}s"
+            
+                print(f"[Progress] {counter} tests completed | Elapsed: {elapsed_str} | Avg: {avg_str}/test")
+
+                eta = telemetry.eta()
+                if eta is not None:
+                    left, total, eta_seconds = eta
+                    est_minutes = int(eta_seconds // 60)
+                    est_seconds = int(eta_seconds % 60)
+                    est_hours = int(est_minutes // 60)
+                    est_minutes = est_minutes % 60
+
+                    if est_hours > 0:
+                        est_str = f"{est_hours}h {est_minutes}m {est_seconds}s"
+                    elif est_minutes > 0:
+                        est_str = f"{est_minutes}m {est_seconds}s"
+                    else:
+                        est_str = f"{est_seconds}s"
+
+                    print(f"          Size {telemetry.frontier_size}: {left} of {total} candidate(s) left, "
+                          f"estimated {est_str} for this size")
+                print()
+
+    return progress_callback
+
+
 def run_analysis(
     lemma_name: str,
     leak_list: list[str],
-    predicate: Callable[[FrozenSet[str]], bool] | None = None
-) -> list[FrozenSet[str]]:
+    predicate: Callable[[FrozenSet[str]], bool] | None = None,
+    jobs: int = 1,
+    min_size: int | None = None,
+    verdict_cache: VerdictCache | None = None,
+    shrink_strategy: str | None = None,
+    search: str = "levelwise",
+    max_tier: int = len(TAMARIN_RETRY_TIERS) - 1,
+    telemetry: Telemetry | None = None,
+    portfolio: ProverPortfolio | None = None,
+    precheck: bool = True,
+    seeds: list[FrozenSet[str]] | None = None,
+    coordinator: Coordinator | None = None,
+    checkpoint: Checkpoint | None = None,
+    label_order: LabelOrder | None = None,
+) -> tuple[list[FrozenSet[str]], list[FrozenSet[str]], list[FrozenSet[str]]]:
     """
     Run the main analysis to find minimal mincutsets.
     
     Args:
         lemma_name: Name of the lemma to test
-        leak_list: List of leak names to consider
-        predicate: Optional custom predicate function. If None, uses default security_predicate.
+        leak_list: List of leak names to consider, in the order the search explores them
+        predicate: Optional custom predicate function. If None, leak sets are proved with
+            tamarin-prover through a RetryScheduler.
+        jobs: Number of tamarin-prover workers running in parallel
+        min_size: [TEST MODE] Treat sets smaller than this as not violating, without proving them
+        verdict_cache: Optional persistent cache of tamarin verdicts (only used with the default predicate)
+        shrink_strategy: How falsifying sets are minimised, a key of SHRINK_STRATEGIES
+            (default: linear for dfs, quickxplain for marco)
+        search: Enumerator to use, "levelwise" (breadth-first, each candidate once),
+            "dfs" (iterative deepening) or "marco" (dual enumeration)
+        max_tier: Highest tier of TAMARIN_RETRY_TIERS at which undecided sets are retried
+            (0 disables retries)
+        telemetry: Optional per-call event recorder; an in-memory one is used for the ETA
+            when omitted
+        portfolio: Optional prover configurations to race on every leak set
+        precheck: Run the well-formedness and derivation checks once up front and prove
+            every candidate with them turned off (only used with the default predicate)
+        seeds: Optional leak sets believed to be minimal cut-sets (see automator.seeds);
+            each is proved and shrunk before the search, which then skips its supersets
+        coordinator: Optional work queue (see automator.distributed); leak sets are then
+            proved by remote workers instead of local tamarin-prover runs
+        checkpoint: Optional checkpoint receiving the search state and every verdict; if it
+            was loaded, the search resumes from its state and replays its verdicts
+        label_order: Optional dynamic label ordering for the dfs and marco searches
+            (see automator.label_order)
     
     Returns:
-        List of minimal mincutsets that violate the security property
+        Tuple of (minimal mincutsets that violate the security property,
+        maximal leak sets for which the property holds; only filled by the marco search,
+        leak sets that stayed undecided after every retry tier)
     """
     print(f"{'='*80}")
     print(f"Analysis Configuration")
@@ -72,6 +224,34 @@ def run_analysis(
     print(f"  Security property (lemma): {lemma_name}")
     print(f"  Available leak types: {len(leak_list)}")
     print(f"  Leaks: {', '.join(leak_list)}")
+    print(f"  Parallel workers: {jobs}")
+    if shrink_strategy is None:
+        shrink_strategy = "quickxplain" if search == "marco" else "linear"
+    print(f"  Search: {search}")
+    print(f"  Shrink strategy: {shrink_strategy}")
+    if predicate is None:
+        tiers = ", ".join(f"{timeout} min/-c={bound}" for timeout, bound in TAMARIN_RETRY_TIERS[:max_tier + 1])
+        print(f"  Prover tiers: {tiers}")
+    if verdict_cache is not None:
+        print(f"  Verdict cache: {verdict_cache.path}")
+        for key, change, scope in verdict_cache.changes:
+            print(f"    {change} since last run: {key} (affects {scope})")
+        carried, stale = verdict_cache.impact(lemma_name)
+        print(f"    {carried} cached leak set(s) carried forward, {stale} to re-verify when reached")
+    if telemetry is not None and telemetry.path is not None:
+        print(f"  Telemetry: {telemetry.path}")
+    if portfolio is not None:
+        print(f"  Portfolio: {', '.join(name for name, _ in portfolio.ranked(lemma_name))}")
+    if seeds:
+        print(f"  Warm-start seeds: {len(seeds)}")
+    if coordinator is not None:
+        host, port = coordinator.address
+        print(f"  Coordinator: {host}:{port} (start workers with python3 -m automator.distributed "
+              f"--coordinator {host}:{port})")
+    if checkpoint is not None:
+        print(f"  Checkpoint: {checkpoint.path} (every {checkpoint.interval:g}s)")
+        if checkpoint.state is not None:
+            print(f"    resuming with {len(checkpoint.verdicts)} logged verdict(s)")
     
     if leak_list:
         example_set = frozenset(leak_list)
@@ -88,104 +268,353 @@ def run_analysis(
     
     analysis_start_time = time.time()
     
-    leak_rules = load_leak_rules()
-    json_order = list(leak_rules.keys())
-    
-    def progress_callback(counter: int, leak_set: FrozenSet[str], result: bool | None) -> None:
-        leak_names = [name for name in json_order if name in leak_set]
-        base_name = get_leak_filename(leak_set).replace(".spthy", "")
+    catalog = get_leak_catalog(refresh=True)
 
-        num = str(counter)
-        pad = " " * max(0, 4 - len(num)) 
-        prefix = f"  {pad}[{num}] "
-        cont = " " * len(prefix)
+    if telemetry is None:
+        telemetry = Telemetry(None, lemma_name, jobs)
+    telemetry.event("run_start", search=search, jobs=jobs, leaks=leak_list, max_tier=max_tier)
+    if predicate is None and precheck:
+        checks = run_wellformedness_stage(leak_list, jobs)
+        warned = [check for check in checks if check.warnings or not check.ok]
+        print(f"[Well-formedness] {len(checks)} theories checked, {len(warned)} with warnings or errors "
+              f"(see {WELLFORMEDNESS_DIR / 'report.txt'})\n")
+        if not checks[0].ok:
+            raise RuntimeError(f"tamarin-prover could not load the model with all leaks enabled, see {checks[0].output}")
+        set_prechecked(True)
+        if coordinator is not None:
+            coordinator.prechecked = True
 
-        stdout_path = Path("results") / "stdout" / lemma_name / f"{base_name}.stdout"
-        
-        if result is None:
-            print(f"{prefix}Test set: {BLUE}{{{', '.join(leak_names)}}}{RESET}")
-            print(f"{cont}Stdout: {stdout_path}")
-        else:
-            if result:
-                result_text = f"{RED}FALSIFIED{RESET}"
-            else:
-                result_text = f"{GREEN}verified{RESET}"
-            print(f"{cont}Result: {result_text}\n")
-            
-            if counter > 0 and counter % 10 == 0:
-                elapsed = time.time() - analysis_start_time
-                minutes = int(elapsed // 60)
-                seconds = int(elapsed % 60)
-                
-                avg_time_per_test = elapsed / counter
-                avg_seconds = int(avg_time_per_test)
-                avg_ms = int((avg_time_per_test - avg_seconds) * 1000)
-                
-                total_combinations = 2 ** len(leak_list)
-                
-                estimated_total_time = avg_time_per_test * total_combinations
-                est_minutes = int(estimated_total_time // 60)
-                est_seconds = int(estimated_total_time % 60)
-                est_hours = int(est_minutes // 60)
-                est_minutes = est_minutes % 60
-                
-                elapsed_str = f"{minutes}m {seconds}s"
-                avg_str = f"{avg_seconds}s {avg_ms}ms" if avg_ms > 0 else f"{avg_seconds}s"
-                
-                if est_hours > 0:
-                    est_str = f"{est_hours}h {est_minutes}m {est_seconds}s"
-                elif est_minutes > 0:
-                    est_str = f"{est_minutes}m {est_seconds}s"
-                else:
-                    est_str = f"{est_seconds}s"
-                
-                print(f"[Progress] {counter} tests completed | Elapsed: {elapsed_str} | Avg: {avg_str}/test")
-                print(f"          Estimated time for {total_combinations} combinations: {est_str}\n")
+    set_telemetry(telemetry)
+    set_portfolio(portfolio)
+    set_frontier_callback(telemetry.set_frontier)
+
+    def record_inferred(leak_set: FrozenSet[str], is_falsified: bool) -> None:
+        telemetry.record_call(leak_set, "falsified" if is_falsified else "verified", "inferred")
+
+    set_inference_callback(record_inferred)
     
-    set_progress_callback(progress_callback)
+    set_progress_callback(make_progress_callback(lemma_name, jobs, telemetry, analysis_start_time))
     
+    pool = TamarinWorkerPool(lemma_name, jobs) if jobs > 1 and coordinator is None else None
+    scheduler = None
+
+    if coordinator is not None:
+        coordinator.telemetry = telemetry
+        coordinator.verdict_cache = verdict_cache
+
     if predicate is None:
-        def predicate(leak_set: FrozenSet[str]) -> bool:
-            return security_predicate(leak_set, lemma_name)
+        if coordinator is not None:
+            prove = coordinator.prove
+        elif pool is not None:
+            prove = pool.prove
+        else:
+            def prove(leak_set: FrozenSet[str], tier: int) -> Verdict:
+                return prove_leak_set(leak_set, lemma_name, tier=tier)
 
-    predicate_cache: dict[FrozenSet[str], bool] = {}
+        if verdict_cache is not None:
+            # prove_leak_set stores decisive verdicts; replay them here before proving
+            set_verdict_cache(verdict_cache)
+            uncached_prove = prove
+            def prove(leak_set: FrozenSet[str], tier: int) -> Verdict:
+                cached = verdict_cache.get(lemma_name, leak_set)
+                if cached is not None:
+                    cached_res, proof_time = cached
+                    leak_names = catalog.ordered(leak_set)
+                    cached_text = f"{RED}FALSIFIED{RESET}" if cached_res else f"{GREEN}verified{RESET}"
+                    print(f"      {YELLOW}[Replayed]{RESET} {BLUE}{{{', '.join(leak_names)}}}{RESET} -> {cached_text} (proved in {proof_time:.1f}s)\n")
+                    telemetry.record_call(leak_set, "falsified" if cached_res else "verified", "verdict_cache", proof_time)
+                    return Verdict.FALSIFIED if cached_res else Verdict.VERIFIED
+                return uncached_prove(leak_set, tier)
 
-    def memoized_predicate(leak_set: FrozenSet[str]) -> bool:
-        if leak_set in predicate_cache:
-            cached_res = predicate_cache[leak_set]
-            leak_names = [name for name in json_order if name in leak_set]
+        if min_size:
+            unlimited_prove = prove
+            def prove(leak_set: FrozenSet[str], tier: int) -> Verdict:
+                if len(leak_set) < min_size:
+                    return Verdict.VERIFIED
+                return unlimited_prove(leak_set, tier)
+
+        scheduler = RetryScheduler(
+            prove,
+            LabelIndex(leak_list),
+            map_fn=coordinator.map if coordinator is not None else pool.map if pool is not None else None,
+            max_tier=max_tier,
+            on_inferred=record_inferred,
+        )
+        predicate = scheduler
+        batch_predicate = scheduler.run
+    else:
+        if min_size:
+            prover = predicate
+            def predicate(leak_set: FrozenSet[str]) -> bool:
+                if len(leak_set) < min_size:
+                    return False
+                return prover(leak_set)
+
+        batch_predicate = (lambda leak_sets: pool.map(leak_sets, predicate)) if pool is not None else None
+
+    # keyed by leak bitmask over JSON order
+    leak_index = catalog.index
+    predicate_cache: dict[int, bool] = {}
+    resume = None
+    if checkpoint is not None:
+        resume = checkpoint.state
+        predicate_cache.update(checkpoint.verdicts)
+        set_checkpoint_callback(checkpoint.save_search)
+
+    def memoized_predicate(leak_set: FrozenSet[str]) -> bool | None:
+        mask = leak_index.mask(leak_set)
+        if mask in predicate_cache:
+            cached_res = predicate_cache[mask]
+            leak_names = catalog.ordered(leak_set)
             cached_text = f"{RED}FALSIFIED{RESET}" if cached_res else f"{GREEN}verified{RESET}"
             print(f"      {YELLOW}[Cache hit]{RESET} {BLUE}{{{', '.join(leak_names)}}}{RESET} -> {cached_text}\n")
+            telemetry.record_call(leak_set, "falsified" if cached_res else "verified", "memo")
             return cached_res
         res = predicate(leak_set)
-        predicate_cache[leak_set] = res
+        if res is not None:
+            # an undecided set is proved again if the search asks for it after a restart
+            predicate_cache[mask] = res
+            if checkpoint is not None:
+                checkpoint.record(mask, res)
         return res
+
+    def memoized_batch_predicate(leak_sets: Sequence[FrozenSet[str]]) -> list[bool | None]:
+        masks = [leak_index.mask(s) for s in leak_sets]
+        pending = {m: s for m, s in zip(masks, leak_sets) if m not in predicate_cache}
+        results = dict(zip(pending, batch_predicate(list(pending.values())))) if pending else {}
+        for m, res in results.items():
+            if res is not None:
+                predicate_cache[m] = res
+                if checkpoint is not None:
+                    checkpoint.record(m, res)
+        return [predicate_cache.get(m, results.get(m)) for m in masks]
     
     def shrink_callback(stage: str, original_set: FrozenSet[str], minimal_set: FrozenSet[str] | None) -> None:
+        telemetry.set_phase("shrink" if stage == "start" else "search")
         if stage == "start":
-            leak_names = [name for name in json_order if name in original_set]
+            leak_names = catalog.ordered(original_set)
             print(f"  [Shrinking] Found falsifying set with {len(original_set)} leaks: {', '.join(leak_names)}")
             print("  [Shrinking] Attempting to find minimal subset...\n")
             return
 
         if stage == "done" and minimal_set is not None:
-            leak_names = [name for name in json_order if name in minimal_set]
+            leak_names = catalog.ordered(minimal_set)
             filename = get_leak_filename(minimal_set)
             stdout_path = Path("results") / "stdout" / lemma_name / f"{filename.replace('.spthy', '')}.stdout"
             print(f"  [Shrinking] Complete -> minimal set size {len(minimal_set)}: {', '.join(leak_names)}")
             print(f"              Stdout: {stdout_path}\n")
             return
     
-    minimal_mincutsets = enumerate_minimal_satisfying_cutsets(
+    try:
+        if search == "levelwise":
+            minimal_mincutsets = enumerate_levelwise(
+                leak_list,
+                memoized_predicate,
+                batch_predicate=memoized_batch_predicate if batch_predicate is not None else None,
+                seeds=seeds or (),
+                resume=resume,
+            )
+            maximal_verified = []
+        elif search == "marco":
+            minimal_mincutsets, maximal_verified = enumerate_marco(
+                leak_list,
+                memoized_predicate,
+                shrink_callback,
+                shrink_strategy=shrink_strategy,
+                seeds=seeds or (),
+                resume=resume,
+                label_order=label_order,
+            )
+        else:
+            minimal_mincutsets = enumerate_minimal_satisfying_cutsets(
+                leak_list,
+                memoized_predicate,
+                shrink_callback,
+                batch_predicate=memoized_batch_predicate if batch_predicate is not None else None,
+                shrink_strategy=shrink_strategy,
+                seeds=seeds or (),
+                resume=resume,
+                label_order=label_order,
+            )
+            maximal_verified = []
+    finally:
+        if checkpoint is not None:
+            set_checkpoint_callback(None)
+            checkpoint.flush()
+        if pool is not None:
+            pool.close()
+        set_telemetry(None)
+        set_portfolio(None)
+        set_prechecked(False)
+        set_frontier_callback(None)
+        set_inference_callback(None)
+
+    if checkpoint is not None:
+        print(f"[Checkpoint] Search finished after {checkpoint.saves} checkpoint(s), removed {checkpoint.path}")
+        checkpoint.remove()
+
+    rows = telemetry.histogram.rows()
+    if rows:
+        print(f"[Telemetry] Prover wall time by set size:")
+        print(f"            {'size':>4} {'calls':>6} {'mean s':>8} {'max s':>8} {'total s':>9}")
+        for size, calls, mean, peak, total in rows:
+            print(f"            {size:>4} {calls:>6} {mean:>8.1f} {peak:>8.1f} {total:>9.1f}")
+    telemetry.close()
+
+    if portfolio is not None and portfolio.wins.get(lemma_name):
+        wins = sorted(portfolio.wins[lemma_name].items(), key=lambda item: -item[1])
+        print(f"[Portfolio] Wins for {lemma_name} (all runs): {', '.join(f'{name}: {count}' for name, count in wins)}")
+
+    if verdict_cache is not None:
+        set_verdict_cache(None)
+        print(f"[Verdict cache] {verdict_cache.hits} replayed, {verdict_cache.misses} proved")
+
+    undecided = []
+    if scheduler is not None:
+        if any(scheduler.retries[1:]):
+            retried = ", ".join(f"tier {tier}: {count}" for tier, count in enumerate(scheduler.retries) if tier > 0)
+            print(f"[Retry] Re-runs per tier ({retried}), {scheduler.inferred} resolved by monotonicity, "
+                  f"{len(scheduler.undecided)} still undecided")
+        undecided = scheduler.undecided
+    
+    return minimal_mincutsets, maximal_verified, undecided
+
+
+def run_batch_analysis(
+    lemma_names: list[str],
+    leak_list: list[str],
+    jobs: int = 1,
+    min_size: int | None = None,
+    verdict_cache: VerdictCache | None = None,
+    max_tier: int = len(TAMARIN_RETRY_TIERS) - 1,
+    telemetry: Telemetry | None = None,
+    precheck: bool = True,
+) -> dict[str, LemmaResult]:
+    """
+    Find the minimal mincutsets of several lemmas in one level-wise search (see automator.batch).
+
+    Each candidate theory is generated once and proved for every lemma that
+    still needs it in a single tamarin-prover run.
+
+    Args:
+        lemma_names: Names of the lemmas to test
+        leak_list: List of leak names to consider
+        jobs: Number of tamarin-prover workers running in parallel
+        min_size: [TEST MODE] Treat sets smaller than this as not violating, without proving them
+        verdict_cache: Optional persistent cache of tamarin verdicts, looked up per lemma
+        max_tier: Highest tier of TAMARIN_RETRY_TIERS at which undecided sets are retried
+        telemetry: Optional per-call event recorder; an in-memory one is used for the ETA
+            when omitted
+        precheck: Run the well-formedness and derivation checks once up front
+
+    Returns:
+        Dict mapping each lemma name to its LemmaResult
+    """
+    print(f"{'='*80}")
+    print(f"Analysis Configuration")
+    print(f"{'='*80}")
+    print(f"  Security properties (lemmas): {', '.join(lemma_names)}")
+    print(f"  Available leak types: {len(leak_list)}")
+    print(f"  Leaks: {', '.join(leak_list)}")
+    print(f"  Parallel workers: {jobs}")
+    print(f"  Search: levelwise, one prover run per candidate for all lemmas")
+    tiers = ", ".join(f"{timeout} min/-c={bound}" for timeout, bound in TAMARIN_RETRY_TIERS[:max_tier + 1])
+    print(f"  Prover tiers: {tiers}")
+    if verdict_cache is not None:
+        print(f"  Verdict cache: {verdict_cache.path}")
+        for key, change, scope in verdict_cache.changes:
+            print(f"    {change} since last run: {key} (affects {scope})")
+        for lemma_name in lemma_names:
+            carried, stale = verdict_cache.impact(lemma_name)
+            print(f"    {lemma_name}: {carried} cached leak set(s) carried forward, {stale} to re-verify when reached")
+    if telemetry is not None and telemetry.path is not None:
+        print(f"  Telemetry: {telemetry.path}")
+
+    print(f"\n{'='*80}")
+    print(f"Starting Search")
+    print(f"{'='*80}")
+    print(f"Finding min-cut sets that violate {', '.join(f'{PURPLE}{name}{RESET}' for name in lemma_names)}.\n")
+
+    reset_progress_counter()
+    analysis_start_time = time.time()
+    catalog = get_leak_catalog(refresh=True)
+
+    if telemetry is None:
+        telemetry = Telemetry(None, "+".join(lemma_names), jobs)
+    telemetry.event("run_start", search="batch", lemmas=lemma_names, jobs=jobs, leaks=leak_list, max_tier=max_tier)
+    if precheck:
+        checks = run_wellformedness_stage(leak_list, jobs)
+        warned = [check for check in checks if check.warnings or not check.ok]
+        print(f"[Well-formedness] {len(checks)} theories checked, {len(warned)} with warnings or errors "
+              f"(see {WELLFORMEDNESS_DIR / 'report.txt'})\n")
+        if not checks[0].ok:
+            raise RuntimeError(f"tamarin-prover could not load the model with all leaks enabled, see {checks[0].output}")
+        set_prechecked(True)
+
+    set_telemetry(telemetry)
+    set_progress_callback(make_progress_callback("<lemma>", jobs, telemetry, analysis_start_time))
+    if verdict_cache is not None:
+        set_verdict_cache(verdict_cache)
+
+    pool = TamarinWorkerPool("+".join(lemma_names), jobs) if jobs > 1 else None
+    uncached_prove = pool.prove_lemmas if pool is not None else (
+        lambda leak_set, names, tier: prove_leak_set_lemmas(leak_set, names, tier=tier)
+    )
+
+    # lemmas proved per prover run, to report the start-ups saved
+    run_sizes: list[int] = []
+
+    def prove(leak_set: FrozenSet[str], names: list[str], tier: int) -> dict[str, Verdict]:
+        if min_size and len(leak_set) < min_size:
+            return {name: Verdict.VERIFIED for name in names}
+        verdicts = {}
+        if verdict_cache is not None:
+            for name in names:
+                cached = verdict_cache.get(name, leak_set)
+                if cached is not None:
+                    cached_res, proof_time = cached
+                    verdicts[name] = Verdict.FALSIFIED if cached_res else Verdict.VERIFIED
+                    print(f"      {YELLOW}[Replayed]{RESET} {BLUE}{{{', '.join(catalog.ordered(leak_set))}}}{RESET} "
+                          f"{name} -> {verdict_text(verdicts[name])} (proved in {proof_time:.1f}s)\n")
+                    telemetry.record_call(leak_set, verdicts[name].value, "verdict_cache", proof_time)
+        missing = [name for name in names if name not in verdicts]
+        if missing:
+            run_sizes.append(len(missing))
+            verdicts.update(uncached_prove(leak_set, missing, tier))
+        return verdicts
+
+    search = BatchSearch(
+        lemma_names,
         leak_list,
-        memoized_predicate,
-        shrink_callback,
+        prove,
+        map_fn=(lambda fn, items: pool.map(items, fn)) if pool is not None else None,
+        max_tier=max_tier,
+        on_frontier=telemetry.set_frontier,
     )
-    
-    return minimal_mincutsets
+    try:
+        results = search.run()
+    finally:
+        if pool is not None:
+            pool.close()
+        set_telemetry(None)
+        set_prechecked(False)
+        set_verdict_cache(None)
+    telemetry.close()
+
+    print(f"[Batch] {len(run_sizes)} prover run(s) for {sum(run_sizes)} lemma proof(s), "
+          f"{sum(run_sizes) - len(run_sizes)} start-up(s) saved by proving lemmas together")
+    if verdict_cache is not None:
+        print(f"[Verdict cache] {verdict_cache.hits} replayed, {verdict_cache.misses} proved")
+    return results
 
 
-def display_results(lemma_name: str, minimal_mincutsets: list[FrozenSet[str]], leak_list: list[str]) -> None:
+def display_results(
+    lemma_name: str,
+    minimal_mincutsets: list[FrozenSet[str]],
+    leak_list: list[str],
+    maximal_verified: list[FrozenSet[str]] | None = None,
+    undecided: list[FrozenSet[str]] | None = None,
+) -> None:
     """
     Display found mincutsets and generate summary report.
     
@@ -193,16 +622,19 @@ def display_results(lemma_name: str, minimal_mincutsets: list[FrozenSet[str]], l
         lemma_name: Name of the lemma tested
         minimal_mincutsets: List of found minimal mincutsets
         leak_list: List of all leak types considered
+        maximal_verified: Optional list of maximal leak sets for which the property holds
+        undecided: Optional list of leak sets tamarin-prover could not decide at any retry tier
     """
+    catalog = get_leak_catalog()
+
     print(f"\n{'='*80}")
     print(f"Results Summary")
     print(f"{'='*80}")
     print(f"Found {len(minimal_mincutsets)} minimal mincutset(s) that violate '{lemma_name}':\n")
     
     if minimal_mincutsets:
-        json_order = list(load_leak_rules().keys())
         for idx, mincutset in enumerate(minimal_mincutsets, start=1):
-            leak_names = [name for name in json_order if name in mincutset]
+            leak_names = catalog.ordered(mincutset)
             filename = get_leak_filename(mincutset)
 
             base_name = filename.replace(".spthy", "")
@@ -212,11 +644,29 @@ def display_results(lemma_name: str, minimal_mincutsets: list[FrozenSet[str]], l
             print(f"      Size: {len(mincutset)} leak(s)")
             print(f"      Stdout: {stdout_path}\n")
         
-        report_file = generate_summary_report(lemma_name, minimal_mincutsets, leak_list)
-        print(f"  Summary report: {report_file}")
     else:
         print(f"  No minimal mincutsets found - security property holds for all leak combinations.")
 
+    if maximal_verified:
+        print(f"\nFound {len(maximal_verified)} maximal leak set(s) for which '{lemma_name}' holds:\n")
+        for idx, leak_set in enumerate(maximal_verified, start=1):
+            leak_names = catalog.ordered(leak_set)
+            print(f"  [{idx}] {', '.join(leak_names) or '(no leaks)'}")
+            print(f"      Size: {len(leak_set)} leak(s)\n")
+
+    if undecided:
+        print(f"\n{YELLOW}{len(undecided)} leak set(s) stayed undecided after every retry{RESET} "
+              f"for '{lemma_name}' - minimal sets among them may be missing:\n")
+        for idx, leak_set in enumerate(undecided, start=1):
+            leak_names = catalog.ordered(leak_set)
+            print(f"  [{idx}] {', '.join(leak_names) or '(no leaks)'}")
+
+    if minimal_mincutsets or maximal_verified or undecided:
+        report_file = generate_summary_report(
+            lemma_name, minimal_mincutsets, leak_list, maximal_verified, undecided
+        )
+        print(f"  Summary report: {report_file}")
+
 
 if __name__ == "__main__":
     start_time = time.time()
@@ -224,7 +674,9 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Find minimal leak mincutsets that violate a security property")
     parser.add_argument(
         "lemma",
-        help="Name of the lemma to test (e.g., TestCardCloningResistance, TestSimultaneousAuthentication)"
+        nargs="+",
+        help="Name of the lemma to test (e.g., TestCardCloningResistance, TestSimultaneousAuthentication); "
+             "several lemmas are analysed together in batch mode, sharing every prover run"
     )
 
     parser.add_argument(
@@ -240,9 +692,166 @@ if __name__ == "__main__":
         metavar="N",
         help="[TEST MODE] Start testing from sets of size N (skip smaller sets, e.g., --test-min-size 6)"
     )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of tamarin-prover instances to run in parallel, each in its own workspace (default: 1)"
+    )
+
+    parser.add_argument(
+        "--shrink",
+        choices=sorted(SHRINK_STRATEGIES),
+        default=None,
+        help="Strategy for shrinking a falsifying set to a minimal one: linear (|S| calls) or quickxplain "
+             "(O(k log n) calls). Only changes the number of prover calls with --search marco, where it "
+             "defaults to quickxplain"
+    )
+
+    parser.add_argument(
+        "--search",
+        choices=["levelwise", "dfs", "marco"],
+        default="levelwise",
+        help="Enumerator: levelwise (breadth-first by set size, each candidate proved once; default), "
+             "dfs (iterative deepening over set sizes) or marco (dual enumeration of minimal "
+             "falsifying and maximal verified sets, stops as soon as the lattice is covered)"
+    )
+
+    parser.add_argument(
+        "--max-tier",
+        type=int,
+        choices=range(len(TAMARIN_RETRY_TIERS)),
+        default=len(TAMARIN_RETRY_TIERS) - 1,
+        metavar="N",
+        help="Retry leak sets that tamarin-prover could not decide up to tier N of "
+             f"{TAMARIN_RETRY_TIERS} (timeout in minutes, -c bound); 0 disables retries "
+             f"(default: {len(TAMARIN_RETRY_TIERS) - 1})"
+    )
+
+    parser.add_argument(
+        "--portfolio",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Race the N prover configurations that won most often for this lemma on every leak set "
+             f"and keep the first verdict (1-{len(PORTFOLIO_CONFIGS)}; default: 0, plain flags only)"
+    )
+
+    parser.add_argument(
+        "--no-precheck",
+        action="store_true",
+        help="Run the derivation checks in every prover call instead of once per rule set up front"
+    )
+
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=VERDICT_CACHE_PATH,
+        metavar="PATH",
+        help=f"SQLite file storing tamarin verdicts across runs (default: {VERDICT_CACHE_PATH})"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the persistent verdict cache"
+    )
+
+    parser.add_argument(
+        "--telemetry",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help=f"JSONL file receiving one event per oracle call (default: {TELEMETRY_DIR}/<lemma>.jsonl)"
+    )
+
+    parser.add_argument(
+        "--no-telemetry",
+        action="store_true",
+        help="Do not write the per-call event stream"
+    )
+
+    parser.add_argument(
+        "--coordinator",
+        default=None,
+        metavar="[HOST:]PORT",
+        help="Serve leak sets to workers started with python3 -m automator.distributed instead of "
+             "running tamarin-prover here; a bare port only accepts local workers, use 0.0.0.0:PORT "
+             "for workers on other hosts"
+    )
+
+    parser.add_argument(
+        "--token",
+        default="",
+        help="Shared secret that workers must pass to the coordinator (default: none)"
+    )
+
+    parser.add_argument(
+        "--lease",
+        type=float,
+        default=LEASE_SECONDS,
+        metavar="SECONDS",
+        help=f"Requeue a worker's leak set after this long without a heartbeat (default: {LEASE_SECONDS})"
+    )
+
+    parser.add_argument(
+        "--seeds",
+        nargs="+",
+        default=[],
+        metavar="SOURCE",
+        help="Warm-start from known minimal cut-sets: leak .spthy files (e.g. leaks/CR1.spthy), "
+             "summary report files, 'reports' for results/summary_<lemma>.txt, or 'cache' for sets "
+             "the verdict cache has seen falsify the lemma. Every seed is proved and shrunk first"
+    )
+
+    parser.add_argument(
+        "--label-order",
+        choices=LABEL_ORDERS,
+        default=LABEL_ORDER_JSON,
+        help="Order in which the search tries leaks: json (leak_rules.json order; default), frequency "
+             "(leaks of minimal sets from earlier runs first), cost (leaks with the cheapest proofs in "
+             "the telemetry first) or dynamic (frequency, then reordered after every new minimal set). "
+             "The levelwise search proves the same sets in any order"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Continue the search from the checkpoint of an interrupted run ({CHECKPOINT_DIR}/<lemma>.json)"
+    )
+
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=CHECKPOINT_INTERVAL_SECONDS,
+        metavar="SECONDS",
+        help="Save verdicts to the checkpoint at most this often; the search state is saved at every "
+             f"set size (default: {CHECKPOINT_INTERVAL_SECONDS:g})"
+    )
+
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not write checkpoints"
+    )
     args = parser.parse_args()
+
+    if len(args.lemma) > 1 and (args.search != "levelwise" or args.shrink or args.portfolio or args.seeds
+                                or args.coordinator):
+        parser.error("several lemmas (batch mode) only support the levelwise search, "
+                     "without --shrink, --portfolio, --seeds or --coordinator")
+    if args.coordinator and args.portfolio:
+        parser.error("--portfolio is not supported with --coordinator")
+    if len(args.lemma) > 1 and args.label_order != LABEL_ORDER_JSON:
+        parser.error("--label-order is not supported with several lemmas (batch mode)")
+    if len(args.lemma) > 1 and args.resume:
+        parser.error("--resume is not supported with several lemmas (batch mode)")
+    if args.resume and args.no_checkpoint:
+        parser.error("--resume needs a checkpoint, remove --no-checkpoint")
     
-    lemma_name = args.lemma
+    lemma_name = "+".join(args.lemma)
     leak_rules = load_leak_rules()
     
     if args.test_limit_leaks:
@@ -252,17 +861,79 @@ if __name__ == "__main__":
     
     if args.test_min_size:
         print(f"[TEST MODE] Starting from sets of size {args.test_min_size} (skipping smaller sets)\n")
-        def filtered_predicate(leak_set: FrozenSet[str]) -> bool:
-            if len(leak_set) < args.test_min_size:
-                return False
-            return security_predicate(leak_set, lemma_name)
-        predicate = filtered_predicate
-    else:
-        predicate = None  
 
-    minimal_mincutsets = run_analysis(lemma_name, leak_list, predicate)
+    verdict_cache = None if args.no_cache else VerdictCache(args.cache)
+    telemetry = None if args.no_telemetry else Telemetry(
+        args.telemetry or TELEMETRY_DIR / f"{lemma_name}.jsonl", lemma_name, args.jobs
+    )
+
+    search_leaks, label_order = leak_list, None
+    if args.label_order != LABEL_ORDER_JSON:
+        search_leaks, label_order = plan_label_order(
+            args.label_order, lemma_name, leak_list, verdict_cache,
+            args.telemetry or TELEMETRY_DIR / f"{lemma_name}.jsonl",
+        )
+
+    checkpoint = None
+    if len(args.lemma) == 1 and not args.no_checkpoint:
+        checkpoint = Checkpoint(
+            CHECKPOINT_DIR / f"{lemma_name}.json", lemma_name, search_leaks, args.search, args.checkpoint_interval
+        )
+        if args.resume:
+            try:
+                checkpoint.load()
+            except (FileNotFoundError, ValueError) as e:
+                parser.error(f"cannot resume: {e}")
+            # the search state is over the leak order of the interrupted run
+            search_leaks = checkpoint.leak_list
+        elif checkpoint.path.exists():
+            print(f"{YELLOW}[Checkpoint] Overwriting the checkpoint of an earlier run "
+                  f"({checkpoint.path}); use --resume to continue it{RESET}\n")
+
+    coordinator = Coordinator(lemma_name, args.coordinator, args.token, args.lease) if args.coordinator else None
+
+    if len(args.lemma) > 1:
+        results = run_batch_analysis(
+            args.lemma,
+            leak_list,
+            jobs=args.jobs,
+            min_size=args.test_min_size,
+            verdict_cache=verdict_cache,
+            max_tier=args.max_tier,
+            telemetry=telemetry,
+            precheck=not args.no_precheck,
+        )
+    else:
+        minimal_mincutsets, maximal_verified, undecided = run_analysis(
+            lemma_name,
+            search_leaks,
+            jobs=args.jobs,
+            min_size=args.test_min_size,
+            verdict_cache=verdict_cache,
+            shrink_strategy=args.shrink,
+            search=args.search,
+            max_tier=args.max_tier,
+            telemetry=telemetry,
+            portfolio=ProverPortfolio(args.portfolio) if args.portfolio else None,
+            precheck=not args.no_precheck,
+            seeds=load_seeds(args.seeds, lemma_name, leak_list, verdict_cache) if args.seeds else None,
+            coordinator=coordinator,
+            checkpoint=checkpoint,
+            label_order=label_order,
+        )
+        if coordinator is not None:
+            coordinator.close()
+            print(f"[Coordinator] {sum(coordinator.workers.values())} verdict(s) from {len(coordinator.workers)} "
+                  f"worker(s), {coordinator.requeued} lease(s) expired and requeued")
+    
+    if verdict_cache is not None:
+        verdict_cache.close()
     
-    display_results(lemma_name, minimal_mincutsets, leak_list)
+    if len(args.lemma) > 1:
+        for name, result in results.items():
+            display_results(name, result.minimal, leak_list, undecided=result.undecided)
+    else:
+        display_results(lemma_name, minimal_mincutsets, leak_list, maximal_verified, undecided)
     
     elapsed_time = time.time() - start_time
     print(f"\n{'='*80}")